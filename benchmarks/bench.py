@@ -0,0 +1,257 @@
+"""Benchmark suite for the contraction engines, the parsers and rendering.
+
+Runs on synthetic graph families (random, grid, cograph, PACE-like sparse) and reports the
+best-of-N wall-clock time of each case. Results can be appended to a JSON-lines file together
+with the current commit, and compared with a previous commit.
+
+Usage:
+    python benchmarks/bench.py [--max-n N] [-n REPEAT] [--output PATH] [--compare [COMMIT]]
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from random import Random
+from typing import Callable, Optional
+
+import networkx as nx
+
+sys.path[:0] = [os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')]
+
+from twwanim.data.TriGraphData import TriGraphData
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+from twwanim.readwrite import *
+
+SIZES = [100, 1000, 10000, 100000]
+MAX_N_NETWORKX = 10000  # TriGraphData.max_red_degree() is O(n) per step
+MAX_N_COGRAPH = 2000  # cographs are dense
+
+
+# ===============================================================================
+#    Synthetic instances
+# ===============================================================================
+def tree_sequence(g: nx.Graph, rand: Random) -> list[tuple[int, int]]:
+    """Contracts every vertex into its parent in a BFS forest (deepest first), then merges the roots."""
+
+    parent = {}
+    order = []
+    roots = []
+    nodes = list(g.nodes())
+    rand.shuffle(nodes)
+    for r in nodes:
+        if r in parent:
+            continue
+        parent[r] = None
+        roots += [r]
+        q = deque([r])
+        while q:
+            x = q.popleft()
+            order += [x]
+            for y in g[x]:
+                if y not in parent:
+                    parent[y] = x
+                    q.append(y)
+
+    ret = [(parent[x], x) for x in reversed(order) if parent[x] is not None]
+    ret += [(roots[0], r) for r in roots[1:]]
+    return ret
+
+
+def random_cograph(n: int, rand: Random) -> tuple[nx.Graph, list[tuple[int, int]]]:
+    """Returns a random cograph and a contraction sequence of width 0 following its cotree."""
+
+    g = nx.empty_graph(n)
+    modules = [[x] for x in range(n)]
+    cs = []
+    while len(modules) > 1:
+        i, j = rand.sample(range(len(modules)), 2)
+        a, b = modules[i], modules[j]
+        if rand.random() < 0.5:
+            g.add_edges_from((x, y) for x in a for y in b)  # join
+        cs += [(a[0], b[0])]
+        modules[i] = a + b
+        modules[j] = modules[-1]
+        modules.pop()
+    return g, cs
+
+
+def make_instance(family: str, n: int, seed: int = 0) -> tuple[nx.Graph, list[tuple[int, int]]]:
+    rand = Random(seed)
+    if family == 'random':
+        g = nx.gnm_random_graph(n, 3 * n, seed=seed)
+    elif family == 'grid':
+        k = max(2, int(n ** 0.5))
+        g = nx.convert_node_labels_to_integers(nx.grid_2d_graph(k, k))
+    elif family == 'cograph':
+        return random_cograph(n, rand)
+    elif family == 'pace':
+        g = nx.powerlaw_cluster_graph(n, 2, 0.3, seed=seed)  # sparse, heavy-tailed degrees
+    else:
+        raise ValueError(f'unknown family: {family}')
+    return g, tree_sequence(g, rand)
+
+
+# ===============================================================================
+#    Benchmarks
+# ===============================================================================
+def best_of(repeat: int, setup: Callable[[], object], run: Callable[[object], object]) -> float:
+    ret = float('inf')
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        run(arg)
+        ret = min(ret, time.perf_counter() - start)
+    return ret
+
+
+def run_sequence(data, cs) -> None:
+    for u, v in cs:
+        data.contract(u, v)
+        data.max_red_degree()
+
+
+def bench_contract(g, cs, n, repeat) -> dict:
+    ret = {'array': best_of(repeat, lambda: ArrayTriGraphData(g), lambda d: run_sequence(d, cs))}
+    if n <= MAX_N_NETWORKX:
+        ret['networkx'] = best_of(repeat, lambda: TriGraphData(g.copy()), lambda d: run_sequence(d, cs))
+    return ret
+
+
+def bench_parsers(g, cs, repeat) -> dict:
+    gr_buf, cs_buf = io.StringIO(), io.StringIO()
+    write_pace_2023(gr_buf, g)
+    cs_buf.writelines(f'{u + 1} {v + 1}\n' for u, v in cs)
+    gr_text, cs_text = gr_buf.getvalue(), cs_buf.getvalue()
+
+    return {
+        'read_pace': best_of(repeat, lambda: io.StringIO(gr_text), read_pace_2023),
+        'read_pace_edges': best_of(repeat, lambda: io.StringIO(gr_text), read_pace_2023_edges),
+        'read_contraction_file': best_of(repeat, lambda: io.StringIO(cs_text), read_contraction_file),
+        'read_contraction_array': best_of(repeat, lambda: io.StringIO(cs_text), read_contraction_array),
+    }
+
+
+def bench_layout(g, n, repeat) -> Optional[dict]:
+    from twwanim.layout import compute_layout, MAX_N_SPRING
+
+    try:
+        ret = {'layout_spectral': best_of(repeat, lambda: g, lambda h: compute_layout(h, 'spectral'))}
+    except ImportError:
+        return None  # scipy is not installed
+    if n <= MAX_N_SPRING:
+        ret['layout_spring'] = best_of(repeat, lambda: g, lambda h: compute_layout(h, 'spring'))
+    return ret
+
+
+def bench_set_graph(g, repeat) -> Optional[dict]:
+    try:
+        from twwanim.TwinwidthAnimation import TwinwidthAnimation
+    except ImportError:
+        return None  # manim is not installed
+
+    h = g.copy()
+    nx.set_node_attributes(h, nx.random_layout(h, seed=0), 'pos')
+    scene = TwinwidthAnimation()
+    return {'set_graph': best_of(repeat, lambda: h, scene.set_graph)}
+
+
+def bench_render(repeat: int) -> Optional[dict]:
+    try:
+        from twwanim.render import make_config, render_movie
+    except ImportError:
+        return None  # manim is not installed
+
+    g, cs = make_instance('grid', 9)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        def run(_):
+            config = make_config('l')
+            config.media_dir = tmpdir
+            render_movie(g.copy(), cs, 4.0, config)
+        return {'render_low_quality': best_of(repeat, lambda: None, run)}
+
+
+# ===============================================================================
+#    Results
+# ===============================================================================
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_results(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f'\nComparison with {baseline["commit"]} (ratio > 1 means slower now):')
+    for case, timings in current['results'].items():
+        for name, t in timings.items():
+            base = baseline['results'].get(case, {}).get(name)
+            if base:
+                print(f'  {case:24s} {name:24s} {t / base:6.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark suite for twwanim.')
+    parser.add_argument('--max-n', type=int, default=max(SIZES), help=f'largest number of vertices (default: {max(SIZES)})')
+    parser.add_argument('-n', '--repeat', type=int, default=3, help='number of runs per case (default: 3)')
+    parser.add_argument('--families', default='random,grid,cograph,pace', help='comma-separated graph families')
+    parser.add_argument('--output', metavar='PATH', help='append the results to a JSON-lines file')
+    parser.add_argument('--compare', metavar='COMMIT', nargs='?', const='', help='compare with a commit stored in --output (default: the latest other commit)')
+    args = parser.parse_args()
+
+    results = {}
+    for family in args.families.split(','):
+        for n in SIZES:
+            if n > args.max_n or (family == 'cograph' and n > MAX_N_COGRAPH):
+                continue
+            g, cs = make_instance(family, n)
+            case = f'{family}-{n}'
+            results[case] = dict(bench_contract(g, cs, n, args.repeat), **bench_parsers(g, cs, args.repeat))
+
+            layout = bench_layout(g, n, args.repeat)
+            if layout is not None:
+                results[case].update(layout)
+
+            set_graph = bench_set_graph(g, args.repeat)
+            if set_graph is not None:
+                results[case].update(set_graph)
+
+            print(f'{case:16s} ' + '  '.join(f'{k}={v * 1000:.1f}ms' for k, v in results[case].items()), flush=True)
+
+    render = bench_render(1)
+    if render is not None:
+        results['render'] = render
+        print(f'{"render":16s} ' + '  '.join(f'{k}={v:.1f}s' for k, v in render.items()))
+
+    entry = {'commit': current_commit(), 'time': time.time(), 'python': sys.version.split()[0], 'results': results}
+
+    if args.compare is not None and args.output:
+        history = load_results(args.output)
+        if args.compare:
+            history = [r for r in history if r['commit'] == args.compare]
+        else:
+            history = [r for r in history if r['commit'] != entry['commit']]
+        if history:
+            compare(entry, history[-1])
+        else:
+            print('\nNo stored results to compare with.')
+
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+
+if __name__ == '__main__':
+    main()
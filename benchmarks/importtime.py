@@ -0,0 +1,87 @@
+"""Startup-time benchmark for the common entry points.
+
+Runs `python -X importtime` in fresh interpreters and reports the cumulative import time
+of each entry point, whether manim was loaded, and the heaviest imported packages.
+
+Usage:
+    python benchmarks/importtime.py [-n REPEAT] [--json PATH]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ENTRY_POINTS = [
+    # (name, python code)
+    ('cli', 'import twwanim.twwanim as m; m.get_parser()'),
+    ('readwrite', 'import twwanim.readwrite'),
+    ('evaluation', 'import twwanim.evaluation'),
+    ('data', 'import twwanim.data.TriGraphData'),
+    ('render', 'import twwanim.render'),
+]
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def measure(code: str) -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([SRC_DIR] + ([env['PYTHONPATH']] if 'PYTHONPATH' in env else []))
+
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    if proc.returncode != 0:
+        return {'error': proc.stderr.strip().splitlines()[-1]}
+
+    total = 0
+    packages = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+        if depth == 1:
+            total += int(cumulative_us)
+        top = name.split('.')[0]
+        packages[top] = packages.get(top, 0) + int(self_us)
+
+    return {
+        'wall_ms': wall * 1000,
+        'import_ms': total / 1000,
+        'manim_loaded': 'manim' in packages,
+        'networkx_loaded': 'networkx' in packages,
+        'heaviest': sorted(packages.items(), key=lambda x: -x[1])[:5],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure import time of twwanim entry points.')
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of runs per entry point (default: 5)')
+    parser.add_argument('--json', metavar='PATH', help='append the results to a JSON-lines file')
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in ENTRY_POINTS:
+        runs = [measure(code) for _ in range(args.repeat)]
+        if any('error' in r for r in runs):
+            results[name] = {'error': runs[0].get('error')}
+            print(f'{name:12s} error: {results[name]["error"]}')
+            continue
+
+        best = min(runs, key=lambda r: r['import_ms'])
+        results[name] = best
+        print(f'{name:12s} import={best["import_ms"]:8.1f}ms  wall={best["wall_ms"]:8.1f}ms  '
+              f'manim={"yes" if best["manim_loaded"] else "no ":3s}  networkx={"yes" if best["networkx_loaded"] else "no"}')
+
+    if args.json:
+        with open(args.json, 'a') as f:
+            f.write(json.dumps({'time': time.time(), 'python': sys.version.split()[0], 'results': results}) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -26,6 +26,7 @@ setup(
     long_description_content_type='text/markdown',
     install_requires=[
         'networkx >= 3.1',
+        'numpy',
         'manim >= 0.18.0',
     ],
     tests_require=[
@@ -0,0 +1,70 @@
+from manim import *
+from typing import Sequence
+from twwanim.Timeline import Timeline
+
+__all__ = ['ContractionTable']
+
+
+class ContractionTable:
+    """Rows `(time, contraction, max red degree)` of the contraction table, drawn with a pool of cells.
+
+    Each cell is a `VGroup` whose content is replaced when its row is reused, so the scene holds
+    a fixed set of mobjects however long the sequence is. When the table is full, the oldest
+    row fades out and the others move up. A faded row returns to the pool once the play that
+    fades it out is over, because animations merged into one play capture the state of their
+    mobjects only when they start. The pool thus holds `num_rows` rows, plus the rows faded
+    out within one play when steps are merged.
+    """
+
+    columns = [3.0, 4.2, 6.0]  # x-coordinates of the cell centers
+
+    def __init__(self, num_rows: int, top_y: float = 2.4, row_height: float = 0.3) -> None:
+        self.num_rows = num_rows
+        self.top_y = top_y
+        self.row_height = row_height
+        self.rows = []  # type: list[list[VGroup]]  # rows shown, from top to bottom
+        self.pool = []  # type: list[list[VGroup]]  # rows not shown
+        self.num_cells = 0  # number of cells created
+
+    def mobjects(self) -> list[Mobject]:
+        """Returns the cells of all rows shown."""
+        return [x for row in self.rows for x in row]
+
+    def scroll(self, timeline: Timeline) -> None:
+        """Scrolls up the table if it is full."""
+
+        if len(self.rows) < self.num_rows:
+            return
+        top, self.rows = self.rows[0], self.rows[1:]
+        timeline.add(
+            'scroll',
+            *(FadeOut(x) for x in top),
+            *(timeline.animate(x, lambda m: m.shift(self.row_height * UP)) for row in self.rows for x in row)
+        )
+        timeline.call_after_play(lambda: self.pool.append(top))
+
+    def add_row(self, contents: Sequence[Mobject] = ()) -> list[VGroup]:
+        """Adds a row from the pool below the last row and fills its first cells with `contents`; returns the cells (not added to the scene)."""
+
+        assert len(self.rows) < self.num_rows, 'table is full'
+        if self.pool:
+            row = self.pool.pop()
+            for cell in row:
+                cell.remove(*cell.submobjects)
+        else:
+            row = [VGroup() for _ in self.columns]
+            self.num_cells += len(row)
+
+        self.rows += [row]
+        for column, content in enumerate(contents):
+            self.set_cell(row, column, content)
+        return row
+
+    def set_cell(self, row: list[VGroup], column: int, content: Mobject) -> VGroup:
+        """Replaces the content of a cell of a row shown; returns the cell."""
+
+        y = self.top_y - self.row_height * next(i for i, r in enumerate(self.rows) if r is row)
+        cell = row[column]
+        cell.remove(*cell.submobjects)
+        cell.add(content.move_to([self.columns[column], y, 0.0], aligned_edge=ORIGIN))
+        return cell
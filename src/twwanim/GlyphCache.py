@@ -0,0 +1,39 @@
+from manim import *
+from typing import Hashable, Sequence
+from twwanim.profiling import get_profiler
+
+__all__ = ['GlyphCache']
+
+
+class GlyphCache:
+    """Typesets each distinct glyph once and hands out copies.
+
+    Numbers are composed of pre-built digit glyphs, so a sequence with thousands of steps
+    needs only a handful of LaTeX compilations instead of one per table cell.
+    """
+
+    def __init__(self, font_size: float = DEFAULT_FONT_SIZE) -> None:
+        self.font_size = font_size
+        self.buff = 0.001 * font_size  # spacing between digits (same as `DecimalNumber`)
+        self.glyphs = {}  # type: dict[str, VMobject]
+
+    def glyph(self, tex: str) -> VMobject:
+        """Returns a copy of `MathTex(tex)`, typesetting it only on the first request."""
+        if tex not in self.glyphs:
+            with get_profiler().phase('latex', tex=tex):
+                self.glyphs[tex] = MathTex(tex, font_size=self.font_size)
+        return self.glyphs[tex].copy()
+
+    def number(self, x: int) -> VGroup:
+        """Returns an integer composed of digit glyphs."""
+        return VGroup(*(self.glyph(c) for c in str(x))).arrange(RIGHT, buff=self.buff, aligned_edge=DOWN)
+
+    def label(self, x: Hashable) -> VMobject:
+        """Returns a vertex label; integers are composed of digits, other labels are typeset as a whole."""
+        if isinstance(x, int) and not isinstance(x, bool):
+            return self.number(x)
+        return self.glyph(str(x))
+
+    def concat(self, parts: Sequence[VMobject], buff: float = 0.1) -> VGroup:
+        """Arranges mobjects horizontally, e.g. `[label(u), glyph(r'\\gets'), label(v)]`."""
+        return VGroup(*parts).arrange(RIGHT, buff=buff * self.font_size / DEFAULT_FONT_SIZE)
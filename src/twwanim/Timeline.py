@@ -0,0 +1,83 @@
+from manim import *
+from typing import Callable
+from twwanim.profiling import get_profiler
+
+__all__ = ['Timeline']
+
+
+class Timeline:
+    """Collects the animation phases of contraction steps and plays them.
+
+    With `steps_per_play == 0`, every phase is a separate `scene.play()` call. Otherwise the
+    phases of `steps_per_play` consecutive steps are merged into one `Succession`, which
+    keeps the visual order but writes one partial movie instead of one per phase.
+
+    `animate()` replaces `mobject.animate` for this purpose: its target is built from the
+    state of the mobject at the end of the animations collected so far, so a mobject can be
+    animated several times in one play call.
+    """
+
+    def __init__(self, scene: Scene, steps_per_play: int = 0) -> None:
+        self.scene = scene
+        self.steps_per_play = steps_per_play
+        self.phases = []  # type: list[Animation]
+        self.callbacks = []  # type: list[Callable[[], None]]
+        self.targets = {}  # type: dict[int, Mobject]
+        self.num_steps = 0
+
+    def state(self, mobject: Mobject) -> Mobject:
+        """Returns the state of `mobject` at the end of the animations collected so far (do not modify)."""
+        return self.targets.get(id(mobject), mobject)
+
+    def transform(self, mobject: Mobject, target: Mobject, **kwargs) -> Animation:
+        """Returns an animation from the current state of `mobject` to `target`."""
+        self.targets[id(mobject)] = target
+        return Transform(mobject, target, **kwargs)
+
+    def animate(self, mobject: Mobject, method: Callable[[Mobject], Mobject], **kwargs) -> Animation:
+        """Returns an animation from the current state of `mobject` to `method(state)`."""
+        return self.transform(mobject, method(self.state(mobject).copy()), **kwargs)
+
+    def pulse(self, mobject: Mobject, method: Callable[[Mobject], Mobject]) -> Animation:
+        """Returns an animation from the current state of `mobject` to `method(state)` and back; the state is unchanged.
+
+        One target serves both ways, instead of one animation to a changed copy and another back to the original.
+        """
+        return Transform(mobject, method(self.state(mobject).copy()), rate_func=there_and_back)
+
+    def add(self, name: str, *animations: Animation, run_time: float = 1.0) -> None:
+        """Adds a phase; phases without animations are skipped."""
+        if not animations:
+            return
+        if self.steps_per_play == 0:
+            with get_profiler().phase(name):
+                self.scene.play(*animations, run_time=run_time)
+            self._finish_play()
+        else:
+            self.phases += [AnimationGroup(*animations, run_time=run_time)]
+
+    def call_after_play(self, callback: Callable[[], None]) -> None:
+        """Runs `callback` once the phases added so far have been played."""
+        if self.phases:
+            self.callbacks += [callback]
+        else:
+            callback()
+
+    def end_step(self) -> None:
+        self.num_steps += 1
+        if self.steps_per_play and self.num_steps % self.steps_per_play == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Plays all collected phases in one call."""
+        if self.phases:
+            with get_profiler().phase('play'):
+                self.scene.play(Succession(*self.phases))
+            self.phases = []
+        self._finish_play()
+
+    def _finish_play(self) -> None:
+        self.targets = {}
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
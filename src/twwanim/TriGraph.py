@@ -1,11 +1,32 @@
 import networkx as nx
 from manim import *
-from typing import Sequence, Hashable
-from twwanim.data.TriGraphData import TriGraphData
+from typing import Optional, Sequence, Hashable
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+from twwanim.GlyphCache import GlyphCache
+from twwanim.Timeline import Timeline
+from twwanim.profiling import get_profiler
 
 
 class TriGraph:
-    def __init__(self, g: nx.Graph, shift: Sequence[float]) -> None:
+    def __init__(
+        self,
+        g: nx.Graph,
+        shift: Sequence[float],
+        data: Optional[ArrayTriGraphData] = None,
+        layout: Optional[dict[Hashable, Sequence[float]]] = None,
+        lod: bool = False,
+        lod_labels: bool = False,
+    ) -> None:
+        """
+        Args:
+            g: original graph (not modified); determines sizes
+            shift: shift of the whole graph
+            data: (optional) trigraph in the middle of a contraction sequence to start from
+            layout: (optional) vertex positions; defaults to the node attribute `pos` of `g`
+            lod: level-of-detail mode for large graphs; draws all white edges as one path
+                and creates individual mobjects only for red edges and edges being animated
+            lod_labels: keeps vertex labels in level-of-detail mode
+        """
         n = len(g)
         if n <= 30:
             scale = 1.0
@@ -26,24 +47,34 @@ class TriGraph:
         edge_opacity_red = 0.95
         vertex_config = dict(radius=0.15 * scale, stroke_width=4 * scale, stroke_color=GRAY_D, z_index=100)
         edge_config = dict(stroke_width=edge_width_normal, stroke_opacity=edge_opacity_white, stroke_color=WHITE, z_index=1)
+        red_edge_config = dict(edge_config, stroke_opacity=edge_opacity_red, stroke_color=RED_E)
+
+        if data is None:
+            data = ArrayTriGraphData(g)
+        if layout is None:
+            layout = nx.get_node_attributes(g, 'pos')
+        nodes = list(data.nodes())
+        glyphs = GlyphCache(24 * scale * (0.7 if n >= 100 else 1.0))
 
         G = Graph(
-            g.nodes(),
+            nodes,
             [],
-            labels=True,
-            layout=nx.get_node_attributes(g, 'pos'),
+            labels={x: glyphs.label(x) for x in nodes} if not lod or lod_labels else False,
+            layout={x: layout[x] for x in nodes},
             layout_scale=3,
             vertex_config=vertex_config
         ).shift(shift)
 
-        # create mobjects
-        edges = {(u, v): Line(G[u].get_center(), G[v].get_center(), **edge_config) for u, v in g.edges()}
+        # create mobjects, keyed by edge ID (see `ContractAction`)
+        edges = {}  # type: dict[int, Line]
+        for es, config in [([] if lod else data.black_edges(), edge_config), (data.red_edges(), red_edge_config)]:
+            for u, v in es:
+                edges[data.edge_id(u, v)] = Line(G[u].get_center(), G[v].get_center(), **config)
 
-        for tex in G._labels.values():
-            tex.set_z_index(101)
-            tex.font_size = 24 * scale * (0.7 if n >= 100 else 1.0)
+        for label in G._labels.values():
+            label.set_z_index(101)
 
-        self.g = TriGraphData(g)
+        self.g = data
         self.G = G
         self.edges = edges
         self.edge_width_normal = edge_width_normal
@@ -51,6 +82,73 @@ class TriGraph:
         self.edge_opacity_white = edge_opacity_white
         self.edge_opacity_red = edge_opacity_red
         self.vertex_config = vertex_config
+        self.edge_config = edge_config
+
+        # white edges in level-of-detail mode: one cubic curve (4 points) per slot
+        self.lod = lod
+        self.white_path = VMobject(**edge_config)
+        self.white_slots = {}  # type: dict[int, int]  # edge ID -> slot
+        self.white_points = np.zeros((0, 4, 3))
+        self.white_alive = np.zeros(0, dtype=bool)
+        if lod:
+            self._add_white_edges(list(data.black_edges()))
+
+        # changes of skipped contractions, shown by `fast_forward()`
+        self.skipped_targets = {}  # type: dict[int, tuple[Mobject, Mobject]]
+        self.skipped_removals = []  # type: list[Mobject]
+        self.skipped_contractions = []  # type: list[tuple[Hashable, Hashable]]
+
+    def mobjects(self) -> list[Mobject]:
+        """Returns all mobjects of the current trigraph."""
+        return [self.G] + ([self.white_path] if self.lod else []) + list(self.edges.values())
+
+    # ---------------------------------------------------------------------------
+    #    Level of detail
+    # ---------------------------------------------------------------------------
+    def _add_white_edges(self, es: Sequence[tuple[Hashable, Hashable]]) -> None:
+        if not es:
+            return
+        centers = {x: self.G[x].get_center() for e in es for x in e}
+        start = np.array([centers[a] for a, _ in es])
+        end = np.array([centers[b] for _, b in es])
+        t = np.array([0.0, 1 / 3, 2 / 3, 1.0])
+        points = start[:, None, :] + t[None, :, None] * (end - start)[:, None, :]
+
+        k = len(self.white_alive)
+        self.white_slots.update((self.g.edge_id(*e), k + i) for i, e in enumerate(es))
+        self.white_points = np.concatenate([self.white_points, points])
+        self.white_alive = np.concatenate([self.white_alive, np.ones(len(es), dtype=bool)])
+        self._update_white_path()
+
+    def _update_white_path(self) -> None:
+        if 2 * np.count_nonzero(self.white_alive) < len(self.white_alive):
+            # compact slots of promoted edges
+            index = np.cumsum(self.white_alive) - 1
+            self.white_slots = {e: int(index[i]) for e, i in self.white_slots.items()}
+            self.white_points = self.white_points[self.white_alive]
+            self.white_alive = np.ones(len(self.white_points), dtype=bool)
+        self.white_path.set_points(self.white_points[self.white_alive].reshape(-1, 3))
+
+    def _promote(self, scene: Scene, es: Sequence[tuple[Hashable, Hashable]]) -> None:
+        """Replaces white edges in the batched path with individual lines."""
+        lines = []
+        for x, y in es:
+            k = self.g.edge_id(x, y)
+            i = self.white_slots.pop(k, None)
+            if i is None:
+                continue
+            self.white_alive[i] = False
+            self.edges[k] = Line(self.G[x].get_center(), self.G[y].get_center(), **self.edge_config)
+            lines += [self.edges[k]]
+        if lines:
+            self._update_white_path()
+            scene.add(*lines)
+
+    def _demote(self, scene: Scene, es: Sequence[tuple[Hashable, Hashable]]) -> None:
+        """Moves white edges drawn as individual lines back to the batched path."""
+        es = [e for e in es if self.g.edge_id(*e) in self.edges]
+        scene.remove(*(self.edges.pop(self.g.edge_id(*e)) for e in es))
+        self._add_white_edges(es)
 
     def max_red_degree(self) -> int:
         return self.g.max_red_degree()
@@ -58,32 +156,41 @@ class TriGraph:
     def create(self) -> AnimationGroup:
         return Succession(
             AnimationGroup(Create(self.G), run_time=0.3),
-            AnimationGroup(*(Create(self.edges[e]) for e in self.edges), run_time=0.7)
+            AnimationGroup(*(Create(e) for e in self.mobjects()[1:]), run_time=0.7)
         )
 
     def contract(
         self,
-        scene: Scene,
+        timeline: Timeline,
         u: Hashable,
         v: Hashable,
         extra_animations: Sequence[AnimationGroup],
         animation_speed: float,
     ):
+        scene = timeline.scene
+        animate = timeline.animate
+        G, edges = self.G, self.edges
+
         # -----------------------------------------------------------------------
         # Update inner data structure.
         # -----------------------------------------------------------------------
 
-        act = self.g.contract(u, v)
+        prof = get_profiler()
+        if self.lod:
+            self._promote(scene, self.g.black_edges_at(u) + self.g.black_edges_at(v))
+        with prof.phase('contract'):
+            act = self.g.contract(u, v)
 
         # -----------------------------------------------------------------------
         # [Animation 1]: Flash target vertices.
         # -----------------------------------------------------------------------
 
-        scene.play(
-            Flash(self.G[u], line_length=0.3),
-            Flash(self.G[v], line_length=0.3),
-            self.G[u].animate.set_stroke_color(YELLOW),
-            self.G[v].animate.set_stroke_color(YELLOW),
+        timeline.add(
+            'flash',
+            Flash(G[u], line_length=0.3),
+            Flash(G[v], line_length=0.3),
+            animate(G[u], lambda m: m.set_stroke_color(YELLOW)),
+            animate(G[v], lambda m: m.set_stroke_color(YELLOW)),
             *extra_animations,
             run_time=0.6 * animation_speed
         )
@@ -92,73 +199,125 @@ class TriGraph:
         # [Animation 2]: Highlight incident edges.
         # -----------------------------------------------------------------------
 
-        if act.highlight_to_red or act.highlight_white_to_green or act.highlight_red_to_green:
-            scene.play(
-                *(self.edges[e].animate
-                  .set_stroke_color(BLUE_C)
-                  .set_stroke_width(self.edge_width_bold)
-                  .set_opacity(self.edge_opacity_red) for e in act.highlight_red_to_green),
-                *(self.edges[e].animate
-                  .set_stroke_color(BLUE_C)
-                  .set_stroke_width(self.edge_width_bold)
-                  .set_opacity(self.edge_opacity_red) for e in act.highlight_white_to_green),
-                *(self.edges[e].animate
-                  .set_stroke_color(RED_E)
-                  .set_stroke_width(self.edge_width_bold)
-                  .set_opacity(self.edge_opacity_red) for e in act.highlight_to_red),
-                run_time=0.5 * animation_speed
-            )
-        if act.highlight_white_to_green or act.highlight_red_to_green:
-            scene.play(
-                *(self.edges[e].animate
-                  .set_stroke_color(WHITE)
-                  .set_stroke_width(self.edge_width_normal)
-                  .set_opacity(self.edge_opacity_white) for e in act.highlight_white_to_green),
-                *(self.edges[e].animate
-                  .set_stroke_color(RED_E)
-                  .set_stroke_width(self.edge_width_normal)
-                  .set_opacity(self.edge_opacity_red) for e in act.highlight_red_to_green),
-                run_time=0.5 * animation_speed
-            )
+        def highlight(m: Mobject) -> Mobject:
+            return m.set_stroke_color(BLUE_C).set_stroke_width(self.edge_width_bold).set_opacity(self.edge_opacity_red)
+
+        # edges turning green return to their style in the second half; edges turning red stay bold until the fade-out
+        timeline.add(
+            'highlight',
+            *(timeline.pulse(edges[e], highlight) for e in act.highlight_red_to_green),
+            *(timeline.pulse(edges[e], highlight) for e in act.highlight_white_to_green),
+            *(animate(edges[e], lambda m: m
+                      .set_stroke_color(RED_E)
+                      .set_stroke_width(self.edge_width_bold)
+                      .set_opacity(self.edge_opacity_red), rate_func=squish_rate_func(smooth, 0, 0.5)) for e in act.highlight_to_red),
+            run_time=1.0 * animation_speed
+        )
 
         # -----------------------------------------------------------------------
         # [Animation 3]: Move merged vertex and its incident edges.
         # -----------------------------------------------------------------------
 
-        scene.play(
-            self.G[v].animate.move_to(self.G[u]).set_opacity(0),  # vertex
-            *(self.edges[a, b].animate.put_start_and_end_on(  # edges
-                self.G[c].get_center(), self.G[d].get_center()
-            ) for a, b, c, d in act.edge_move),
-            *(self.edges[x, y].animate.put_start_and_end_on(  # edge uv
-                self.G[u].get_center() * 0.999 + self.G[v].get_center() * 0.001 if z == 1 else self.G[u].get_center(),
-                self.G[u].get_center() * 0.999 + self.G[v].get_center() * 0.001 if z == 0 else self.G[u].get_center()
-            ) for x, y, z in act.edge_shrink),
+        pu, pv = G[u].get_center(), G[v].get_center()
+        timeline.add(
+            'move',
+            animate(G[v], lambda m: m.move_to(pu).set_opacity(0)),  # vertex
+            *(animate(edges[e], lambda m: m.put_start_and_end_on(  # edges
+                G[c].get_center(), G[d].get_center()
+            )) for e, c, d in act.edge_move),
+            *(animate(edges[e], lambda m: m.put_start_and_end_on(  # edge uv
+                pu * 0.999 + pv * 0.001 if z == 1 else pu,
+                pu * 0.999 + pv * 0.001 if z == 0 else pu
+            )) for e, z in act.edge_shrink),
             run_time=0.8 * animation_speed
         )
-        self.G.remove_vertices(v)  # should be already transparent
+        timeline.call_after_play(lambda: G.remove_vertices(v))  # should be already transparent
 
         # -----------------------------------------------------------------------
         # [Animation 4]: Fade out duplicate edges and reset highlights.
         # -----------------------------------------------------------------------
 
         # remove old vertex and its incident edges
-        scene.play(
-            *(FadeOut(self.edges[e]) for e in act.edge_fadeout),
-            self.G[u].animate.set_stroke_color(self.vertex_config['stroke_color']),
-            *(self.edges[e].animate.set_stroke_width(self.edge_width_normal) for e in act.highlight_to_red),
+        timeline.add(
+            'fadeout',
+            *(FadeOut(edges[e]) for e in act.edge_fadeout),
+            animate(G[u], lambda m: m.set_stroke_color(self.vertex_config['stroke_color'])),
+            *(animate(edges[e], lambda m: m.set_stroke_width(self.edge_width_normal)) for e in act.highlight_to_red),
             run_time=0.4 * animation_speed
         )
 
         # -----------------------------------------------------------------------
-        # Maintain edge look-up table.
+        # Maintain edge look-up table (moved edges keep their IDs).
         # -----------------------------------------------------------------------
 
-        if act.edge_shrink:
-            a, b = act.edge_shrink[0][:2]
-            del self.edges[a, b]
+        for e in act.edge_fadeout:
+            del edges[e]
+        for e, _ in act.edge_shrink:
+            del edges[e]
+
+        if self.lod:
+            timeline.call_after_play(lambda: self._demote(scene, self.g.black_edges_at(u)))
+
+        if prof.enabled:
+            num_highlights = len(act.highlight_to_red) + len(act.highlight_white_to_green) + len(act.highlight_red_to_green)
+            prof.count('animations', sum([
+                4 + len(extra_animations),
+                num_highlights,
+                1 + len(act.edge_move) + len(act.edge_shrink),
+                1 + len(act.edge_fadeout) + len(act.highlight_to_red),
+            ]))
+            prof.count('mobjects', len(scene.mobjects))
+
+    def skip(self, timeline: Timeline, u: Hashable, v: Hashable) -> None:
+        """Applies a contraction without animation.
+
+        The resulting changes of the mobjects are recorded and shown together by the next `fast_forward()`.
+        """
+
+        if self.lod:
+            self._promote(timeline.scene, self.g.black_edges_at(u) + self.g.black_edges_at(v))
+        with get_profiler().phase('contract'):
+            act = self.g.contract(u, v)
+
+        def target(m: Mobject) -> Mobject:
+            if id(m) not in self.skipped_targets:
+                # start from the state after the animations not played yet
+                self.skipped_targets[id(m)] = (m, timeline.state(m).copy())
+            return self.skipped_targets[id(m)][1]
+
+        pu = self.G[u].get_center()
+        target(self.G[v]).move_to(pu).set_opacity(0)
+        self.skipped_contractions += [(u, v)]
+        for e in act.highlight_to_red:
+            target(self.edges[e]).set_stroke_color(RED_E).set_stroke_width(self.edge_width_normal).set_opacity(self.edge_opacity_red)
+        for e, c, d in act.edge_move:
+            target(self.edges[e]).put_start_and_end_on(self.G[c].get_center(), self.G[d].get_center())
+
+        # maintain edge look-up table (moved edges keep their IDs)
+        self.skipped_removals += [self.edges.pop(e) for e in act.edge_fadeout]
+        self.skipped_removals += [self.edges.pop(e) for e, _ in act.edge_shrink]
+
+    def fast_forward(self, timeline: Timeline, extra_animations: Sequence[Animation], run_time: float) -> None:
+        """Adds one transition from the state before the skipped contractions to the current state."""
+
+        removed = {id(m) for m in self.skipped_removals}
+        timeline.add(
+            'fast_forward',
+            *(timeline.transform(m, t) for k, (m, t) in self.skipped_targets.items() if k not in removed),
+            *(FadeOut(m) for m in self.skipped_removals),
+            *extra_animations,
+            run_time=run_time
+        )
+
+        contractions = self.skipped_contractions
+
+        def finish():
+            if contractions:
+                self.G.remove_vertices(*(v for _, v in contractions))
+            if self.lod:
+                self._demote(timeline.scene, [e for u, _ in contractions for e in self.g.black_edges_at(u)])
 
-        for a, b, c, d in act.edge_move:
-            if (a, b) not in act.edge_fadeout:
-                self.edges[c, d] = self.edges[a, b]
-            del self.edges[a, b]
+        timeline.call_after_play(finish)
+        self.skipped_targets = {}
+        self.skipped_removals = []
+        self.skipped_contractions = []
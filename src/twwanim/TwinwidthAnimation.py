@@ -1,7 +1,15 @@
 import networkx as nx
+import numpy as np
 from manim import *
-from typing import Hashable, Sequence, Tuple
+from typing import Hashable, Optional, Sequence, Tuple
 from twwanim.TriGraph import TriGraph
+from twwanim.GlyphCache import GlyphCache
+from twwanim.ContractionTable import ContractionTable
+from twwanim.Timeline import Timeline
+from twwanim.evaluation import find_key_steps
+from twwanim.segment import Segment, NUM_MAX_ROWS
+from twwanim.profiling import get_profiler
+from twwanim.pipeline import EncoderPipeline
 
 __all__ = ['TwinwidthAnimation']
 
@@ -10,71 +18,145 @@ __all__ = ['TwinwidthAnimation']
 #    Scene
 # ===============================================================================
 class TwinwidthAnimation(Scene):
-    def set_graph(self, graph: nx.Graph) -> None:
-        gb = graph.copy()  # black graph
-        gr = nx.Graph()
-        gr.add_nodes_from(gb.nodes())  # red graph
+    segment = None  # type: Optional[Segment]
+    lod_threshold = 120  # type: Optional[int]
+    lod_labels = False
+    steps_per_play = 0
+    fast_forward = False
+    fast_forward_threshold = None  # type: Optional[int]
+    encode_queue = 8
+    combine_every = 32
 
-        # normalize scale
-        layout = nx.get_node_attributes(gb, 'pos')
-        scale = self._find_scale(layout)
-
-        for k, v in layout.items():
-            if len(v) == 2:
-                x, y = v
-                z = 0.0
-            elif len(v) == 3:
-                x, y, z = v
-            else:
-                assert False, 'position must be in 2d or 3d'
+    def set_graph(self, graph: nx.Graph) -> None:
+        """Sets the input graph (not modified) and normalizes its `pos` attribute to the scene."""
 
-            layout[k] = [x * scale, y * scale, z * scale]
+        layout = nx.get_node_attributes(graph, 'pos')
+        try:
+            positions = np.array(list(layout.values()), dtype=float).reshape(len(layout), -1)
+        except ValueError:
+            assert False, 'unsupported dimensions'
+        assert positions.shape[1] in (2, 3), 'position must be in 2d or 3d'
 
-        nx.set_node_attributes(gb, layout, 'pos')
+        # normalize scale
+        positions *= self._find_scale(positions)
+        if positions.shape[1] == 2:
+            positions = np.hstack([positions, np.zeros((len(positions), 1))])
 
-        self.gb = gb
-        self.gr = gr
+        self.gb = graph
+        self.layout = dict(zip(layout, positions))
 
     def set_contraction_sequence(self, cs: Sequence[Tuple[Hashable, Hashable]]) -> None:
         self.cs = cs
 
+    def set_segment(self, segment: Optional[Segment]) -> None:
+        """Renders only the given part of the contraction sequence (None for the whole sequence)."""
+        self.segment = segment
+
+    def set_options(
+        self,
+        lod_threshold: Optional[int] = 120,
+        lod_labels: bool = False,
+        steps_per_play: int = 0,
+        fast_forward: bool = False,
+        fast_forward_threshold: Optional[int] = None,
+        encode_queue: int = 8,
+        combine_every: int = 32,
+    ) -> None:
+        """Sets rendering options.
+
+        Args:
+            lod_threshold: graphs with more vertices are drawn in level-of-detail mode (None to disable)
+            lod_labels: keeps vertex labels in level-of-detail mode
+            steps_per_play: number of contractions merged into one play call (0 for one call per animation phase)
+            fast_forward: animates only the contractions where the twin-width increases;
+                the others are applied instantly and shown by one transition
+            fast_forward_threshold: also animates the contractions with at least this max red degree
+            encode_queue: number of frames queued for the background encoder (0 to encode in the render thread)
+            combine_every: number of partial movies combined at once by the background encoder
+                while rendering (0 to combine all of them at the end; mp4, webm and mov only)
+        """
+        self.lod_threshold = lod_threshold
+        self.lod_labels = lod_labels
+        self.steps_per_play = steps_per_play
+        self.fast_forward = fast_forward
+        self.fast_forward_threshold = fast_forward_threshold
+        self.encode_queue = encode_queue
+        self.combine_every = combine_every
+
     def set_speed(self, speed: float) -> None:
         if speed <= 0:
             raise ValueError(f'speed must be a positive number: given {speed}')
         self.speed = 1.0 / speed  # store reciprocal
 
-    def _find_scale(self, layout: dict[Hashable, Sequence[float]]):
-        dim = [len(v) for v in layout.values()]
+    def _find_scale(self, positions: np.ndarray) -> float:
+        """Returns the factor that fits the bounding box of the positions (one row per vertex) to the scene."""
+
+        if len(positions) == 0:
+            return 1
+        max_range = np.ptp(positions, axis=0).max()
+        return 6.5 / max_range if max_range > 0 else 1
+
+    def _table_contents(self, glyphs: GlyphCache, row: Tuple) -> list[Mobject]:
+        """Returns the contents of the cells of a table row `(time, u, v, red degree)` (see `Segment`)."""
 
-        if all(d == 2 for d in dim):
-            is_3d = False
-        elif all(d == 3 for d in dim):
-            is_3d = True
+        t, u, v, reddeg = row
+        if isinstance(t, tuple):
+            # skipped contractions
+            row_time = glyphs.concat([glyphs.number(t[0]), glyphs.glyph('-'), glyphs.number(t[1])], 0.05)
+            row_contraction = glyphs.glyph(r'\cdots')
         else:
-            assert False, 'unsupported dimensions'
+            row_time = glyphs.number(t)
+            row_contraction = glyphs.concat([glyphs.label(u), glyphs.glyph(r'\gets'), glyphs.label(v)])
+        return [row_time, row_contraction, glyphs.number(reddeg)]
 
-        min_x = min(v[0] for v in layout.values())
-        max_x = max(v[0] for v in layout.values())
-        min_y = min(v[1] for v in layout.values())
-        max_y = max(v[1] for v in layout.values())
-        max_range = max(max_x - min_x, max_y - min_y)
+    def _instrument_file_writer(self) -> None:
+        """Records the time spent on writing frames to the encoder."""
 
-        if is_3d:
-            min_z = min(v[2] for v in layout.values())
-            max_z = max(v[2] for v in layout.values())
-            max_range = max(max_range, max_z - min_z)
+        prof = get_profiler()
+        file_writer = self.renderer.file_writer
+        write_frame = file_writer.write_frame
 
-        return 6.5 / max_range if max_range > 0 else 1
+        def timed_write_frame(*args, **kwargs):
+            with prof.phase('write_frame'):
+                return write_frame(*args, **kwargs)
+
+        file_writer.write_frame = timed_write_frame
 
     def construct(self):
-        G = TriGraph(self.gb, LEFT * 2)
-        self.play(G.create(), run_time=1)
+        prof = get_profiler()
+        if prof.enabled:
+            self._instrument_file_writer()
+
+        pipeline = None
+        file_writer = self.renderer.file_writer
+        if self.encode_queue > 0 and EncoderPipeline.supported(file_writer):
+            combine_every = self.combine_every if config.format in ('mp4', 'webm', 'mov') else 0
+            pipeline = EncoderPipeline(file_writer, self.encode_queue, combine_every)
+            pipeline.install()
+        try:
+            self._construct()
+        except BaseException:
+            if pipeline is not None:
+                try:
+                    pipeline.close()
+                except BaseException:
+                    pass  # report the original error
+            raise
 
-        tww = 0
+    def _construct(self) -> None:
+        segment = self.segment if self.segment is not None else Segment(0, len(self.cs))
+        prof = get_profiler()
+
+        lod = self.lod_threshold is not None and len(self.gb) > self.lod_threshold
+        G = TriGraph(self.gb, LEFT * 2, segment.data, self.layout, lod, self.lod_labels)
+
+        tww = segment.tww
+        tww_glyphs = GlyphCache()
         tww_label = Tex('Twin-width:').to_edge(UR).shift(LEFT * 1.5)
-        tww_count = MathTex(f'{tww}').next_to(tww_label)
+        tww_count = tww_glyphs.number(tww).next_to(tww_label)
 
         table_font_size = 28
+        glyphs = GlyphCache(table_font_size)
         table_base_y = 2.5
         row_height = 0.3
 
@@ -83,42 +165,69 @@ class TwinwidthAnimation(Scene):
         table_header_reddeg = Tex('max red deg.', font_size=table_font_size).move_to([5.2, table_base_y + row_height + 0.1, 0.0], aligned_edge=UL)
         tww_line = Line([2.6, 2.6, 0.0], [6.9, 2.6, 0.0], stroke_width=1)
 
-        self.play(
-            Succession(
-                Write(tww_label),
-                FadeIn(tww_count)
-            )
-        )
-
-        self.play(
-            Succession(
-                Create(table_header_time),
-                Create(table_header_contraction),
-                Create(table_header_reddeg),
-            ),
-            Create(tww_line),
-            run_time=0.5
-        )
-
-        rows = []
-        num_max_rows = 20
-
-        for t, (u, v) in enumerate(self.cs):
-            # scroll up
-            if len(rows) == num_max_rows:
-                self.play(
-                    *(FadeOut(x) for x in rows[0]),
-                    *(x.animate.shift(row_height * UP) for row in rows[1:] for x in row)
+        table = ContractionTable(NUM_MAX_ROWS, table_base_y - 0.1, row_height)
+
+        if segment.start == 0:
+            self.play(G.create(), run_time=1)
+
+            self.play(
+                Succession(
+                    Write(tww_label),
+                    FadeIn(tww_count)
                 )
-                rows = rows[1:]
+            )
+
+            self.play(
+                Succession(
+                    Create(table_header_time),
+                    Create(table_header_contraction),
+                    Create(table_header_reddeg),
+                ),
+                Create(tww_line),
+                run_time=0.5
+            )
+        else:
+            # resume from the snapshot without animation
+            for row in segment.rows:
+                table.add_row(self._table_contents(glyphs, row))
+
+            self.add(
+                *G.mobjects(),
+                tww_label, tww_count,
+                table_header_time, table_header_contraction, table_header_reddeg, tww_line,
+                *table.mobjects()
+            )
+
+        timeline = Timeline(self, self.steps_per_play)
+        key_steps = find_key_steps(self.gb, self.cs, self.fast_forward_threshold) if self.fast_forward else None
+        skipped = []  # (time, max red degree) of the contractions applied without animation
+
+        def fast_forward() -> None:
+            """Shows the skipped contractions as one transition and one table row."""
+            table.scroll(timeline)
+            row = table.add_row(self._table_contents(glyphs, ((skipped[0][0], skipped[-1][0]), None, None, max(d for _, d in skipped))))
+            G.fast_forward(timeline, [Write(x) for x in row], 1.0 * self.speed)
+            skipped.clear()
+            timeline.end_step()
+
+        for t in range(segment.start, segment.end):
+            u, v = self.cs[t]
+            prof.step = t + 1
+
+            if key_steps is not None and t not in key_steps:
+                G.skip(timeline, u, v)
+                skipped += [(t + 1, G.max_red_degree())]
+                continue
+            if skipped:
+                fast_forward()
 
             # main transition
-            row_y = 2.4 - row_height * len(rows)
-            row_time = Tex(f'${t + 1}$', font_size=table_font_size).move_to([3.0, row_y, 0.0], aligned_edge=ORIGIN)
-            row_contraction = Tex(f'${u} \gets {v}$', font_size=table_font_size).move_to([4.2, row_y, 0.0], aligned_edge=ORIGIN)
+            table.scroll(timeline)
+            row = table.add_row([glyphs.number(t + 1), glyphs.concat([glyphs.label(u), glyphs.glyph(r'\gets'), glyphs.label(v)])])
+            row_time, row_contraction = row[:2]
 
             # Do contraction
-            G.contract(self, u, v, [Write(row_time), Write(row_contraction)], self.speed)
+            G.contract(timeline, u, v, [Write(row_time), Write(row_contraction)], self.speed)
 
             # Update red degrees
             reddeg = G.max_red_degree()
@@ -127,17 +236,22 @@ class TwinwidthAnimation(Scene):
                 tww = reddeg
                 tww_updated = True
 
-            row_reddeg = Tex(f'${reddeg}$', font_size=table_font_size).move_to([6.0, row_y, 0.0], aligned_edge=ORIGIN)
-            rows += [[row_time, row_contraction, row_reddeg]]
+            row_reddeg = table.set_cell(row, 2, glyphs.number(reddeg))
 
             if tww_updated:
-                tww_count_new = MathTex(f'{tww}').next_to(tww_label, RIGHT)
+                tww_count_new = tww_glyphs.number(tww).next_to(tww_label, RIGHT)
 
-                self.play(
+                timeline.add(
+                    'reddeg',
                     Write(row_reddeg),
                     ReplacementTransform(tww_count, tww_count_new),
                     run_time=1.0 * self.speed
                 )
                 tww_count = tww_count_new
             else:
-                self.play(Write(row_reddeg), run_time=1.0 * self.speed)
+                timeline.add('reddeg', Write(row_reddeg), run_time=1.0 * self.speed)
+            timeline.end_step()
+
+        if skipped:
+            fast_forward()
+        timeline.flush()
@@ -0,0 +1,112 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from twwanim.cache import RenderCache
+
+__all__ = ['find_instances', 'run_instance', 'run_batch']
+
+GRAPH_EXTENSIONS = ['.gr', '.json', '.npz']
+CS_SUFFIXES = ['_cs.txt', '_cs.json', '_cs.npz']
+
+
+def find_instances(path: str) -> list[tuple[str, str]]:
+    """Returns the list of (graph path, contraction sequence path) pairs.
+
+    `path` is either a directory or a manifest file. In a directory, each graph file
+    `X.gr`, `X.json` or `X.npz` is paired with `X_cs.txt`, `X_cs.json` or `X_cs.npz`.
+    A manifest has one pair of paths per line, separated by whitespace and relative to
+    the manifest; lines starting with `#` are ignored.
+    """
+
+    ret = []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            stem, ext = os.path.splitext(name)
+            if ext not in GRAPH_EXTENSIONS or any(name.endswith(s) for s in CS_SUFFIXES):
+                continue
+            for suffix in CS_SUFFIXES:
+                cs_path = os.path.join(path, stem + suffix)
+                if os.path.exists(cs_path):
+                    ret += [(os.path.join(path, name), cs_path)]
+                    break
+    else:
+        base_dir = os.path.dirname(path)
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                graph_path, cs_path = line.split()
+                ret += [(os.path.join(base_dir, graph_path), os.path.join(base_dir, cs_path))]
+    return ret
+
+
+def _init_worker(evaluate: bool) -> None:
+    if not evaluate:
+        import twwanim.render  # noqa: F401  load manim once per worker
+
+
+def run_instance(
+    graph_path: str,
+    cs_path: str,
+    evaluate: bool,
+    speed: float = 1.0,
+    options: dict = {},
+    scene_options: dict = {},
+    layout: str = 'auto',
+    cache: Optional[RenderCache] = None,
+) -> dict:
+    """Evaluates or renders one instance and returns a summary record (never raises).
+
+    Graphs without positions are laid out by the `layout` method; layouts are stored in `cache` if given.
+    """
+
+    from twwanim.readwrite import load_graph, load_cs
+
+    name = os.path.splitext(os.path.basename(graph_path))[0]
+    ret = {'name': name, 'graph': graph_path, 'cs': cs_path}
+    start = time.perf_counter()
+    try:
+        g = load_graph(graph_path)
+        cs = load_cs(cs_path)
+        ret.update({'n': len(g), 'm': g.number_of_edges(), 'length': len(cs)})
+
+        if evaluate:
+            from twwanim.evaluation import evaluate_twin_width
+            ret['twin_width'] = evaluate_twin_width(g, cs)
+        else:
+            from twwanim.pipeline import private_partial_movie_dir
+            from twwanim.render import make_config, render_movie
+            config = make_config(**options)
+            config.output_file = name
+            with private_partial_movie_dir(config):  # instances render in parallel
+                ret['output'] = render_movie(g, cs, speed, config, scene_options=scene_options, layout=layout, cache=cache)
+        ret['status'] = 'ok'
+    except Exception as e:
+        ret['status'] = 'error'
+        ret['error'] = f'{type(e).__name__}: {e}'
+        ret['traceback'] = traceback.format_exc()
+    ret['seconds'] = time.perf_counter() - start
+    return ret
+
+
+def run_batch(
+    instances: list[tuple[str, str]],
+    evaluate: bool,
+    speed: float = 1.0,
+    options: dict = {},
+    jobs: Optional[int] = None,
+    scene_options: dict = {},
+    layout: str = 'auto',
+    cache: Optional[RenderCache] = None,
+) -> list[dict]:
+    """Processes instances over a pool of worker processes that stay alive across instances.
+
+    Returns summary records in the order of `instances`.
+    """
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(evaluate,)) as executor:
+        futures = [executor.submit(run_instance, graph_path, cs_path, evaluate, speed, options, scene_options, layout, cache) for graph_path, cs_path in instances]
+        return [f.result() for f in futures]
@@ -0,0 +1,62 @@
+import os
+import shutil
+from typing import Optional
+
+__all__ = ['RenderCache']
+
+
+class RenderCache:
+    """Content-addressed store of rendered movie files.
+
+    Entries are files named `<key><ext>` in a single directory, where keys are digests of
+    the render inputs (see `twwanim.digest`). Reading an entry refreshes its modification
+    time; `evict()` removes the least recently used entries while the total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str, ext: str) -> str:
+        return os.path.join(self.directory, key + ext)
+
+    def get(self, key: str, ext: str) -> Optional[str]:
+        """Returns the path to the cached file, or None if not cached."""
+        path = self.path(key, ext)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)  # mark as recently used
+        return path
+
+    def put(self, key: str, src_path: str, move: bool = False) -> str:
+        """Stores a copy of the file (or moves it if `move` is true) and returns the cached path."""
+        path = self.path(key, os.path.splitext(src_path)[1])
+        tmp_path = path + '.tmp'
+        if move:
+            shutil.move(src_path, tmp_path)
+        else:
+            shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the total size fits in `max_bytes`.
+
+        This is not done in `put()` so that entries in use by the current render are not removed.
+        """
+        if self.max_bytes is None:
+            return
+
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                st = entry.stat()
+                entries += [(st.st_mtime, st.st_size, entry.path)]
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
@@ -0,0 +1,85 @@
+import json
+import os
+import pickle
+from typing import Optional
+from twwanim.segment import Segment
+
+__all__ = ['Checkpoint']
+
+
+class Checkpoint:
+    """Persistent record of rendered segments, used to resume an interrupted render.
+
+    The directory holds a manifest (`checkpoint.json`) with the render key and the partial
+    movie file of each completed segment, and the pickled segment snapshots (`segments.pickle`).
+    A checkpoint written for different inputs (i.e. a different key) is discarded.
+    """
+
+    MANIFEST = 'checkpoint.json'
+    SEGMENTS = 'segments.pickle'
+
+    def __init__(self, directory: str, key: str) -> None:
+        self.directory = directory
+        self.key = key
+        self.completed = {}  # type: dict[int, str]
+
+        manifest = self._load_manifest()
+        if manifest is not None and manifest.get('key') == key:
+            self.completed = {int(i): path for i, path in manifest['completed'].items() if os.path.exists(path)}
+        else:
+            self.clear()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load_manifest(self) -> Optional[dict]:
+        try:
+            with open(self._path(self.MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_manifest(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(self.MANIFEST + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'key': self.key, 'completed': self.completed}, f)
+        os.replace(tmp_path, self._path(self.MANIFEST))  # atomic update
+
+    def load_segments(self) -> Optional[list[Segment]]:
+        try:
+            with open(self._path(self.SEGMENTS), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def save_segments(self, segments: list[Segment]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(self.SEGMENTS + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(segments, f)
+        os.replace(tmp_path, self._path(self.SEGMENTS))
+        self._save_manifest()
+
+    def is_completed(self, index: int) -> bool:
+        return index in self.completed
+
+    def mark_completed(self, index: int, movie_path: str) -> None:
+        self.completed[index] = movie_path
+        self._save_manifest()
+
+    def last_completed_step(self, segments: list[Segment]) -> int:
+        """Returns the number of contractions rendered without a gap from the beginning."""
+        ret = 0
+        for i, seg in enumerate(segments):
+            if not self.is_completed(i):
+                break
+            ret = seg.end
+        return ret
+
+    def clear(self) -> None:
+        """Removes the checkpoint files (partial movies are not touched)."""
+        self.completed = {}
+        for name in [self.MANIFEST, self.SEGMENTS]:
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
@@ -0,0 +1,363 @@
+import networkx as nx
+from array import array
+from typing import Hashable, Iterator, Optional
+from twwanim.data.ContractAction import ContractAction
+
+__all__ = ['ArrayTriGraphData']
+
+
+class ArrayTriGraphData:
+    """Integer-indexed trigraph with incrementally maintained max red degree.
+
+    Drop-in alternative to `TriGraphData`: `contract()` returns the same `ContractAction`
+    (in the original vertex labels), but vertices are mapped to indices `[0, n)` and
+    adjacency is kept in per-vertex integer sets instead of NetworkX graphs.
+
+    Red degrees are tracked in a bucket structure (`red_degree_count[d]` is the number of
+    vertices with red degree `d`), so `max_red_degree()` is O(1) and each edge change
+    updates the maximum in O(1). The other red-degree statistics (a vertex attaining the
+    maximum, the number of red edges, and the max red degree after each contraction) are
+    maintained in the same way.
+    """
+
+    def __init__(self, g: nx.Graph) -> None:
+        self.labels = list(g.nodes())
+        self.index = {x: i for i, x in enumerate(self.labels)}
+        n = len(self.labels)
+
+        self.black = [set() for _ in range(n)]  # type: list[set[int]]
+        self.red = [set() for _ in range(n)]  # type: list[set[int]]
+        self.removed = [False] * n
+        self.num_nodes = n
+
+        # ID and orientation of each edge: key (i, j) with i < j; the ID (see `ContractAction`)
+        # shifted left by one, plus 1 if the edge is oriented as (j, i)
+        self.edge_code = {}  # type: dict[tuple[int, int], int]
+
+        for k, (u, v) in enumerate(g.edges()):
+            i, j = self.index[u], self.index[v]
+            self.black[i].add(j)
+            self.black[j].add(i)
+            self.edge_code[(i, j) if i < j else (j, i)] = k << 1 | (i > j)
+
+        self._init_red_degrees()
+
+        # statistics
+        self.history = array('i')  # max red degree after each contraction
+        self.width = 0  # max red degree over all steps
+
+        self.undo_log = None  # type: Optional[list[tuple]]
+
+    @classmethod
+    def from_state(
+        cls,
+        labels: list[Hashable],
+        black: list[set[int]],
+        red: list[set[int]],
+        removed: list[bool],
+        edge_code: dict[tuple[int, int], int],
+        width: int = 0,
+    ) -> 'ArrayTriGraphData':
+        """Creates a trigraph in the middle of a contraction sequence from its index-based state (see `TriGraphArrays`)."""
+        ret = cls.__new__(cls)
+        ret.labels = labels
+        ret.index = {x: i for i, x in enumerate(labels)}
+        ret.black = black
+        ret.red = red
+        ret.removed = removed
+        ret.num_nodes = len(labels) - sum(removed)
+        ret.edge_code = edge_code
+        ret._init_red_degrees()
+        ret.history = array('i')
+        ret.width = width
+        ret.undo_log = None
+        return ret
+
+    def _init_red_degrees(self) -> None:
+        """Builds the red degree buckets from the red adjacency."""
+        n = len(self.labels)
+        self.red_degree_count = [0] * max(n, 1)
+        self.red_degree_bucket = [set() for _ in range(max(n, 1))]  # type: list[set[int]]
+        for i in range(n):
+            if not self.removed[i]:
+                d = len(self.red[i])
+                self.red_degree_count[d] += 1
+                self.red_degree_bucket[d].add(i)
+        self._max_red_degree = max((d for d, c in enumerate(self.red_degree_count) if c), default=0)
+        self.num_red_edges = sum(len(nbrs) for nbrs in self.red) // 2
+
+    def __len__(self) -> int:
+        return self.num_nodes
+
+    # ---------------------------------------------------------------------------
+    #    Queries
+    # ---------------------------------------------------------------------------
+    def max_red_degree(self) -> int:
+        return self._max_red_degree
+
+    def red_degree(self, x: Hashable) -> int:
+        return len(self.red[self.index[x]])
+
+    def max_red_degree_vertex(self) -> Optional[Hashable]:
+        """Returns a vertex with the maximum red degree (None if the graph is empty)."""
+        bucket = self.red_degree_bucket[self._max_red_degree]
+        return self.labels[next(iter(bucket))] if bucket else None
+
+    def red_degree_histogram(self) -> list[int]:
+        """Returns the number of vertices with red degree `d` for `d = 0, ..., max_red_degree()`."""
+        return self.red_degree_count[:self._max_red_degree + 1]
+
+    def number_of_red_edges(self) -> int:
+        return self.num_red_edges
+
+    def twin_width(self) -> int:
+        """Returns the width of the contractions done so far."""
+        return self.width
+
+    def stats(self) -> dict:
+        """Returns the current red-degree statistics."""
+        return {
+            'step': len(self.history),
+            'max_red_degree': self._max_red_degree,
+            'max_red_degree_vertex': self.max_red_degree_vertex(),
+            'red_degree_histogram': self.red_degree_histogram(),
+            'red_edges': self.num_red_edges,
+            'twin_width': self.width,
+        }
+
+    def nodes(self) -> Iterator[Hashable]:
+        return (x for i, x in enumerate(self.labels) if not self.removed[i])
+
+    def black_edges(self) -> Iterator[tuple[Hashable, Hashable]]:
+        return self._edges(self.black)
+
+    def red_edges(self) -> Iterator[tuple[Hashable, Hashable]]:
+        return self._edges(self.red)
+
+    def black_edges_at(self, x: Hashable) -> list[tuple[Hashable, Hashable]]:
+        """Returns the black edges incident to `x`."""
+        i = self.index[x]
+        return [self._oriented(i, j) for j in self.black[i]]
+
+    def edge_id(self, x: Hashable, y: Hashable) -> int:
+        """Returns the ID of the edge xy (see `ContractAction`)."""
+        i, j = self.index[x], self.index[y]
+        return self.edge_code[(i, j) if i < j else (j, i)] >> 1
+
+    def _edges(self, adj: list[set[int]]) -> Iterator[tuple[Hashable, Hashable]]:
+        for i, nbrs in enumerate(adj):
+            for j in nbrs:
+                if i < j:
+                    yield self._oriented(i, j)
+
+    def _oriented(self, i: int, j: int) -> tuple[Hashable, Hashable]:
+        """Returns the edge ij in its stored orientation (original labels)."""
+        x, y = self._oriented_index(i, j)
+        return self.labels[x], self.labels[y]
+
+    def _oriented_index(self, i: int, j: int) -> tuple[int, int]:
+        """Returns the edge ij in its stored orientation (indices)."""
+        return (j, i) if self.edge_code[(i, j) if i < j else (j, i)] & 1 == (i < j) else (i, j)
+
+    # ---------------------------------------------------------------------------
+    #    Red degree buckets
+    # ---------------------------------------------------------------------------
+    def _increment_red_degree(self, i: int) -> None:
+        d = len(self.red[i]) - 1  # degree before the edge was added
+        self.red_degree_count[d] -= 1
+        self.red_degree_count[d + 1] += 1
+        self.red_degree_bucket[d].discard(i)
+        self.red_degree_bucket[d + 1].add(i)
+        if self._max_red_degree == d:
+            self._max_red_degree = d + 1
+
+    def _decrement_red_degree(self, i: int) -> None:
+        d = len(self.red[i]) + 1  # degree before the edge was removed
+        self.red_degree_count[d] -= 1
+        self.red_degree_count[d - 1] += 1
+        self.red_degree_bucket[d].discard(i)
+        self.red_degree_bucket[d - 1].add(i)
+        if self._max_red_degree == d and self.red_degree_count[d] == 0:
+            self._max_red_degree = d - 1
+
+    def _add_red_edge(self, i: int, j: int) -> None:
+        self.red[i].add(j)
+        self.red[j].add(i)
+        self.num_red_edges += 1
+        self._increment_red_degree(i)
+        self._increment_red_degree(j)
+
+    def _remove_red_edge(self, i: int, j: int) -> None:
+        self.red[i].discard(j)
+        self.red[j].discard(i)
+        self.num_red_edges -= 1
+        self._decrement_red_degree(i)
+        self._decrement_red_degree(j)
+
+    # ---------------------------------------------------------------------------
+    #    Snapshots
+    # ---------------------------------------------------------------------------
+    def snapshot(self) -> int:
+        """Starts recording undo information and returns a token for `rollback()`.
+
+        Each contraction after the first snapshot stores the previous state of the two
+        contracted vertices, which costs about as much as the contraction itself.
+        """
+        if self.undo_log is None:
+            self.undo_log = []
+        return len(self.undo_log)
+
+    def rollback(self, token: int) -> None:
+        """Undoes the contractions done since `snapshot()` returned `token`."""
+        while len(self.undo_log) > token:
+            self._undo(self.undo_log.pop())
+
+    def release(self) -> None:
+        """Stops recording undo information; previous tokens become invalid."""
+        self.undo_log = None
+
+    def _undo_record(self, a: int, b: int) -> tuple:
+        code = self.edge_code
+        nbrs = self.black[a] | self.red[a] | self.black[b] | self.red[b]
+        edge_code = {}
+        for x in (a, b):
+            for w in self.black[x] | self.red[x]:
+                k = (x, w) if x < w else (w, x)
+                edge_code[k] = code[k]
+        return (
+            a, b, set(self.black[a]), set(self.red[a]), set(self.black[b]), set(self.red[b]), nbrs, edge_code,
+            self._max_red_degree, self.num_red_edges, self.width,
+        )
+
+    def _undo(self, record: tuple) -> None:
+        a, b, black_a, red_a, black_b, red_b, nbrs, edge_code, max_red_degree, num_red_edges, width = record
+        affected = nbrs | {a, b}
+
+        # take the affected vertices out of the red degree buckets
+        for x in affected:
+            if not self.removed[x]:
+                d = len(self.red[x])
+                self.red_degree_count[d] -= 1
+                self.red_degree_bucket[d].discard(x)
+
+        # edge IDs and orientation
+        for w in self.black[a] | self.red[a]:
+            del self.edge_code[(a, w) if a < w else (w, a)]
+        self.edge_code.update(edge_code)
+
+        # adjacency
+        for w in black_a - self.black[a]:
+            self.black[w].add(a)
+        for w in self.red[a] - red_a:
+            self.red[w].discard(a)
+        for w in black_b:
+            self.black[w].add(b)
+        for w in red_b:
+            self.red[w].add(b)
+        self.black[a], self.red[a], self.black[b], self.red[b] = black_a, red_a, black_b, red_b
+        self.removed[b] = False
+        self.num_nodes += 1
+
+        # put them back at their restored degrees
+        for x in affected:
+            if self.removed[x]:
+                continue
+            d = len(self.red[x])
+            self.red_degree_count[d] += 1
+            self.red_degree_bucket[d].add(x)
+
+        self._max_red_degree = max_red_degree
+        self.num_red_edges = num_red_edges
+        self.history.pop()
+        self.width = width
+
+    # ---------------------------------------------------------------------------
+    #    Contraction
+    # ---------------------------------------------------------------------------
+    def contract(self, u: Hashable, v: Hashable) -> ContractAction:
+        ret = ContractAction(self.labels)
+        add = ret.add
+        a, b = self.index[u], self.index[v]
+        if self.undo_log is not None:
+            self.undo_log.append(self._undo_record(a, b))
+        bu, bv, ru, rv = self.black[a], self.black[b], self.red[a], self.red[b]
+        nu, nv = bu | ru, bv | rv
+        code = self.edge_code
+        ab = {a, b}
+
+        def e(x: int, w: int) -> int:
+            return code[(x, w) if x < w else (w, x)] >> 1
+
+        def starts_at(x: int, w: int) -> bool:
+            """Returns True if the edge xw is oriented as (x, w)."""
+            return code[(x, w) if x < w else (w, x)] & 1 == (x > w)
+
+        def move(w: int) -> tuple[int, int, int]:
+            return (e(b, w), a, w) if starts_at(b, w) else (e(b, w), w, a)
+
+        # edges between u and v
+        if b in nu:
+            add(ContractAction.EDGE_SHRINK, e(a, b), 0 if starts_at(a, b) else 1)
+
+        # unshared neighbors
+        v_only = nv - nu - ab
+        u_only = nu - nv - ab
+        for w in v_only:
+            add(ContractAction.HIGHLIGHT_TO_RED, e(b, w))
+            add(ContractAction.EDGE_MOVE, *move(w))
+
+        for w in u_only:
+            add(ContractAction.HIGHLIGHT_TO_RED, e(a, w))
+
+        # common neighbors
+        for w in (bv & nu) | (rv & ru):
+            add(ContractAction.EDGE_MOVE, *move(w))
+            add(ContractAction.EDGE_FADEOUT, e(b, w))
+            if w in bv:
+                add(ContractAction.HIGHLIGHT_WHITE_TO_GREEN, e(b, w))
+            else:
+                add(ContractAction.HIGHLIGHT_RED_TO_GREEN, e(b, w))
+            if w in bu:
+                add(ContractAction.HIGHLIGHT_WHITE_TO_GREEN, e(a, w))
+            else:
+                add(ContractAction.HIGHLIGHT_RED_TO_GREEN, e(a, w))
+
+        red_v_black_u = rv & bu
+        for w in red_v_black_u:
+            add(ContractAction.HIGHLIGHT_RED_TO_GREEN, e(b, w))
+            add(ContractAction.HIGHLIGHT_WHITE_TO_GREEN, e(a, w))
+            add(ContractAction.EDGE_MOVE, *move(w))
+            add(ContractAction.EDGE_FADEOUT, e(a, w))
+
+        # edges moved onto u keep their ID and the endpoint order of the v-side edge
+        for w in v_only | red_v_black_u:
+            code[(a, w) if a < w else (w, a)] = e(b, w) << 1 | (starts_at(b, w) == (a > w))
+        for w in nv:
+            del code[(b, w) if b < w else (w, b)]
+
+        # remove v
+        for w in bv:
+            self.black[w].discard(b)
+        for w in list(rv):
+            self._remove_red_edge(b, w)
+        bv.clear()
+        self.red_degree_count[0] -= 1
+        self.red_degree_bucket[0].discard(b)
+        self.removed[b] = True
+        self.num_nodes -= 1
+
+        # update u
+        for w in v_only:
+            self._add_red_edge(a, w)
+        for w in red_v_black_u:
+            bu.discard(w)
+            self.black[w].discard(a)
+            self._add_red_edge(a, w)
+        for w in u_only - ru:
+            bu.discard(w)
+            self.black[w].discard(a)
+            self._add_red_edge(a, w)
+
+        self.history.append(self._max_red_degree)
+        self.width = max(self.width, self._max_red_degree)
+        return ret
@@ -1,16 +1,80 @@
+from array import array
+from typing import Hashable, Iterator, Optional, Sequence
+
+__all__ = ['ContractAction']
+
+
 class ContractAction:
-    def __init__(self) -> None:
-        self.highlight_to_red = []
-        self.highlight_white_to_green = []
-        self.highlight_red_to_green = []
-
-        # list of (start, end, u_index)
-        # u_index=0 if start=u; u_index=1 if end=u
-        self.edge_shrink = []
-
-        # list of (before:start, before:end, after:start, after:end)
-        self.edge_move = []
-        self.edge_fadeout = []
+    """Changes of the edges by one contraction, from which the animation is built.
+
+    Edges are referred to by their ID: the position of the edge in `g.edges()` of the original
+    graph. An edge keeps its ID when it is moved, and no contraction creates an edge, so the
+    IDs of the edges present at any time are a subset of `[0, m)`.
+
+    Entries are stored compactly as one kind code per entry (`kinds`) and the integers of all
+    entries concatenated in one integer array (`ids`); `SIZES[kind]` integers per entry.
+    The lists (`highlight_to_red`, ...) are decoded on access, with the vertices in the original labels.
+    """
+
+    __slots__ = ['labels', 'kinds', 'ids']
+
+    KINDS = ['highlight_to_red', 'highlight_white_to_green', 'highlight_red_to_green', 'edge_shrink', 'edge_move', 'edge_fadeout']
+    HIGHLIGHT_TO_RED, HIGHLIGHT_WHITE_TO_GREEN, HIGHLIGHT_RED_TO_GREEN, EDGE_SHRINK, EDGE_MOVE, EDGE_FADEOUT = range(6)
+
+    # (edge,) for highlights and fade-outs
+    # (edge, u_index) for shrinks: u_index=0 if the edge starts at u; u_index=1 if it ends at u
+    # (edge, after:start, after:end) for moves, with vertex indices
+    SIZES = [1, 1, 1, 2, 3, 1]
+
+    def __init__(self, labels: Optional[Sequence[Hashable]] = None) -> None:
+        self.labels = labels  # vertex label of each index (None if the indices are the labels)
+        self.kinds = array('B')
+        self.ids = array('i')
+
+    def add(self, kind: int, *ids: int) -> None:
+        self.kinds.append(kind)
+        self.ids.extend(ids)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def entries(self) -> Iterator[tuple[int, tuple[int, ...]]]:
+        """Yields `(kind, integers)` of each entry in the order added."""
+        ids, sizes = self.ids, self.SIZES
+        offset = 0
+        for kind in self.kinds:
+            size = sizes[kind]
+            yield kind, tuple(ids[offset:offset + size])
+            offset += size
+
+    def _decode(self, kind: int) -> list:
+        return [ids[0] if len(ids) == 1 else ids for k, ids in self.entries() if k == kind]
+
+    @property
+    def highlight_to_red(self) -> list[int]:
+        return self._decode(self.HIGHLIGHT_TO_RED)
+
+    @property
+    def highlight_white_to_green(self) -> list[int]:
+        return self._decode(self.HIGHLIGHT_WHITE_TO_GREEN)
+
+    @property
+    def highlight_red_to_green(self) -> list[int]:
+        return self._decode(self.HIGHLIGHT_RED_TO_GREEN)
+
+    @property
+    def edge_shrink(self) -> list[tuple[int, int]]:
+        return self._decode(self.EDGE_SHRINK)
+
+    @property
+    def edge_move(self) -> list[tuple[int, Hashable, Hashable]]:
+        labels = self.labels
+        moves = self._decode(self.EDGE_MOVE)
+        return moves if labels is None else [(e, labels[x], labels[y]) for e, x, y in moves]
+
+    @property
+    def edge_fadeout(self) -> list[int]:
+        return self._decode(self.EDGE_FADEOUT)
 
     def __repr__(self) -> str:
         return '\n'.join([
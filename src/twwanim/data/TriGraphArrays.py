@@ -0,0 +1,180 @@
+import json
+import numpy as np
+import networkx as nx
+from multiprocessing import shared_memory
+from typing import Hashable, Optional
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+from twwanim.readwrite.container import _node_array
+
+__all__ = ['TriGraphArrays']
+
+MAGIC = b'TWWTRI03'
+ALIGNMENT = 8
+
+
+class TriGraphArrays:
+    """Flat-array snapshot of a trigraph that can be shared between processes without pickling.
+
+    Black and red adjacency are stored in CSR form over vertex indices `[0, n)`:
+    the neighbors of `i` are `indices[indptr[i]:indptr[i + 1]]`, `edge` holds the ID of the
+    edge of each entry (see `ContractAction`), and `forward` is 1 at the entries where the
+    edge is oriented from `i` to the neighbor. `removed` marks contracted
+    vertices. Labels are stored as an integer or string array; other labels are not supported.
+
+    The serialized form is one contiguous buffer (a small JSON header followed by the
+    arrays), so it can be placed in `multiprocessing.shared_memory` or a file. `from_buffer()`
+    and `load()` return NumPy views on the buffer; nothing is copied until `to_data()`
+    builds a mutable `ArrayTriGraphData` from it.
+    """
+
+    FIELDS = [
+        'labels', 'removed',
+        'black_indptr', 'black_indices', 'black_edge', 'black_forward',
+        'red_indptr', 'red_indices', 'red_edge', 'red_forward',
+    ]
+
+    def __init__(self, arrays: dict[str, np.ndarray], width: int = 0) -> None:
+        self.arrays = arrays
+        self.width = width
+
+    def __len__(self) -> int:
+        return len(self.arrays['removed'])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def labels(self) -> list[Hashable]:
+        return self.arrays['labels'].tolist()
+
+    def neighbors(self, i: int, color: str = 'black') -> np.ndarray:
+        """Returns the indices of the black (or red) neighbors of vertex index `i`."""
+        indptr, indices = self.arrays[f'{color}_indptr'], self.arrays[f'{color}_indices']
+        return indices[indptr[i]:indptr[i + 1]]
+
+    # ---------------------------------------------------------------------------
+    #    Conversion
+    # ---------------------------------------------------------------------------
+    @classmethod
+    def from_graph(cls, g: nx.Graph) -> 'TriGraphArrays':
+        return cls.from_data(ArrayTriGraphData(g))
+
+    @classmethod
+    def from_data(cls, data: ArrayTriGraphData) -> 'TriGraphArrays':
+        """Takes a snapshot of the current state of `data`; raises ValueError for labels other than integers and strings."""
+
+        def csr(adj: list[set[int]]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            indptr = np.zeros(len(adj) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(nbrs) for nbrs in adj])
+            indices = np.fromiter((j for nbrs in adj for j in sorted(nbrs)), dtype=np.int32, count=indptr[-1])
+            rows = np.repeat(np.arange(len(adj), dtype=np.int32), np.diff(indptr))
+            code = np.fromiter(
+                (data.edge_code[(i, j) if i < j else (j, i)] for i, j in zip(rows.tolist(), indices.tolist())),
+                dtype=np.int64, count=len(indices)
+            )
+            forward = ((code & 1) == (rows > indices)).astype(np.uint8)
+            return indptr, indices, (code >> 1).astype(np.int32), forward
+
+        arrays = {'labels': _node_array(data.labels), 'removed': np.array(data.removed, dtype=np.uint8)}
+        for color, adj in [('black', data.black), ('red', data.red)]:
+            arrays[f'{color}_indptr'], arrays[f'{color}_indices'], arrays[f'{color}_edge'], arrays[f'{color}_forward'] = csr(adj)
+        return cls(arrays, data.width)
+
+    def to_data(self) -> ArrayTriGraphData:
+        """Builds a mutable trigraph (the copy-on-write path for contracting from this state)."""
+        adj = {}
+        for color in ['black', 'red']:
+            indptr = self.arrays[f'{color}_indptr'].tolist()
+            indices = self.arrays[f'{color}_indices'].tolist()
+            adj[color] = [set(indices[indptr[i]:indptr[i + 1]]) for i in range(len(self))]
+
+        # edge IDs and orientation from the entries (i, j) with i < j
+        edge_code = {}
+        for color in ['black', 'red']:
+            indptr, indices, edge, forward = (self.arrays[f'{color}_{x}'] for x in ['indptr', 'indices', 'edge', 'forward'])
+            rows = np.repeat(np.arange(len(self), dtype=np.int32), np.diff(indptr))
+            mask = rows < indices
+            code = edge[mask].astype(np.int64) << 1 | (forward[mask] == 0)
+            edge_code.update(zip(zip(rows[mask].tolist(), indices[mask].tolist()), code.tolist()))
+
+        return ArrayTriGraphData.from_state(
+            self.labels(), adj['black'], adj['red'], self.arrays['removed'].astype(bool).tolist(), edge_code, self.width
+        )
+
+    # ---------------------------------------------------------------------------
+    #    Serialization
+    # ---------------------------------------------------------------------------
+    def _layout(self) -> tuple[bytes, dict[str, int], int]:
+        """Returns the header, the offset of each array and the total size."""
+        fields = {}
+        offset = 0
+        for name in self.FIELDS:
+            a = self.arrays[name]
+            fields[name] = [a.dtype.str, len(a), offset]
+            offset += -(-a.nbytes // ALIGNMENT) * ALIGNMENT
+
+        meta = {'fields': fields, 'width': self.width}
+        header = json.dumps(meta).encode()
+        header += b' ' * (-(len(MAGIC) + 8 + len(header)) % ALIGNMENT)
+        base = len(MAGIC) + 8 + len(header)
+        return header, {name: base + f[2] for name, f in fields.items()}, base + offset
+
+    @property
+    def nbytes(self) -> int:
+        return self._layout()[2]
+
+    def to_buffer(self, buf: Optional[memoryview] = None) -> memoryview:
+        """Writes the serialized form to `buf` (a new bytearray if None) and returns it."""
+        header, offsets, size = self._layout()
+        buf = memoryview(bytearray(size) if buf is None else buf)
+        buf[:len(MAGIC)] = MAGIC
+        buf[len(MAGIC):len(MAGIC) + 8] = len(header).to_bytes(8, 'little')
+        buf[len(MAGIC) + 8:len(MAGIC) + 8 + len(header)] = header
+        for name, offset in offsets.items():
+            a = np.ascontiguousarray(self.arrays[name])
+            buf[offset:offset + a.nbytes] = a.view(np.uint8).reshape(-1)
+        return buf
+
+    @classmethod
+    def from_buffer(cls, buf) -> 'TriGraphArrays':
+        """Returns arrays that are views on `buf` (no copy)."""
+        buf = memoryview(buf)
+        if bytes(buf[:len(MAGIC)]) != MAGIC:
+            raise ValueError('not a trigraph buffer')
+        header_size = int.from_bytes(buf[len(MAGIC):len(MAGIC) + 8], 'little')
+        base = len(MAGIC) + 8 + header_size
+        meta = json.loads(bytes(buf[len(MAGIC) + 8:base]))
+
+        arrays = {}
+        for name, (dtype, count, offset) in meta['fields'].items():
+            if np.dtype(dtype).hasobject:
+                raise ValueError(f'object arrays are not supported: {name}')
+            arrays[name] = np.frombuffer(buf, dtype=np.dtype(dtype), count=count, offset=base + offset)
+        return cls(arrays, meta['width'])
+
+    def to_shared_memory(self, name: Optional[str] = None) -> shared_memory.SharedMemory:
+        """Copies the serialized form into a new shared memory block.
+
+        The caller owns the block and must `close()` and `unlink()` it when done.
+        """
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(1, self.nbytes))
+        self.to_buffer(shm.buf)
+        return shm
+
+    @classmethod
+    def attach(cls, name: str) -> tuple['TriGraphArrays', shared_memory.SharedMemory]:
+        """Attaches to a shared memory block created by `to_shared_memory()`.
+
+        The arrays are read-only views on the block; keep the returned block open while using them.
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        ret = cls.from_buffer(shm.buf.toreadonly())
+        return ret, shm
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(self.to_buffer())
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: str = 'r') -> 'TriGraphArrays':
+        """Memory-maps a file written by `save()`; `mmap_mode` is 'r' (read-only) or 'c' (copy-on-write)."""
+        return cls.from_buffer(np.memmap(path, dtype=np.uint8, mode=mmap_mode))
@@ -4,60 +4,92 @@ from twwanim.data.ContractAction import ContractAction
 
 __all__ = ['TriGraphData']
 
+
 class TriGraphData:
     def __init__(self, g: nx.Graph) -> None:
         self.gb = g  # black graph
         self.gr = nx.empty_graph(g.nodes())  # type: nx.Graph  # red graph
-        self.edge_orientation = {}
-        for u, v in g.edges():
-            self.edge_orientation[u, v] = (u, v)
-            self.edge_orientation[v, u] = (u, v)
+
+        # vertex indices for `ContractAction`
+        self.labels = list(g.nodes())
+        self.index = {x: i for i, x in enumerate(self.labels)}
+
+        # ID and orientation of each edge, keyed by the vertex indices (i, j) with i < j (see `ArrayTriGraphData`)
+        self.edge_code = {}  # type: dict[tuple[int, int], int]
+        for k, (u, v) in enumerate(g.edges()):
+            i, j = self.index[u], self.index[v]
+            self.edge_code[(i, j) if i < j else (j, i)] = k << 1 | (i > j)
+
+    def _key(self, x: Hashable, y: Hashable) -> tuple[int, int]:
+        i, j = self.index[x], self.index[y]
+        return (i, j) if i < j else (j, i)
+
+    def edge_id(self, x: Hashable, y: Hashable) -> int:
+        """Returns the ID of the edge xy (see `ContractAction`)."""
+        return self.edge_code[self._key(x, y)] >> 1
+
+    def oriented(self, x: Hashable, y: Hashable) -> tuple[Hashable, Hashable]:
+        """Returns the edge xy in its stored orientation."""
+        return (x, y) if self.edge_code[self._key(x, y)] & 1 == (self.index[x] > self.index[y]) else (y, x)
 
     def max_red_degree(self) -> int:
         return max(d for _, d in self.gr.degree())
 
     def contract(self, u: Hashable, v: Hashable) -> ContractAction:
-        ret = ContractAction()
+        ret = ContractAction(self.labels)
+        index = self.index
         b_u_nbrs = set(self.gb[u])
         b_v_nbrs = set(self.gb[v])
         r_u_nbrs = set(self.gr[u])
         r_v_nbrs = set(self.gr[v])
-        o = self.edge_orientation
+        e = self.edge_id
+        add = ret.add
+
+        def move(w: Hashable) -> tuple[int, int, int]:
+            return (e(v, w), index[u], index[w]) if self.oriented(v, w)[0] == v else (e(v, w), index[w], index[u])
 
         # edges between u and v
         if v in (b_u_nbrs | r_u_nbrs):
-            ret.edge_shrink += [(u, v, 0) if o[u, v][0] == u else (v, u, 1)]
+            add(ContractAction.EDGE_SHRINK, e(u, v), 0 if self.oriented(u, v)[0] == u else 1)
 
         # unshared neighbors
         for w in (b_v_nbrs | r_v_nbrs) - b_u_nbrs - r_u_nbrs - {u, v}:
-            ret.highlight_to_red += [o[v, w]]
+            add(ContractAction.HIGHLIGHT_TO_RED, e(v, w))
 
             # Move: vw -> uw
-            ret.edge_move += [(v, w, u, w) if o[v, w][0] == v else (w, v, w, u)]
+            add(ContractAction.EDGE_MOVE, *move(w))
 
         for w in (b_u_nbrs | r_u_nbrs) - b_v_nbrs - r_v_nbrs - {u, v}:
-            ret.highlight_to_red += [o[u, w]]
+            add(ContractAction.HIGHLIGHT_TO_RED, e(u, w))
 
         # common neighbors
         for w in (b_v_nbrs & (b_u_nbrs | r_u_nbrs)) | (r_v_nbrs & r_u_nbrs):
-            ret.edge_move += [(v, w, u, w) if o[v, w][0] == v else (w, v, w, u)]
-            ret.edge_fadeout += [o[v, w]]
+            add(ContractAction.EDGE_MOVE, *move(w))
+            add(ContractAction.EDGE_FADEOUT, e(v, w))
             if w in b_v_nbrs:
-                ret.highlight_white_to_green += [o[v, w]]
+                add(ContractAction.HIGHLIGHT_WHITE_TO_GREEN, e(v, w))
             else:
                 assert w in r_v_nbrs
-                ret.highlight_red_to_green += [o[v, w]]
+                add(ContractAction.HIGHLIGHT_RED_TO_GREEN, e(v, w))
             if w in b_u_nbrs:
-                ret.highlight_white_to_green += [o[u, w]]
+                add(ContractAction.HIGHLIGHT_WHITE_TO_GREEN, e(u, w))
             else:
                 assert w in r_u_nbrs
-                ret.highlight_red_to_green += [o[u, w]]
+                add(ContractAction.HIGHLIGHT_RED_TO_GREEN, e(u, w))
 
         for w in r_v_nbrs & b_u_nbrs:
-            ret.highlight_red_to_green += [o[v, w]]
-            ret.highlight_white_to_green += [o[u, w]]
-            ret.edge_move += [(v, w, u, w) if o[v, w][0] == v else (w, v, w, u)]
-            ret.edge_fadeout += [o[u, w]]
+            add(ContractAction.HIGHLIGHT_RED_TO_GREEN, e(v, w))
+            add(ContractAction.HIGHLIGHT_WHITE_TO_GREEN, e(u, w))
+            add(ContractAction.EDGE_MOVE, *move(w))
+            add(ContractAction.EDGE_FADEOUT, e(u, w))
+
+        # update edge IDs and orientation (edges moved onto u keep their ID and the endpoint order of the v-side edge)
+        for w in ((b_v_nbrs | r_v_nbrs) - b_u_nbrs - r_u_nbrs - {u, v}) | (r_v_nbrs & b_u_nbrs):
+            starts_at_u = self.oriented(v, w)[0] == v
+            self.edge_code[self._key(u, w)] = e(v, w) << 1 | (starts_at_u == (index[u] > index[w]))
+
+        for w in b_v_nbrs | r_v_nbrs:
+            del self.edge_code[self._key(v, w)]
 
         # update graph info
         for w in ((b_v_nbrs | r_v_nbrs) - b_u_nbrs - r_u_nbrs - {u, v}) | (r_v_nbrs & b_u_nbrs):
@@ -73,18 +105,4 @@ class TriGraphData:
         self.gb.remove_node(v)
         self.gr.remove_node(v)
 
-        # update edge orientation
-        if ret.edge_shrink:
-            del self.edge_orientation[u, v]
-            del self.edge_orientation[v, u]
-
-        for w in (b_v_nbrs | r_v_nbrs) - {u, v}:
-            del self.edge_orientation[v, w]
-            del self.edge_orientation[w, v]
-
-        for a, b, c, d in ret.edge_move:
-            if (a, b) not in ret.edge_fadeout:
-                self.edge_orientation[c, d] = (c, d)
-                self.edge_orientation[d, c] = (c, d)
-
         return ret
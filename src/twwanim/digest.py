@@ -0,0 +1,63 @@
+import hashlib
+import json
+import networkx as nx
+from typing import Any, Hashable, Iterable, Sequence, Tuple
+
+__all__ = ['graph_digest', 'sequence_digest', 'render_digest', 'segment_digests', 'layout_digest']
+
+
+def _hasher(*parts: Any) -> 'hashlib._Hash':
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, default=repr).encode())
+        h.update(b'\0')
+    return h
+
+
+def graph_digest(g: nx.Graph) -> str:
+    """Returns a digest of the vertices, edges and positions, independent of insertion order."""
+
+    pos = nx.get_node_attributes(g, 'pos')
+    nodes = sorted((repr(x), [float(c) for c in pos[x]] if x in pos else None) for x in g.nodes())
+    edges = sorted(tuple(sorted((repr(u), repr(v)))) for u, v in g.edges())
+    return _hasher(nodes, edges).hexdigest()
+
+
+def sequence_digest(cs: Iterable[Tuple[Hashable, Hashable]]) -> str:
+    return _hasher([(repr(u), repr(v)) for u, v in cs]).hexdigest()
+
+
+def render_digest(g: nx.Graph, cs: Iterable[Tuple[Hashable, Hashable]], **settings: Any) -> str:
+    """Returns a digest of all inputs of a render: graph, contraction sequence and settings."""
+
+    version = __import__('twwanim').__version__
+    return _hasher(version, graph_digest(g), sequence_digest(cs), settings).hexdigest()
+
+
+def segment_digests(g: nx.Graph, cs: Sequence[Tuple[Hashable, Hashable]], bounds: Sequence[int], **settings: Any) -> list[str]:
+    """Returns a digest for each segment `[bounds[i], bounds[i + 1])` of a render.
+
+    A segment depends only on the graph, the settings and the prefix of the sequence up to
+    its end, so editing the tail of a sequence keeps the digests of earlier segments.
+    """
+
+    version = __import__('twwanim').__version__
+    base = _hasher(version, graph_digest(g), settings).hexdigest()
+
+    prefix = hashlib.sha256()
+    ret = []
+    t = 0
+    for start, end in zip(bounds, bounds[1:]):
+        for u, v in cs[t:end]:
+            prefix.update(json.dumps((repr(u), repr(v))).encode())
+        t = end
+        ret += [_hasher(base, start, end, prefix.hexdigest()).hexdigest()]
+    return ret
+
+
+def layout_digest(g: nx.Graph, method: str, seed: int = 0) -> str:
+    """Returns a digest of the vertices and edges (not positions) and the layout settings."""
+
+    nodes = sorted(repr(x) for x in g.nodes())
+    edges = sorted(tuple(sorted((repr(u), repr(v)))) for u, v in g.edges())
+    return _hasher('layout', method, seed, nodes, edges).hexdigest()
@@ -0,0 +1,88 @@
+import networkx as nx
+from typing import Hashable, Iterable, Iterator, Optional, Sequence, Tuple
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+from twwanim.profiling import get_profiler
+
+__all__ = ['iter_red_degrees', 'evaluate_twin_width', 'find_key_steps', 'evaluate_sequences']
+
+
+def iter_red_degrees(
+    g: nx.Graph,
+    cs: Iterable[Tuple[Hashable, Hashable]],
+    engine: type = ArrayTriGraphData
+) -> Iterator[Tuple[Hashable, Hashable, int]]:
+    """Applies the contraction sequence one by one and yields `(u, v, max red degree)` after each step.
+
+    The contraction sequence is consumed lazily, and no rendering modules are involved.
+    `engine` can be any class with the `TriGraphData` interface (`contract()` and `max_red_degree()`).
+    """
+    prof = get_profiler()
+    data = engine(g)
+    for t, (u, v) in enumerate(cs):
+        if prof.enabled:
+            prof.step = t + 1
+            with prof.phase('contract'):
+                data.contract(u, v)
+        else:
+            data.contract(u, v)
+        yield u, v, data.max_red_degree()
+
+
+def evaluate_twin_width(g: nx.Graph, cs: Iterable[Tuple[Hashable, Hashable]], engine: type = ArrayTriGraphData) -> int:
+    """Returns the width of the contraction sequence, i.e. the maximum red degree over all steps."""
+    return max((d for _, _, d in iter_red_degrees(g, cs, engine)), default=0)
+
+
+def find_key_steps(
+    g: nx.Graph,
+    cs: Iterable[Tuple[Hashable, Hashable]],
+    threshold: Optional[int] = None,
+    engine: type = ArrayTriGraphData
+) -> set[int]:
+    """Returns the (0-indexed) steps where the twin-width so far increases, or the max red degree is at least `threshold`."""
+    ret = set()
+    tww = 0
+    for t, (_, _, reddeg) in enumerate(iter_red_degrees(g, cs, engine)):
+        if reddeg > tww or (threshold is not None and reddeg >= threshold):
+            ret.add(t)
+        tww = max(tww, reddeg)
+    return ret
+
+
+def evaluate_sequences(g: nx.Graph, sequences: Iterable[Iterable[Tuple[Hashable, Hashable]]]) -> list[int]:
+    """Returns the width of each contraction sequence, evaluating shared prefixes only once.
+
+    The sequences are merged into a trie of contractions, which is walked depth-first on a
+    single `ArrayTriGraphData`; leaving a subtree rolls the trigraph back to the snapshot
+    taken when entering it.
+    """
+
+    # trie node: [children {(u, v): node}, indices of the sequences ending here]
+    root = [{}, []]
+    num_sequences = 0
+    for i, cs in enumerate(sequences):
+        node = root
+        for u, v in cs:
+            node = node[0].setdefault((u, v), [{}, []])
+        node[1].append(i)
+        num_sequences += 1
+
+    ret = [0] * num_sequences
+    data = ArrayTriGraphData(g)
+
+    # each stack entry: (iterator over the children, snapshot token, width of the prefix)
+    stack = [(iter(root[0].items()), data.snapshot(), 0)]
+    while stack:
+        children, token, width = stack[-1]
+        for (u, v), child in children:
+            data.rollback(token)
+            data.contract(u, v)
+            child_width = max(width, data.max_red_degree())
+            for i in child[1]:
+                ret[i] = child_width
+            if child[0]:
+                stack.append((iter(child[0].items()), data.snapshot(), child_width))
+            break
+        else:
+            stack.pop()
+    return ret
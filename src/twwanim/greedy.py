@@ -0,0 +1,122 @@
+import heapq
+import time
+import networkx as nx
+from typing import Hashable, Iterator, Optional, Tuple
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+
+__all__ = ['iter_greedy_sequence', 'greedy_sequence']
+
+MAX_CANDIDATES = 32  # candidate partners per vertex
+
+
+def _score(data: ArrayTriGraphData, x: int, y: int) -> tuple[int, int]:
+    """Returns `(score, number of new red edges)` for contracting `x` and `y`.
+
+    The score is the max red degree among the merged vertex and the vertices that get a new red edge.
+    """
+
+    black, red = data.black, data.red
+    rx, ry = red[x], red[y]
+    diff = black[x] ^ black[y]
+    new_red = diff - rx - ry - {x, y}
+    ret = len((rx | ry | diff) - {x, y})
+    for w in new_red:
+        d = len(red[w]) + 1
+        if d > ret:
+            ret = d
+    return ret, len(new_red)
+
+
+def _partners(data: ArrayTriGraphData, x: int) -> list[int]:
+    """Returns up to `MAX_CANDIDATES` vertices within distance 2 of `x` (via black or red edges)."""
+
+    black, red = data.black, data.red
+    ret = {}  # ordered set
+    for w in black[x] | red[x]:
+        ret[w] = None
+        if len(ret) >= MAX_CANDIDATES:
+            break
+        for y in black[w] | red[w]:
+            if y != x:
+                ret[y] = None
+                if len(ret) >= MAX_CANDIDATES:
+                    break
+    return list(ret)
+
+
+def iter_greedy_sequence(g: nx.Graph, time_limit: Optional[float] = None) -> Iterator[Tuple[Hashable, Hashable]]:
+    """Yields a contraction sequence `(u, v)` (`v` is contracted into `u`) picked greedily by resulting red degree.
+
+    Only pairs of vertices within distance 2 are candidates (up to `MAX_CANDIDATES` per vertex).
+    Their scores are kept in a heap with the version of both endpoints, indexed by vertex:
+    a contraction bumps the versions of the merged vertex and of its old neighbors, so only
+    pairs near the last contraction are re-scored (when popped), and new candidates are
+    added for the merged vertex only. A pair whose endpoint has been contracted away is
+    carried over to the vertex it was merged into.
+
+    When no candidates are left, or `time_limit` (seconds) is exceeded, the remaining vertices
+    are contracted into one in index order without scoring (isolated vertices cost nothing).
+    """
+
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    data = ArrayTriGraphData(g)
+    labels = data.labels
+    n = len(labels)
+    version = [0] * n
+    parent = list(range(n))  # vertex each removed vertex was contracted into
+    heap = []  # type: list[tuple[int, int, int, int, int, int]]  # (score, new red edges, x, y, version[x], version[y])
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def entry(x: int, y: int) -> tuple[int, int, int, int, int, int]:
+        return (*_score(data, x, y), x, y, version[x], version[y])
+
+    def pop() -> Optional[tuple[int, int]]:
+        while heap:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            _, _, x0, y0, vx, vy = heapq.heappop(heap)
+            x, y = find(x0), find(y0)
+            if x == y:
+                continue
+            if x != x0 or y != y0 or vx != version[x] or vy != version[y]:
+                # the neighborhood of x or y has changed since scored
+                heapq.heappush(heap, entry(x, y))
+                continue
+            return x, y
+        return None
+
+    for x in range(n):
+        if deadline is not None and time.perf_counter() >= deadline:
+            heap.clear()
+            break
+        heap += [entry(x, y) for y in _partners(data, x) if x < y]
+    heapq.heapify(heap)
+
+    while heap and data.num_nodes > 1:
+        pair = pop()
+        if pair is None:
+            break
+        x, y = pair
+        for w in data.black[y] | data.red[y] | (data.black[x] - data.black[y]):
+            version[w] += 1  # neighborhood changes
+        version[x] += 1
+        data.contract(labels[x], labels[y])
+        parent[y] = x
+        yield labels[x], labels[y]
+
+        for z in _partners(data, x):
+            heapq.heappush(heap, entry(x, z))
+
+    rest = [x for x in range(n) if not data.removed[x]]
+    for y in rest[1:]:
+        yield labels[rest[0]], labels[y]
+
+
+def greedy_sequence(g: nx.Graph, time_limit: Optional[float] = None) -> list[Tuple[Hashable, Hashable]]:
+    """Returns a contraction sequence of `g` picked greedily (see `iter_greedy_sequence()`)."""
+    return list(iter_greedy_sequence(g, time_limit))
@@ -0,0 +1,204 @@
+"""Writing of partial movies.
+
+Manim rasterizes each frame and passes it to the file writer in the same thread, so
+rasterization, encoding and closing the partial movie of each play take turns on one core,
+and the partial movies of all plays are combined only at the end. `EncoderPipeline` moves
+the file writer side to a worker thread fed by a bounded queue, which also combines the
+finished partial movies while the next ones are rendered. `private_partial_movie_dir()`
+keeps the partial movies of renders running at the same time apart.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Sequence
+from twwanim.profiling import get_profiler
+
+__all__ = ['EncoderPipeline', 'concat_movies', 'private_partial_movie_dir']
+
+
+def concat_movies(paths: Sequence[str], output_path: str) -> None:
+    """Concatenates movie files with the same codec settings using ffmpeg's concat demuxer."""
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        for path in paths:
+            f.write(f"file '{os.path.abspath(path)}'\n")
+        list_path = f.name
+
+    try:
+        subprocess.run(
+            ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path],
+            check=True
+        )
+    finally:
+        os.remove(list_path)
+
+
+@contextmanager
+def private_partial_movie_dir(config: Any) -> Iterator[str]:
+    """Sets `config.partial_movie_dir` to a new temporary directory, which is removed on exit.
+
+    By default, all renders of a scene with the same quality write their partial movies and the
+    list of files to combine to one directory, and each render deletes the oldest partial movies
+    there when it finishes. Renders running in parallel need their own directories.
+    """
+
+    path = tempfile.mkdtemp(prefix='twwanim-partial-')
+    config.partial_movie_dir = path
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class EncoderPipeline:
+    """Runs the encoding methods of a manim file writer in a background thread.
+
+    `install()` replaces `begin_animation()`, `write_frame()`, `end_animation()` and `finish()`
+    of the file writer. The first three put the call into a queue of at most `max_frames`
+    entries, and the worker thread runs the original methods in order. Rasterizing the next
+    frames thus overlaps with encoding the previous ones and with closing (flushing and
+    muxing) the partial movie of each play; the render thread waits only when the queue is full.
+
+    With `combine_every > 0`, the worker thread also concatenates every `combine_every`
+    finished partial movies into one file without re-encoding, and every `combine_every`
+    such files of the same level into one file of the next level. `finish()` drains the
+    queue and lets the file writer combine only these files and the partial movies after
+    them, O(combine_every * log(plays)) files instead of one per play. Use it only for
+    formats that can be concatenated without re-encoding (not gif).
+
+    An error in the worker thread is raised by every later call on the render thread.
+    """
+
+    def __init__(self, file_writer: Any, max_frames: int = 8, combine_every: int = 0) -> None:
+        self.file_writer = file_writer
+        self.queue = queue.Queue(maxsize=max_frames)  # type: queue.Queue
+        self.error = None  # type: Optional[BaseException]
+        self.thread = None  # type: Optional[threading.Thread]
+        self.combine_every = combine_every
+        self.num_combined = 0  # number of partial movies combined so far
+        self.combined = []  # type: list[tuple[int, str]]  # (level, path) of the combined files, in order
+        self.num_files = 0  # number of combined files created
+
+    @staticmethod
+    def supported(file_writer: Any) -> bool:
+        """Returns False for file writers that encode in their own threads (manim 0.22+)."""
+        return not hasattr(file_writer, 'join_all_encode_jobs')
+
+    def install(self) -> None:
+        fw = self.file_writer
+        begin_animation, write_frame, end_animation, finish = fw.begin_animation, fw.write_frame, fw.end_animation, fw.finish
+
+        def pipelined_begin_animation(allow_write: bool = False, *args, **kwargs):
+            if allow_write and not args and kwargs.get('file_path') is None and getattr(fw, 'partial_movie_files', None):
+                # the default path depends on the number of plays, counted on the render thread
+                kwargs['file_path'] = fw.partial_movie_files[fw.renderer.num_plays]
+            self._put(begin_animation, allow_write, *args, **kwargs)
+
+        def pipelined_write_frame(frame, *args, **kwargs):
+            if not isinstance(frame, np.ndarray):
+                # OpenGL renderer: the pixels are read from the renderer when called
+                self.join()
+                return write_frame(frame, *args, **kwargs)
+            self._put(write_frame, frame, *args, **kwargs)
+
+        def pipelined_end_animation(*args, **kwargs):
+            self._put(end_animation, *args, **kwargs)
+            if self.combine_every > 0:
+                # the partial movies up to this play are finished once `end_animation` is done
+                self._put(self._combine, fw.renderer.num_plays + 1)
+
+        def pipelined_finish(*args, **kwargs):
+            self.close()
+            if not self.combined:
+                return finish(*args, **kwargs)
+            fw.partial_movie_files = [path for _, path in self.combined] + fw.partial_movie_files[self.num_combined:]
+            try:
+                return finish(*args, **kwargs)
+            finally:
+                for _, path in self.combined:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        fw.begin_animation = pipelined_begin_animation
+        fw.write_frame = pipelined_write_frame
+        fw.end_animation = pipelined_end_animation
+        fw.finish = pipelined_finish
+
+        self.thread = threading.Thread(target=self._run, name='twwanim-encoder', daemon=True)
+        self.thread.start()
+
+    def join(self) -> None:
+        """Waits until all queued calls are done."""
+
+        self.queue.join()
+        self._raise()
+
+    def close(self) -> None:
+        """Waits until all queued calls are done and stops the worker thread."""
+
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self._raise()
+
+    def _combine(self, num_finished: int) -> None:
+        """Combines the finished partial movies in groups of `combine_every` (in the worker thread)."""
+
+        k = self.combine_every
+        files = self.file_writer.partial_movie_files
+        while num_finished - self.num_combined >= k:
+            paths = [x for x in files[self.num_combined:self.num_combined + k] if x is not None]
+            self.num_combined += k
+            if paths:
+                self._add_combined(paths, 0)
+
+    def _add_combined(self, paths: list[str], level: int) -> None:
+        with get_profiler().phase('combine'):
+            path = os.path.join(
+                os.path.dirname(paths[0]), f'twwanim_combined_{self.num_files:05d}{os.path.splitext(paths[0])[1]}'
+            )
+            self.num_files += 1
+            concat_movies(paths, path)
+        self.combined += [(level, path)]
+
+        # merge `combine_every` files of the same level
+        k = self.combine_every
+        last = self.combined[-k:]
+        if len(last) == k and all(x == level for x, _ in last):
+            del self.combined[-k:]
+            self._add_combined([p for _, p in last], level + 1)
+            for _, p in last:
+                os.remove(p)
+
+    def _put(self, func: Callable, *args, **kwargs) -> None:
+        self._raise()
+        if self.queue.full():
+            with get_profiler().phase('encode_wait'):
+                self.queue.put((func, args, kwargs))
+        else:
+            self.queue.put((func, args, kwargs))
+
+    def _raise(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                if self.error is None:  # drop the calls after an error
+                    func, args, kwargs = item
+                    func(*args, **kwargs)
+            except BaseException as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
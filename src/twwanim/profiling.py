@@ -0,0 +1,127 @@
+"""Opt-in timing instrumentation.
+
+Instrumented code calls `get_profiler()` and wraps its phases in `profiler.phase(name)`.
+By default this returns a no-op profiler; `enable_profiler()` installs a recording one.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+__all__ = ['Profiler', 'NullProfiler', 'get_profiler', 'enable_profiler', 'disable_profiler']
+
+
+class NullProfiler:
+    """Profiler that records nothing."""
+
+    enabled = False
+    step = None  # type: Optional[int]
+
+    @contextmanager
+    def phase(self, name: str, **args: Any) -> Iterator[None]:
+        yield
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+
+class Profiler(NullProfiler):
+    """Records timed phases and counters, tagged with the current contraction step.
+
+    Phases may be recorded from several threads; those outside the main thread get their own track (`tid`).
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.phases = []  # type: list[dict]  # {name, step, start, duration, args, tid}
+        self.counters = []  # type: list[dict]  # {name, step, time, value}
+        self.step = None
+
+    @contextmanager
+    def phase(self, name: str, **args: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            tid = 0 if threading.current_thread() is threading.main_thread() else threading.get_ident()
+            self.phases += [dict(name=name, step=self.step, start=start - self.origin, duration=end - start, args=args, tid=tid)]
+
+    def count(self, name: str, value: int) -> None:
+        self.counters += [dict(name=name, step=self.step, time=time.perf_counter() - self.origin, value=value)]
+
+    # ---------------------------------------------------------------------------
+    #    Output
+    # ---------------------------------------------------------------------------
+    def summary(self) -> dict:
+        """Returns total time per phase and per-step breakdowns."""
+
+        totals = defaultdict(lambda: {'count': 0, 'seconds': 0.0})
+        steps = defaultdict(lambda: {'phases': defaultdict(float), 'counters': {}})
+
+        for p in self.phases:
+            totals[p['name']]['count'] += 1
+            totals[p['name']]['seconds'] += p['duration']
+            if p['step'] is not None:
+                steps[p['step']]['phases'][p['name']] += p['duration']
+        for c in self.counters:
+            if c['step'] is not None:
+                steps[c['step']]['counters'][c['name']] = c['value']
+
+        return {
+            'phases': dict(totals),
+            'steps': [{'step': t, 'phases': dict(s['phases']), 'counters': s['counters']} for t, s in sorted(steps.items())],
+        }
+
+    def chrome_trace(self) -> dict:
+        """Returns the events in the Chrome trace event format (chrome://tracing, Perfetto)."""
+
+        pid = os.getpid()
+        events = [{
+            'name': p['name'],
+            'cat': 'twwanim',
+            'ph': 'X',
+            'ts': p['start'] * 1e6,
+            'dur': p['duration'] * 1e6,
+            'pid': pid,
+            'tid': p['tid'],
+            'args': dict(p['args'], step=p['step']),
+        } for p in self.phases]
+        events += [{
+            'name': c['name'],
+            'ph': 'C',
+            'ts': c['time'] * 1e6,
+            'pid': pid,
+            'args': {c['name']: c['value']},
+        } for c in self.counters]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'phases': self.summary()['phases']}}
+
+    def save(self, path: str, format: str = 'chrome') -> None:
+        """Writes the profile to a file; `format` is `chrome` or `json`."""
+
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace() if format == 'chrome' else self.summary(), f)
+
+
+_profiler = NullProfiler()  # type: NullProfiler
+
+
+def get_profiler() -> NullProfiler:
+    return _profiler
+
+
+def enable_profiler() -> Profiler:
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiler() -> None:
+    global _profiler
+    _profiler = NullProfiler()
@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Hashable, Optional, Sequence, Tuple, Union
+
+import networkx as nx
+from twwanim.data.TriGraphArrays import TriGraphArrays
+
+__all__ = ['find_sequences', 'evaluate_candidate', 'rank_sequences']
+
+CS_EXTENSIONS = ['.txt', '.json', '.npz']
+UNBOUNDED = 2 ** 31 - 1
+
+Candidate = Union[str, Sequence[Tuple[Hashable, Hashable]]]
+
+# per-worker state set by `_init_worker()`
+_arrays = None  # type: Optional[TriGraphArrays]
+_shm = None
+_best = None
+
+
+def find_sequences(path: str) -> list[str]:
+    """Returns the paths of contraction sequence files in a directory, or listed in a manifest file (one per line)."""
+
+    if os.path.isdir(path):
+        return [os.path.join(path, name) for name in sorted(os.listdir(path)) if os.path.splitext(name)[1] in CS_EXTENSIONS]
+
+    base_dir = os.path.dirname(path)
+    with open(path) as f:
+        return [os.path.join(base_dir, line.strip()) for line in f if line.strip() and not line.startswith('#')]
+
+
+def _init_worker(shm_name: str, best) -> None:
+    global _arrays, _shm, _best
+    _arrays, _shm = TriGraphArrays.attach(shm_name)
+    _best = best
+
+
+def evaluate_candidate(
+    arrays: TriGraphArrays,
+    cs: Candidate,
+    best=None,
+) -> dict:
+    """Evaluates one candidate sequence on a fresh copy of the trigraph; returns a summary record (never raises).
+
+    If `best` (a shared `multiprocessing.Value`) is given, the evaluation stops as soon as the
+    running max red degree exceeds it, and the best value is updated on completion.
+    """
+
+    ret = {'name': cs if isinstance(cs, str) else None}
+    start = time.perf_counter()
+    try:
+        if isinstance(cs, str):
+            from twwanim.readwrite import load_cs
+            cs = load_cs(cs)
+
+        data = arrays.to_data()
+        bound = best.value if best is not None else UNBOUNDED
+        ret['status'] = 'ok'
+        for t, (u, v) in enumerate(cs):
+            data.contract(u, v)
+            if data.max_red_degree() > bound:
+                bound = best.value  # the best may have improved since the last check
+                if data.max_red_degree() > bound:
+                    ret['status'] = 'pruned'
+                    ret['steps'] = t + 1
+                    break
+        else:
+            ret['steps'] = len(cs)
+
+        ret['twin_width'] = data.twin_width()  # a lower bound if pruned
+        if ret['status'] == 'ok' and best is not None:
+            with best.get_lock():
+                best.value = min(best.value, ret['twin_width'])
+    except Exception as e:
+        ret['status'] = 'error'
+        ret['error'] = f'{type(e).__name__}: {e}'
+    ret['seconds'] = time.perf_counter() - start
+    return ret
+
+
+def _evaluate(index: int, cs: Candidate) -> dict:
+    return dict(evaluate_candidate(_arrays, cs, _best), index=index)
+
+
+def rank_sequences(
+    g: nx.Graph,
+    sequences: Sequence[Candidate],
+    jobs: Optional[int] = None,
+    early_stop: bool = True,
+) -> list[dict]:
+    """Evaluates candidate sequences on one graph in parallel and returns their records, best first.
+
+    The graph is converted once to `TriGraphArrays` in shared memory, and each worker builds
+    its own trigraph from it. Candidates are sequences of contractions or paths to sequence
+    files (loaded in the workers). With `early_stop`, a candidate is abandoned as soon as its
+    running max red degree exceeds the best twin-width found so far (status `pruned`).
+
+    Records are ranked by status (`ok`, then `pruned`, then `error`), twin-width and input order;
+    each has `rank`, `index`, `name`, `status`, `twin_width`, `steps` and `seconds`.
+    """
+
+    shm = TriGraphArrays.from_graph(g).to_shared_memory()
+    try:
+        best = multiprocessing.Value('i', UNBOUNDED)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(shm.name, best if early_stop else None)) as executor:
+            futures = [executor.submit(_evaluate, i, cs) for i, cs in enumerate(sequences)]
+            results = [f.result() for f in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    order = {'ok': 0, 'pruned': 1, 'error': 2}
+    results.sort(key=lambda r: (order[r['status']], r.get('twin_width', 0), r['index']))
+    for rank, r in enumerate(results):
+        r['rank'] = rank + 1
+    return results
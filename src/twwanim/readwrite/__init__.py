@@ -1,2 +1,5 @@
 from .contraction import *
 from .pace import *
+from .loader import *
+from .actionlog import *
+from .container import *
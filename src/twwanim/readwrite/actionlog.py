@@ -0,0 +1,134 @@
+import json
+import os
+import struct
+import sys
+import networkx as nx
+from array import array
+from typing import BinaryIO, Hashable, Iterable, Iterator, Tuple
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+from twwanim.data.ContractAction import ContractAction
+
+__all__ = [
+    'write_action_log',
+    'save_action_log',
+    'read_action_log',
+    'load_action_log',
+]
+
+MAGIC = b'TWWACT02'
+STEP = struct.Struct('<iiiII')  # u, v, max red degree, number of entries, number of integers
+NDJSON_EXTENSIONS = ['.ndjson', '.jsonl']
+
+Step = Tuple[Hashable, Hashable, int, ContractAction]
+
+
+def _header(g: nx.Graph, data: ArrayTriGraphData) -> dict:
+    ret = {
+        'format': 'twwanim-actions',
+        'version': 2,
+        'kinds': ContractAction.KINDS,
+        'sizes': ContractAction.SIZES,
+        'nodes': data.labels,
+        'edges': [[data.index[x], data.index[y]] for x, y in g.edges()],
+    }
+    pos = nx.get_node_attributes(g, 'pos')
+    if pos and len(pos) == len(g):
+        ret['pos'] = [[float(c) for c in pos[x]] for x in data.labels]
+    return ret
+
+
+def write_action_log(output: BinaryIO, g: nx.Graph, cs: Iterable[Tuple[Hashable, Hashable]], format: str = 'binary') -> int:
+    """Contracts the sequence and writes the `ContractAction` of each step as soon as it is computed.
+
+    The log starts with a JSON header holding the vertex labels (`nodes`), the edges in their
+    initial orientation and the positions if set; vertices are referred to by their index in
+    `nodes`, and edges by their ID, which is their index in `edges` (see `ContractAction`).
+    Each step holds `u`, `v`, the max red degree, and the action as a kind code per entry
+    (`kinds`) plus the concatenated integers of the entries (`ids`; `sizes[kind]` per entry).
+
+    In the `binary` format, the header is `MAGIC`, its length (uint64) and the JSON text, and
+    each step is `STEP` (little-endian) followed by the kind codes (uint8) and the integers (int32).
+    In the `ndjson` format, the header and each step are one JSON object per line.
+
+    Returns the twin-width of the sequence.
+    """
+
+    if format not in ('binary', 'ndjson'):
+        raise ValueError(f'unknown action log format: {format}')
+
+    data = ArrayTriGraphData(g)
+    header = json.dumps(_header(g, data), default=str).encode()
+    if format == 'binary':
+        output.write(MAGIC + len(header).to_bytes(8, 'little') + header)
+    else:
+        output.write(header + b'\n')
+
+    index = data.index
+    for t, (u, v) in enumerate(cs):
+        act = data.contract(u, v)
+        reddeg = data.max_red_degree()
+        if format == 'binary':
+            ids = act.ids
+            if sys.byteorder != 'little':
+                ids = array('i', ids)
+                ids.byteswap()
+            output.write(STEP.pack(index[u], index[v], reddeg, len(act.kinds), len(ids)))
+            output.write(act.kinds.tobytes())
+            output.write(ids.tobytes())
+        else:
+            step = {'t': t + 1, 'u': index[u], 'v': index[v], 'red_degree': reddeg, 'kinds': act.kinds.tolist(), 'ids': act.ids.tolist()}
+            output.write(json.dumps(step, separators=(',', ':')).encode() + b'\n')
+    return data.twin_width()
+
+
+def save_action_log(path: str, g: nx.Graph, cs: Iterable[Tuple[Hashable, Hashable]]) -> int:
+    """Writes the action log to a file; `.ndjson` and `.jsonl` files are written as JSON lines, others in binary."""
+    format = 'ndjson' if os.path.splitext(path)[1] in NDJSON_EXTENSIONS else 'binary'
+    with open(path, 'wb') as f:
+        return write_action_log(f, g, cs, format)
+
+
+def read_action_log(input: BinaryIO) -> tuple[dict, Iterator[Step]]:
+    """Reads the header and returns it with an iterator over the steps `(u, v, max red degree, action)` (either format)."""
+
+    binary = input.read(len(MAGIC)) == MAGIC
+    if binary:
+        header = json.loads(input.read(int.from_bytes(input.read(8), 'little')))
+    else:
+        input.seek(0)
+        header = json.loads(input.readline())
+    labels = header['nodes']
+
+    def action(kinds: bytes, ids) -> ContractAction:
+        ret = ContractAction(labels)
+        if binary:
+            ret.kinds.frombytes(kinds)
+            ret.ids.frombytes(ids)
+            if sys.byteorder != 'little':
+                ret.ids.byteswap()
+        else:
+            ret.kinds.extend(kinds)
+            ret.ids.extend(ids)
+        return ret
+
+    def steps() -> Iterator[Step]:
+        if binary:
+            while True:
+                buf = input.read(STEP.size)
+                if len(buf) < STEP.size:
+                    return
+                u, v, reddeg, num_entries, num_ids = STEP.unpack(buf)
+                yield labels[u], labels[v], reddeg, action(input.read(num_entries), input.read(4 * num_ids))
+        else:
+            for line in input:
+                if line.strip():
+                    step = json.loads(line)
+                    yield labels[step['u']], labels[step['v']], step['red_degree'], action(step['kinds'], step['ids'])
+
+    return header, steps()
+
+
+def load_action_log(path: str) -> tuple[dict, list[Step]]:
+    with open(path, 'rb') as f:
+        header, steps = read_action_log(f)
+        return header, list(steps)
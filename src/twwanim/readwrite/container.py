@@ -0,0 +1,185 @@
+import os
+import struct
+import tempfile
+import zipfile
+import networkx as nx
+import numpy as np
+from collections.abc import Sequence
+from typing import Hashable, Iterable, Iterator, Optional, Tuple
+
+__all__ = [
+    'ArraySequence',
+    'save_container',
+    'load_container_graph',
+    'load_container_cs',
+    'save_layout',
+]
+
+CHUNK_SIZE = 1 << 16  # rows converted at once when iterating
+
+
+class ArraySequence(Sequence):
+    """Read-only sequence of contractions `(u, v)` backed by an integer array of shape (k, 2).
+
+    Rows hold vertex labels, or indices into `labels` if given. Elements are converted to
+    tuples of Python objects on access, so the array itself may be memory-mapped.
+    """
+
+    def __init__(self, array: np.ndarray, labels: Optional[Sequence] = None) -> None:
+        self.array = array
+        self.labels = labels
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return ArraySequence(self.array[i], self.labels)
+        u, v = self.array[i].tolist()
+        return (u, v) if self.labels is None else (self.labels[u], self.labels[v])
+
+    def __iter__(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        labels = self.labels
+        for start in range(0, len(self.array), CHUNK_SIZE):
+            rows = self.array[start:start + CHUNK_SIZE].tolist()
+            if labels is None:
+                yield from map(tuple, rows)
+            else:
+                for u, v in rows:
+                    yield labels[u], labels[v]
+
+
+def _open_arrays(path: str) -> dict[str, np.ndarray]:
+    """Returns the arrays in an `.npz` file, memory-mapped where possible.
+
+    `np.load(mmap_mode='r')` loads `.npz` members into memory, so each uncompressed member is
+    memory-mapped at the offset of its data in the archive instead. Compressed members are loaded.
+    """
+
+    ret = {}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as f:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as member:
+                    ret[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+
+            # skip the local file header, whose extra field may differ from the central directory
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f'object arrays are not supported: {info.filename}')
+
+            if np.prod(shape, dtype=np.int64) == 0:
+                ret[name] = np.empty(shape, dtype=dtype)
+            else:
+                ret[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape, order='F' if fortran_order else 'C')
+    return ret
+
+
+def _node_array(nodes: list[Hashable]) -> np.ndarray:
+    if all(isinstance(x, (int, np.integer)) and not isinstance(x, bool) for x in nodes):
+        return np.array(nodes, dtype=np.int64)
+    if all(isinstance(x, str) for x in nodes):
+        return np.array(nodes, dtype=str)
+    raise ValueError('only integer or string vertex labels can be stored')
+
+
+def _graph_arrays(g: nx.Graph) -> dict[str, np.ndarray]:
+    nodes = list(g.nodes())
+    index = {x: i for i, x in enumerate(nodes)}
+    ret = {
+        'nodes': _node_array(nodes),
+        'edges': np.array([(index[u], index[v]) for u, v in g.edges()], dtype=np.int32).reshape(-1, 2),
+    }
+    pos = nx.get_node_attributes(g, 'pos')
+    if pos and len(pos) == len(g):
+        ret['pos'] = np.array([pos[x] for x in nodes], dtype=float).reshape(len(nodes), -1)
+    return ret
+
+
+def _write_arrays(path: str, arrays: dict[str, np.ndarray]) -> None:
+    """Writes an uncompressed `.npz` file atomically."""
+
+    fd, tmp_path = tempfile.mkstemp(suffix='.npz', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def save_container(path: str, g: Optional[nx.Graph] = None, cs: Optional[Iterable[Tuple[Hashable, Hashable]]] = None) -> None:
+    """Writes a graph and/or a contraction sequence to an uncompressed `.npz` file.
+
+    Arrays:
+        nodes: vertex labels (integers or strings), in the order of `g.nodes()`; without a graph,
+            the string labels of `cs` in the order of their first appearance
+        edges: int32 (m, 2), indices into `nodes`
+        pos: float (n, 2 or 3), positions in the order of `nodes` (if set for all vertices)
+        cs: int32 (k, 2), contractions as indices into `nodes`, or as integer labels if there is no `nodes`
+    """
+
+    arrays = {} if g is None else _graph_arrays(g)
+    if cs is not None:
+        rows = list(cs)
+        if g is not None:
+            index = {x: i for i, x in enumerate(g.nodes())}
+            rows = [(index[u], index[v]) for u, v in rows]
+        elif not all(isinstance(x, (int, np.integer)) and not isinstance(x, bool) for row in rows for x in row):
+            index = {x: i for i, x in enumerate(dict.fromkeys(x for row in rows for x in row))}
+            arrays['nodes'] = _node_array(list(index))
+            rows = [(index[u], index[v]) for u, v in rows]
+        arrays['cs'] = np.array(rows, dtype=np.int32).reshape(-1, 2)
+    _write_arrays(path, arrays)
+
+
+def load_container_graph(path: str) -> nx.Graph:
+    arrays = _open_arrays(path)
+    if 'edges' not in arrays:
+        raise ValueError(f'no graph in {path}')
+    nodes = arrays['nodes']
+    edges = arrays['edges']
+
+    ret = nx.Graph()
+    if 'pos' in arrays:
+        ret.add_nodes_from((x, {'pos': p}) for x, p in zip(nodes.tolist(), np.array(arrays['pos'])))
+    else:
+        ret.add_nodes_from(nodes.tolist())
+    if nodes.dtype.kind in 'iu':
+        ret.add_edges_from(np.asarray(nodes)[edges].tolist())
+    else:
+        labels = nodes.tolist()
+        ret.add_edges_from((labels[i], labels[j]) for i, j in edges.tolist())
+    return ret
+
+
+def load_container_cs(path: str) -> ArraySequence:
+    arrays = _open_arrays(path)
+    if 'cs' not in arrays:
+        raise ValueError(f'no contraction sequence in {path}')
+    nodes = arrays['nodes'].tolist() if 'nodes' in arrays else None
+    return ArraySequence(arrays['cs'], nodes)
+
+
+def save_layout(path: str, g: nx.Graph) -> None:
+    """Stores the `pos` attribute of `g` in an existing container holding the same graph."""
+
+    arrays = {name: np.array(a) for name, a in _open_arrays(path).items()}
+    if 'edges' not in arrays:
+        raise ValueError(f'no graph in {path}')
+    nodes = arrays['nodes'].tolist()
+    if len(nodes) != len(g):
+        raise ValueError(f'graph does not match {path}')
+    pos = nx.get_node_attributes(g, 'pos')
+    arrays['pos'] = np.array([pos[x] for x in nodes], dtype=float).reshape(len(nodes), -1)
+    _write_arrays(path, arrays)
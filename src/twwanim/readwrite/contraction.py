@@ -1,13 +1,21 @@
-from typing import TextIO
+import warnings
+import numpy as np
+from typing import Iterator, TextIO
 
-__all__ = ['read_contraction_file', 'load_contraction_file']
+__all__ = [
+    'read_contraction_file',
+    'load_contraction_file',
+    'iter_contraction_file',
+    'read_contraction_array',
+    'load_contraction_array',
+]
 
 
-def read_contraction_file(input: TextIO, zero_indexed: bool = True) -> list[tuple[int, int]]:
+def iter_contraction_file(input: TextIO, zero_indexed: bool = True) -> Iterator[tuple[int, int]]:
+    """Yields contractions one by one without materializing the whole sequence."""
     offset = 1 if zero_indexed else 0
-    ret = []
 
-    for line in input.readlines():
+    for line in input:
         line = line.strip()
         if not line:
             continue
@@ -15,10 +23,31 @@ def read_contraction_file(input: TextIO, zero_indexed: bool = True) -> list[tupl
             continue  # ignore comments
 
         u, v = map(int, line.split())
-        ret += [(u - offset, v - offset)]
-    return ret
+        yield u - offset, v - offset
+
+
+def read_contraction_file(input: TextIO, zero_indexed: bool = True) -> list[tuple[int, int]]:
+    return list(iter_contraction_file(input, zero_indexed))
 
 
 def load_contraction_file(path: str, zero_indexed: bool = True) -> list[tuple[int, int]]:
     with open(path) as f:
         return read_contraction_file(f, zero_indexed)
+
+
+def read_contraction_array(input: TextIO, zero_indexed: bool = True) -> np.ndarray:
+    """Reads a contraction sequence into an int32 array of shape (k, 2) in bulk."""
+    offset = 1 if zero_indexed else 0
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # suppress warnings for empty sequences
+        ret = np.loadtxt(input, dtype=np.int32, comments='c', ndmin=2).reshape(-1, 2)
+
+    if offset:
+        ret -= offset
+    return ret
+
+
+def load_contraction_array(path: str, zero_indexed: bool = True) -> np.ndarray:
+    with open(path) as f:
+        return read_contraction_array(f, zero_indexed)
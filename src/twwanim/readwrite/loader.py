@@ -0,0 +1,41 @@
+import json
+import networkx as nx
+from typing import Hashable, Iterator, Sequence, Tuple
+from .contraction import iter_contraction_file, load_contraction_file
+from .container import load_container_graph, load_container_cs
+from .pace import load_pace_2023
+
+__all__ = ['load_graph', 'load_cs', 'iter_cs']
+
+
+def load_graph(path: str) -> nx.Graph:
+    if path.endswith('.json'):
+        with open(path) as f:
+            return nx.node_link_graph(json.load(f))
+    elif path.endswith('.gr'):
+        return load_pace_2023(path, zero_indexed=False)
+    elif path.endswith('.npz'):
+        return load_container_graph(path)
+    else:
+        raise NotImplementedError('unsupported graph file')
+
+
+def load_cs(path: str) -> Sequence[Tuple[Hashable, Hashable]]:
+    if path.endswith('.json'):
+        with open(path) as f:
+            return json.load(f)
+    elif path.endswith('.npz'):
+        return load_container_cs(path)
+    else:
+        return load_contraction_file(path, zero_indexed=False)
+
+
+def iter_cs(path: str) -> Iterator[Tuple[Hashable, Hashable]]:
+    """Yields the contractions in the file one by one; text files are streamed without loading the whole sequence."""
+    if path.endswith('.json'):
+        yield from map(tuple, load_cs(path))
+    elif path.endswith('.npz'):
+        yield from load_cs(path)
+    else:
+        with open(path) as f:
+            yield from iter_contraction_file(f, zero_indexed=False)
@@ -1,4 +1,6 @@
+import warnings
 import networkx as nx
+import numpy as np
 from typing import TextIO
 
 __all__ = [
@@ -6,34 +8,61 @@ __all__ = [
     'load_pace_2023',
     'write_pace_2023',
     'save_pace_2023',
+    'read_pace_2023_edges',
+    'load_pace_2023_edges',
+    'write_pace_2023_edges',
+    'save_pace_2023_edges',
     'read_pace_2016',
     'load_pace_2016',
     'write_pace_2016',
     'save_pace_2016',
+    'read_pace_2016_edges',
+    'load_pace_2016_edges',
+    'write_pace_2016_edges',
+    'save_pace_2016_edges',
 ]
 
 
-def read_pace(input: TextIO, zero_indexed: bool = True) -> nx.Graph:
+def read_pace_edges(input: TextIO, zero_indexed: bool = True) -> tuple[int, np.ndarray]:
+    """Reads a PACE graph into an int32 edge array of shape (m, 2).
+
+    Only the header is read line by line; the edge list is parsed in bulk by NumPy,
+    which streams the input in chunks without building per-line Python objects.
+
+    Returns:
+        n: number of vertices
+        edges: edge array (vertex labels are shifted to [0, n) if `zero_indexed` is true)
+    """
     offset = 1 if zero_indexed else 0
-    G = None
-    for line in input.readlines():
+    header = None
+    for line in iter(input.readline, ''):
         line = line.strip()
-        if not line:
-            continue
-        if line.startswith('c'):
+        if not line or line.startswith('c'):
             continue  # ignore comments
+        header = line
+        break
+
+    assert header is not None and header.startswith('p'), 'missing problem line'
+    _, _, nn, mm = header.split()
+    n, m = int(nn), int(mm)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # suppress warnings for empty edge lists
+        edges = np.loadtxt(input, dtype=np.int32, comments='c', ndmin=2).reshape(-1, 2)
+
+    assert m == len(edges), 'inconsistent edges'
+    if offset:
+        edges -= offset
+    return n, edges
+
+
+def read_pace(input: TextIO, zero_indexed: bool = True) -> nx.Graph:
+    offset = 1 if zero_indexed else 0
+    n, edges = read_pace_edges(input, zero_indexed)
+    G = nx.empty_graph(range((1 - offset), (1 - offset) + n))
+    G.add_edges_from(edges.tolist())
 
-        if line.startswith('p'):
-            _, _, nn, mm = line.split()
-            n, m = int(nn), int(mm)
-            G = nx.empty_graph(range((1 - offset), (1 - offset) + n))
-        else:
-            u, v = map(int, line.split())
-            assert G is not None
-            G.add_edge(u - offset, v - offset)
-
-    assert G is not None
-    assert m == G.number_of_edges(), 'inconsistent edges'
+    assert len(edges) == G.number_of_edges(), 'inconsistent edges'
     return G
 
 
@@ -45,6 +74,14 @@ def read_pace_2023(input: TextIO, zero_indexed: bool = True) -> nx.Graph:
     return read_pace(input, zero_indexed)
 
 
+def read_pace_2016_edges(input: TextIO, zero_indexed: bool = True) -> tuple[int, np.ndarray]:
+    return read_pace_edges(input, zero_indexed)
+
+
+def read_pace_2023_edges(input: TextIO, zero_indexed: bool = True) -> tuple[int, np.ndarray]:
+    return read_pace_edges(input, zero_indexed)
+
+
 def load_pace_2016(path: str, zero_indexed: bool = True) -> nx.Graph:
     with open(path) as f:
         return read_pace_2016(f, zero_indexed)
@@ -55,6 +92,16 @@ def load_pace_2023(path: str, zero_indexed: bool = True) -> nx.Graph:
         return read_pace_2023(f, zero_indexed)
 
 
+def load_pace_2016_edges(path: str, zero_indexed: bool = True) -> tuple[int, np.ndarray]:
+    with open(path) as f:
+        return read_pace_2016_edges(f, zero_indexed)
+
+
+def load_pace_2023_edges(path: str, zero_indexed: bool = True) -> tuple[int, np.ndarray]:
+    with open(path) as f:
+        return read_pace_2023_edges(f, zero_indexed)
+
+
 def write_pace(output: TextIO, G: nx.Graph, problem_name: str, comments: list[str] = [], zero_indexed: bool = True) -> None:
     offset = 1 if zero_indexed else 0
     n = G.number_of_nodes()
@@ -65,8 +112,19 @@ def write_pace(output: TextIO, G: nx.Graph, problem_name: str, comments: list[st
         output.write(f'c {comment}\n')
 
     output.write(f'p {problem_name} {n} {m}\n')
-    for u, v in G.edges():
-        output.write(f'{u + offset} {v + offset}\n')
+    output.writelines(f'{u + offset} {v + offset}\n' for u, v in G.edges())
+
+
+def write_pace_edges(output: TextIO, n: int, edges: np.ndarray, problem_name: str, comments: list[str] = [], zero_indexed: bool = True) -> None:
+    offset = 1 if zero_indexed else 0
+    edges = np.asarray(edges).reshape(-1, 2)
+
+    for comment in comments:
+        output.write(f'c {comment}\n')
+
+    output.write(f'p {problem_name} {n} {len(edges)}\n')
+    if len(edges):
+        np.savetxt(output, edges + offset, fmt='%d')
 
 
 def write_pace_2016(output: TextIO, G: nx.Graph, comments: list[str] = [], zero_indexed: bool = True) -> None:
@@ -77,6 +135,14 @@ def write_pace_2023(output: TextIO, G: nx.Graph, comments: list[str] = [], zero_
     write_pace(output, G, 'tww', comments, zero_indexed)
 
 
+def write_pace_2016_edges(output: TextIO, n: int, edges: np.ndarray, comments: list[str] = [], zero_indexed: bool = True) -> None:
+    write_pace_edges(output, n, edges, 'tw', comments, zero_indexed)
+
+
+def write_pace_2023_edges(output: TextIO, n: int, edges: np.ndarray, comments: list[str] = [], zero_indexed: bool = True) -> None:
+    write_pace_edges(output, n, edges, 'tww', comments, zero_indexed)
+
+
 def save_pace_2016(path: str, G: nx.Graph, comments: list[str] = [], zero_indexed: bool = True) -> None:
     with open(path, 'w') as f:
         write_pace_2016(f, G, comments, zero_indexed)
@@ -85,3 +151,13 @@ def save_pace_2016(path: str, G: nx.Graph, comments: list[str] = [], zero_indexe
 def save_pace_2023(path: str, G: nx.Graph, comments: list[str] = [], zero_indexed: bool = True) -> None:
     with open(path, 'w') as f:
         write_pace_2023(f, G, comments, zero_indexed)
+
+
+def save_pace_2016_edges(path: str, n: int, edges: np.ndarray, comments: list[str] = [], zero_indexed: bool = True) -> None:
+    with open(path, 'w') as f:
+        write_pace_2016_edges(f, n, edges, comments, zero_indexed)
+
+
+def save_pace_2023_edges(path: str, n: int, edges: np.ndarray, comments: list[str] = [], zero_indexed: bool = True) -> None:
+    with open(path, 'w') as f:
+        write_pace_2023_edges(f, n, edges, comments, zero_indexed)
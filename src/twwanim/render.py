@@ -0,0 +1,296 @@
+"""Rendering entry points.
+
+This is the only module that the command-line tool imports manim through; it is loaded
+lazily so that `twwanim --version`, `--evaluate` and the I/O helpers stay lightweight.
+"""
+
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from typing import Hashable, Optional, Sequence, Tuple
+
+import networkx as nx
+
+with redirect_stdout(open(os.devnull, 'w')):
+    # workaround: https://github.com/ManimCommunity/manim/issues/3326
+    from manim import tempconfig
+
+import manim
+from manim import config as globalconfig
+from manim._config.utils import _determine_quality
+
+from manim.utils.file_ops import open_file
+
+from twwanim.TwinwidthAnimation import TwinwidthAnimation
+from twwanim.segment import Segment, plan_segments
+from twwanim.checkpoint import Checkpoint
+from twwanim.cache import RenderCache
+from twwanim.digest import render_digest, segment_digests
+from twwanim.evaluation import find_key_steps
+from twwanim.layout import ensure_layout
+from twwanim.pipeline import concat_movies, private_partial_movie_dir
+
+__all__ = ['make_config', 'ensure_layout', 'render_movie', 'render_scene', 'render_segments', 'render_parallel', 'concat_movies', 'output_movie_path']
+
+# output formats whose partial movies can be concatenated without re-encoding
+CONCAT_FORMATS = ['mp4', 'webm', 'mov']
+
+
+def make_config(quality: str = 'h', format: str = 'mp4', resolution: Optional[str] = None, fps: Optional[float] = None):
+    """Returns a copy of the global manim config with the given settings."""
+
+    config = globalconfig.copy()
+    try:
+        config.quality = _determine_quality(quality)
+        config.format = format
+        if resolution is not None:
+            w, h = map(int, resolution.split(','))
+            config.pixel_width = w
+            config.pixel_height = h
+        if fps is not None:
+            config.frame_rate = fps
+    except Exception as e:
+        raise ValueError(f'Commandline format error: {e}')
+    return config
+
+
+def render_movie(
+    g: nx.Graph,
+    cs: Sequence[Tuple[Hashable, Hashable]],
+    speed: float,
+    config,
+    preview: bool = False,
+    scene_options: dict = {},
+    layout: str = 'auto',
+    cache: Optional[RenderCache] = None,
+) -> str:
+    """Renders the whole animation in this process; returns the path to the movie file.
+
+    `scene_options` are keyword arguments to `TwinwidthAnimation.set_options()`.
+    If the graph has no positions, they are computed by the `layout` method (see
+    `ensure_layout()`) and stored in `cache` if given. Exceptions from manim are propagated.
+    """
+
+    ensure_layout(g, layout, cache)
+
+    with tempconfig(config):
+        scene = TwinwidthAnimation()
+        scene.set_graph(g)
+        scene.set_contraction_sequence(cs)
+        scene.set_speed(speed)
+        scene.set_options(**scene_options)
+        scene.render(preview)
+        file_writer = scene.renderer.file_writer
+        return str(getattr(file_writer, 'gif_file_path', None) or file_writer.movie_file_path)
+
+
+def render_scene(
+    g: nx.Graph,
+    cs: Sequence[Tuple[Hashable, Hashable]],
+    speed: float,
+    config,
+    preview: bool = False,
+    scene_options: dict = {},
+    layout: str = 'auto',
+) -> int:
+    """Renders the whole animation in this process; returns the exit status."""
+
+    try:
+        render_movie(g, cs, speed, config, preview, scene_options, layout)
+    except Exception as e:
+        print(f'Error while rendering: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+def _render_segment(
+    g: nx.Graph,
+    cs: Sequence[Tuple[Hashable, Hashable]],
+    speed: float,
+    options: dict,
+    segment: Segment,
+    output_file: str,
+    scene_options: dict = {},
+) -> str:
+    """Renders one segment in a worker process; returns the path to the movie file.
+
+    The partial movies go to a directory of this segment, removed once they are combined.
+    """
+
+    config = make_config(**options)
+    config.output_file = output_file
+
+    with private_partial_movie_dir(config), tempconfig(config):
+        scene = TwinwidthAnimation()
+        scene.set_graph(g)
+        scene.set_contraction_sequence(cs)
+        scene.set_speed(speed)
+        scene.set_options(**scene_options)
+        scene.set_segment(segment)
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def output_movie_path(options: dict) -> str:
+    """Returns the path where manim writes the movie of `TwinwidthAnimation` with the given settings."""
+
+    with tempconfig(make_config(**options)):
+        directory = globalconfig.get_dir('video_dir', module_name='')
+        ext = '.gif' if options.get('format') == 'gif' else globalconfig.movie_file_extension
+        return os.path.join(directory, TwinwidthAnimation.__name__ + ext)
+
+
+def render_segments(
+    g: nx.Graph,
+    cs: Sequence[Tuple[Hashable, Hashable]],
+    speed: float,
+    options: dict,
+    jobs: int = 1,
+    num_segments: Optional[int] = None,
+    segment_length: Optional[int] = None,
+    preview: bool = False,
+    checkpoint: Optional[Checkpoint] = None,
+    cache: Optional[RenderCache] = None,
+    scene_options: dict = {},
+    layout: str = 'auto',
+) -> int:
+    """Renders independent segments of the sequence in a process pool and concatenates them.
+
+    Args:
+        options: keyword arguments to `make_config()`
+        jobs: number of worker processes
+        num_segments, segment_length: how to split the sequence (see `segment_bounds()`)
+        checkpoint: (optional) records finished segments; segments already rendered by
+            a previous run with the same checkpoint key are reused (concatenable formats only)
+        cache: (optional) reuses the whole movie or individual segments rendered before
+            with the same inputs, and stores the new ones; gif movies are rendered and
+            stored as a whole, and png frames are not stored
+        scene_options: keyword arguments to `TwinwidthAnimation.set_options()`
+        layout: layout method for graphs without positions (see `ensure_layout()`)
+    """
+
+    ensure_layout(g, layout, cache)
+    format = options.get('format', 'mp4')
+    if format not in CONCAT_FORMATS:
+        if checkpoint is not None:
+            print(f"Warning: checkpoints need one of the formats {', '.join(CONCAT_FORMATS)}; rendering without checkpoint", file=sys.stderr)
+        if cache is not None and format != 'gif':
+            print(f'Warning: {format} output is not cached; only the layout is stored', file=sys.stderr)
+        if cache is None or format != 'gif':
+            return render_scene(g, cs, speed, make_config(**options), preview, scene_options)
+
+    cs = list(cs)
+    output_path = output_movie_path(options)
+    ext = os.path.splitext(output_path)[1]
+    settings = dict(options, speed=speed, manim=manim.__version__, **scene_options)
+
+    # whole movie in the cache
+    if cache is not None:
+        key = render_digest(g, cs, **settings)
+        cached = cache.get(key, ext)
+        if cached is not None:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            shutil.copyfile(cached, output_path)
+            if preview:
+                open_file(output_path)
+            return 0
+
+    if format not in CONCAT_FORMATS:
+        # gif: rendered as a whole to `output_path` and stored
+        config = make_config(**options)
+        config.output_file = TwinwidthAnimation.__name__
+        try:
+            path = render_movie(g, cs, speed, config, preview, scene_options)
+        except Exception as e:
+            print(f'Error while rendering: {e}', file=sys.stderr)
+            return 1
+        cache.put(render_digest(g, cs, **settings), path)
+        cache.evict()
+        return 0
+
+    segments = checkpoint.load_segments() if checkpoint is not None else None
+    if segments is None:
+        key_steps = None
+        if scene_options.get('fast_forward'):
+            key_steps = find_key_steps(g, cs, scene_options.get('fast_forward_threshold'))
+        segments = plan_segments(g, cs, num_segments or jobs, segment_length, key_steps)
+        if checkpoint is not None:
+            checkpoint.save_segments(segments)
+
+    prefix = TwinwidthAnimation.__name__
+    paths = {}
+    if checkpoint is not None:
+        prefix += f'_{checkpoint.key[:12]}'
+        paths.update(checkpoint.completed)
+        if paths:
+            print(f'Resuming from step {checkpoint.last_completed_step(segments)}: {len(paths)}/{len(segments)} segments rendered')
+
+    segment_keys = []
+    if cache is not None:
+        segment_keys = segment_digests(g, cs, [s.start for s in segments] + [segments[-1].end], **settings)
+        for i, key in enumerate(segment_keys):
+            if i not in paths:
+                cached = cache.get(key, ext)
+                if cached is not None:
+                    paths[i] = cached
+
+    errors = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(_render_segment, g, cs, speed, options, seg, f'{prefix}_part{i:04d}', scene_options): i
+            for i, seg in enumerate(segments) if i not in paths
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                paths[i] = future.result()
+            except Exception as e:
+                errors += [e]
+                continue
+            if cache is not None:
+                paths[i] = cache.put(segment_keys[i], paths[i], move=True)
+            if checkpoint is not None:
+                checkpoint.mark_completed(i, paths[i])
+
+    if errors:
+        print(f'Error while rendering: {errors[0]}', file=sys.stderr)
+        return 1
+
+    paths = [paths[i] for i in range(len(segments))]
+    try:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        concat_movies(paths, output_path)
+    except Exception as e:
+        print(f'Error while concatenating movies: {e}', file=sys.stderr)
+        return 1
+
+    if cache is not None:
+        cache.put(render_digest(g, cs, **settings), output_path)
+        cache.evict()
+    else:
+        for path in paths:
+            os.remove(path)
+    if checkpoint is not None:
+        checkpoint.clear()
+
+    if preview:
+        open_file(output_path)
+    return 0
+
+
+def render_parallel(
+    g: nx.Graph,
+    cs: Sequence[Tuple[Hashable, Hashable]],
+    speed: float,
+    options: dict,
+    jobs: int,
+    num_segments: Optional[int] = None,
+    preview: bool = False,
+    scene_options: dict = {},
+    layout: str = 'auto',
+) -> int:
+    """Splits the sequence evenly into `num_segments` (default: `jobs`) segments and renders them in parallel."""
+
+    return render_segments(g, cs, speed, options, jobs, num_segments or jobs, preview=preview, scene_options=scene_options, layout=layout)
@@ -0,0 +1,98 @@
+import copy
+import networkx as nx
+from typing import Hashable, Optional, Sequence, Tuple
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+
+__all__ = ['Segment', 'plan_segments', 'segment_bounds']
+
+NUM_MAX_ROWS = 20  # number of rows shown in the contraction table
+
+
+class Segment:
+    """Part of a contraction sequence that can be rendered independently.
+
+    Holds the state right before contraction `start`: the trigraph (edge colors and
+    orientations), the twin-width so far, and the table rows `(time, u, v, red degree)`
+    that are visible at that moment. A row summarizing contractions skipped in fast-forward
+    mode has `time = (first, last)`, `u = v = None` and the max red degree over them.
+    """
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        data: Optional[ArrayTriGraphData] = None,
+        tww: int = 0,
+        rows: Sequence[Tuple[int, Hashable, Hashable, int]] = [],
+    ) -> None:
+        self.start = start
+        self.end = end
+        self.data = data  # None for the first segment
+        self.tww = tww
+        self.rows = list(rows)
+
+    def __repr__(self) -> str:
+        return f'Segment(start={self.start}, end={self.end}, tww={self.tww})'
+
+
+def segment_bounds(k: int, num_segments: Optional[int] = None, length: Optional[int] = None) -> list[int]:
+    """Returns the boundaries of segments for a sequence of length `k`.
+
+    Either splits the sequence evenly into `num_segments` parts, or into parts of `length`
+    contractions (the last one may be shorter). Fixed-length segments do not move when the
+    tail of the sequence changes.
+    """
+
+    if length is not None:
+        return list(range(0, k, max(1, length))) + [k] if k > 0 else [0, 0]
+
+    num_segments = max(1, min(num_segments or 1, k))
+    return [k * i // num_segments for i in range(num_segments + 1)]
+
+
+def plan_segments(
+    g: nx.Graph,
+    cs: Sequence[Tuple[Hashable, Hashable]],
+    num_segments: Optional[int] = None,
+    length: Optional[int] = None,
+    key_steps: Optional[set[int]] = None,
+) -> list[Segment]:
+    """Splits the contraction sequence into contiguous segments and snapshots the state at each checkpoint.
+
+    See `segment_bounds()` for the meaning of `num_segments` and `length`. For fast-forward
+    mode, `key_steps` are the (0-indexed) animated steps (see `find_key_steps()`); the table
+    rows then summarize the other steps as the scene does, up to the end of each segment.
+    """
+
+    bounds = segment_bounds(len(cs), num_segments, length)
+    num_segments = len(bounds) - 1
+
+    data = ArrayTriGraphData(g)
+    tww = 0
+    rows = []
+    skipped = []  # (time, max red degree) of the contractions since the last row
+    ret = [Segment(bounds[0], bounds[1])]
+
+    def add_row(row: Tuple) -> None:
+        nonlocal rows
+        rows = (rows + [row])[-NUM_MAX_ROWS:]
+
+    def add_skipped_row() -> None:
+        if skipped:
+            add_row(((skipped[0][0], skipped[-1][0]), None, None, max(d for _, d in skipped)))
+            skipped.clear()
+
+    for i in range(1, num_segments):
+        for t in range(bounds[i - 1], bounds[i]):
+            u, v = cs[t]
+            data.contract(u, v)
+            reddeg = data.max_red_degree()
+            tww = max(tww, reddeg)
+            if key_steps is not None and t not in key_steps:
+                skipped += [(t + 1, reddeg)]
+            else:
+                add_skipped_row()
+                add_row((t + 1, u, v, reddeg))
+        add_skipped_row()
+        ret += [Segment(bounds[i], bounds[i + 1], copy.deepcopy(data), tww, rows)]
+    return ret
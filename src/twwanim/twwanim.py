@@ -1,20 +1,11 @@
-import os
 import argparse
 import json
-from contextlib import redirect_stdout
-from typing import Hashable, Sequence, Tuple
+import sys
+import time
+from contextlib import nullcontext
 
-import networkx as nx
-
-with redirect_stdout(open(os.devnull, 'w')):
-    # workaround: https://github.com/ManimCommunity/manim/issues/3326
-    from manim import tempconfig
-
-from manim import config as globalconfig
-from manim._config.utils import _determine_quality
-
-from twwanim.TwinwidthAnimation import TwinwidthAnimation
-from twwanim.readwrite import *
+# Heavy modules (networkx, manim) are imported inside the functions below
+# so that `--version` and `--help` return immediately.
 
 
 def get_parser():
@@ -33,66 +24,236 @@ def get_parser():
     parser.add_argument('--format', default='mp4', choices=['png', 'gif', 'mp4', 'webm', 'mov'], help='output format (default: mp4)')
     parser.add_argument('-r', '--resolution', metavar='W,H', help='resolution in "W,H"')
     parser.add_argument('--fps', '--frame_rate', metavar='FLOAT', type=float, help='render at this frame rate')
-    parser.add_argument('graph_path', metavar='GRAPH_PATH', help='path to the input graph file')
-    parser.add_argument('cs_path', metavar='CS_PATH', help='path to the input contraction sequence file')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='number of parallel processes for rendering segments, --batch and --rank (default: 1)')
+    parser.add_argument('--checkpoint', metavar='DIR', help='record rendered steps in DIR and resume from there when re-run with the same inputs')
+    parser.add_argument('--cache', metavar='DIR', help='reuse movies and segments rendered before with the same inputs, stored in DIR')
+    parser.add_argument('--cache-size', metavar='MB', type=float, help='maximum size of the cache directory in megabytes (default: unlimited)')
+    parser.add_argument('--segment-length', metavar='N', type=int, default=20, help='number of contractions per segment for --checkpoint and --cache (default: 20)')
+    parser.add_argument('--layout', default='auto', choices=['auto', 'spring', 'spectral'], help='layout for graphs without positions; auto uses spectral for large graphs (default: auto)')
+    parser.add_argument('--lod-threshold', metavar='N', type=int, default=120, help='draw graphs with more than N vertices in level-of-detail mode: white edges as one path, no vertex labels (default: 120; -1 to disable)')
+    parser.add_argument('--lod-labels', action='store_true', help='keep vertex labels in level-of-detail mode')
+    parser.add_argument('--compact', action='store_true', help='play the animation phases of each contraction in one call')
+    parser.add_argument('--merge-steps', metavar='N', type=int, default=0, help='play N consecutive contractions in one call; implies --compact')
+    parser.add_argument('--fast-forward', action='store_true', help='animate only the contractions where the twin-width increases and show the others as one transition')
+    parser.add_argument('--fast-forward-threshold', metavar='D', type=int, help='with --fast-forward, also animate the contractions with max red degree at least D')
+    parser.add_argument('-g', '--greedy', action='store_true', help='generate the contraction sequence greedily instead of reading CS_PATH')
+    parser.add_argument('--time-limit', metavar='SEC', type=float, help='with --greedy, contract the remaining vertices without scoring after SEC seconds')
+    parser.add_argument('-e', '--evaluate', action='store_true', help='print the max red degree of each step and the twin-width without rendering')
+    parser.add_argument('--export-actions', metavar='PATH', help='write the edge changes of every contraction to PATH without rendering (JSON lines for .ndjson/.jsonl, binary otherwise)')
+    parser.add_argument('--convert', metavar='PATH', help='write GRAPH_PATH with its layout and CS_PATH (or the --greedy sequence), if given, to the binary container PATH (.npz) without rendering')
+    parser.add_argument('--store-layout', action='store_true', help='store the layout computed for rendering in GRAPH_PATH if it is a binary container (.npz) without positions')
+    parser.add_argument('--profile', metavar='PATH', help='write per-step and per-phase timings to PATH (single-process renders and --evaluate)')
+    parser.add_argument('--profile-format', default='chrome', choices=['chrome', 'json'], help='format of --profile: Chrome trace events or a JSON summary (default: chrome)')
+    parser.add_argument('--batch', metavar='PATH', help='process all instances in a directory or a manifest file instead of GRAPH_PATH and CS_PATH')
+    parser.add_argument('--rank', metavar='PATH', help='evaluate all contraction sequences in a directory or a manifest file on GRAPH_PATH in parallel and rank them')
+    parser.add_argument('--no-early-stop', action='store_true', help='with --rank, evaluate every sequence to the end instead of stopping when it is worse than the best so far')
+    parser.add_argument('--summary', metavar='PATH', help='write the JSON summary of --batch or --rank to PATH (default: stdout for --batch)')
+    parser.add_argument('graph_path', metavar='GRAPH_PATH', nargs='?', help='path to the input graph file')
+    parser.add_argument('cs_path', metavar='CS_PATH', nargs='?', help='path to the input contraction sequence file')
 
     return parser
 
 
-def load_graph(path: str) -> nx.Graph:
-    if path.endswith('.json'):
-        with open(path) as f:
-            return nx.node_link_graph(json.load(f))
-    elif path.endswith('.gr'):
-        return load_pace_2023(path, zero_indexed=False)
-    else:
-        NotImplementedError('unsupported graph file')
+def evaluate(g, cs) -> None:
+    from twwanim.evaluation import iter_red_degrees
+
+    start = time.perf_counter()
+    tww = 0
+    for t, (u, v, reddeg) in enumerate(iter_red_degrees(g, cs)):
+        tww = max(tww, reddeg)
+        print(f'{t + 1} {u} {v} {reddeg}')
+    elapsed = time.perf_counter() - start
+
+    print(f'twin-width: {tww}')
+    print(f'elapsed: {elapsed:.3f}s')
+
+
+def scene_options(args) -> dict:
+    """Keyword arguments to `TwinwidthAnimation.set_options()`."""
+
+    return dict(
+        lod_threshold=None if args.lod_threshold < 0 else args.lod_threshold,
+        lod_labels=args.lod_labels,
+        steps_per_play=max(args.merge_steps, 1) if args.compact or args.merge_steps else 0,
+        fast_forward=args.fast_forward,
+        fast_forward_threshold=args.fast_forward_threshold,
+    )
+
+
+def render_cache(args):
+    """Returns the `RenderCache` given by `--cache`, or None."""
+
+    if args.cache is None:
+        return None
+    from twwanim.cache import RenderCache
+    return RenderCache(args.cache, None if args.cache_size is None else int(args.cache_size * 1024 * 1024))
+
+
+def convert(args, g, cs) -> int:
+    from twwanim.layout import ensure_layout
+    from twwanim.readwrite import save_container
+
+    ensure_layout(g, args.layout, render_cache(args))
+    save_container(args.convert, g, cs)
+    print(f'{args.convert}: n={len(g)}, m={g.number_of_edges()}' + ('' if cs is None else f', length={len(cs)}'))
+    return 0
+
+
+def store_layout(path: str, g) -> None:
+    """Stores the layout of `g` in the container `path`; failures are reported as warnings."""
+
+    from twwanim.readwrite import save_layout
+
+    try:
+        save_layout(path, g)
+    except (OSError, ValueError) as e:
+        print(f'Warning: could not store the layout in {path}: {e}', file=sys.stderr)
+
 
+def render(args, g, cs) -> int:
+    import networkx as nx
+    from twwanim.profiling import get_profiler
+    from twwanim.render import make_config, ensure_layout, render_scene, render_segments, render_parallel
 
-def load_cs(path: str) -> Sequence[Tuple[Hashable, Hashable]]:
-    if path.endswith('.json'):
-        with open(path) as f:
-            return json.load(f)
+    options = dict(quality=args.quality, format=args.format, resolution=args.resolution, fps=args.fps)
+    cache = render_cache(args)
+
+    with get_profiler().phase('layout'):
+        has_layout = len(nx.get_node_attributes(g, 'pos')) == len(g)
+        ensure_layout(g, args.layout, cache)
+        if args.store_layout and not has_layout and args.graph_path.endswith('.npz'):
+            store_layout(args.graph_path, g)
+
+    if args.checkpoint is not None or cache is not None:
+        from twwanim.checkpoint import Checkpoint
+        from twwanim.digest import render_digest
+
+        checkpoint = None
+        if args.checkpoint is not None:
+            key = render_digest(g, cs, speed=args.speed, segment_length=args.segment_length, **options, **scene_options(args))
+            checkpoint = Checkpoint(args.checkpoint, key)
+
+        return render_segments(
+            g, cs, args.speed, options, args.jobs,
+            segment_length=args.segment_length, preview=args.preview, checkpoint=checkpoint, cache=cache,
+            scene_options=scene_options(args)
+        )
+    if args.jobs > 1:
+        return render_parallel(g, cs, args.speed, options, args.jobs, preview=args.preview, scene_options=scene_options(args))
+    return render_scene(g, cs, args.speed, make_config(**options), args.preview, scene_options(args))
+
+
+def batch(args) -> int:
+    from twwanim.batch import find_instances, run_batch
+
+    options = dict(quality=args.quality, format=args.format, resolution=args.resolution, fps=args.fps)
+    instances = find_instances(args.batch)
+
+    start = time.perf_counter()
+    cache = render_cache(args)
+    results = run_batch(instances, args.evaluate, args.speed, options, args.jobs, scene_options(args), args.layout, cache)
+    if cache is not None:
+        cache.evict()
+    summary = {
+        'num_instances': len(results),
+        'num_failed': sum(r['status'] != 'ok' for r in results),
+        'seconds': time.perf_counter() - start,
+        'instances': results,
+    }
+
+    if args.summary is None:
+        json.dump(summary, sys.stdout, indent=2)
+        print()
     else:
-        return load_contraction_file(path, zero_indexed=False)
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary['num_failed'] else 0
 
 
-def main(args):
-    # load input files
+def rank(args) -> int:
+    from twwanim.readwrite import load_graph
+    from twwanim.ranking import find_sequences, rank_sequences
+
     g = load_graph(args.graph_path)
-    cs = load_cs(args.cs_path)
+    sequences = find_sequences(args.rank)
 
-    # test if `pos` is set for all nodes
-    if len(nx.get_node_attributes(g, 'pos')) != len(g):
-        print(f'Using default graph layout: n={len(g)}, m={g.number_of_edges()}')
-        nx.set_node_attributes(g, nx.spring_layout(g), 'pos')
+    start = time.perf_counter()
+    results = rank_sequences(g, sequences, args.jobs, early_stop=not args.no_early_stop)
+    elapsed = time.perf_counter() - start
+
+    for r in results:
+        tww = r.get('twin_width', '-')
+        if r['status'] == 'pruned':
+            tww = f'>={tww}'
+        print(f"{r['rank']} {r['name']} {r['status']} {tww}")
+    print(f'elapsed: {elapsed:.3f}s')
+
+    if args.summary is not None:
+        with open(args.summary, 'w') as f:
+            json.dump({'graph': args.graph_path, 'num_sequences': len(results), 'seconds': elapsed, 'sequences': results}, f, indent=2)
+    return 0 if results and results[0]['status'] == 'ok' else 1
+
+
+def main(args):
+    from twwanim.readwrite import load_graph, load_cs, iter_cs, save_action_log
+
+    if args.batch is not None:
+        return batch(args)
+    if args.rank is not None:
+        if args.graph_path is None:
+            get_parser().error('the following arguments are required: GRAPH_PATH')
+        return rank(args)
+    if args.greedy:
+        if args.graph_path is None:
+            get_parser().error('the following arguments are required: GRAPH_PATH')
+        if args.cs_path is not None:
+            get_parser().error('argument -g/--greedy: not allowed with CS_PATH')
+    elif args.convert is not None:
+        if args.graph_path is None:
+            get_parser().error('the following arguments are required: GRAPH_PATH')
+    elif args.graph_path is None or args.cs_path is None:
+        get_parser().error('the following arguments are required: GRAPH_PATH, CS_PATH')
+    if args.checkpoint is not None and args.format in ('png', 'gif'):
+        get_parser().error(f'argument --checkpoint: not allowed with --format {args.format} (use mp4, webm or mov)')
+
+    prof = None
+    if args.profile is not None:
+        from twwanim.profiling import enable_profiler
+        prof = enable_profiler()
 
-    # call manim's render()
-    config = globalconfig.copy()
     try:
-        config.quality = _determine_quality(args.quality)
-        config.format = args.format
-        if args.resolution is not None:
-            w, h = map(int, args.resolution.split(','))
-            config.pixel_width = w
-            config.pixel_height = h
-        if args.fps is not None:
-            config.frame_rate = args.fps
-    except Exception as e:
-        raise f'Commandline format error: {e}'
-
-    # render the scene
-    with tempconfig(config):
-        scene = TwinwidthAnimation()
-        scene.set_graph(g)
-        scene.set_contraction_sequence(cs)
-        scene.set_speed(args.speed)
-
-        try:
-            scene.render(args.preview)
-        except Exception:
-            return 1  # error while rendering
+        # load input files
+        with prof.phase('load') if prof else nullcontext():
+            g = load_graph(args.graph_path)
+            if args.greedy or args.cs_path is None:
+                cs = None
+            elif args.evaluate or args.export_actions is not None:
+                cs = iter_cs(args.cs_path)  # streamed while evaluating
+            else:
+                cs = load_cs(args.cs_path)
+
+        if args.greedy:
+            from twwanim.greedy import iter_greedy_sequence, greedy_sequence
+
+            if args.evaluate or args.export_actions is not None:
+                cs = iter_greedy_sequence(g, args.time_limit)  # streamed while evaluating
+            else:
+                with prof.phase('greedy') if prof else nullcontext():
+                    cs = greedy_sequence(g, args.time_limit)
+
+        if args.convert is not None:
+            return convert(args, g, cs)
+        if args.export_actions is not None:
+            tww = save_action_log(args.export_actions, g, cs)
+            print(f'twin-width: {tww}')
+            return 0
+        if args.evaluate:
+            return evaluate(g, cs)
+        return render(args, g, cs)
+    finally:
+        if prof is not None:
+            prof.save(args.profile, args.profile_format)
 
 
 def run_main():
-    main(get_parser().parse_args())
+    sys.exit(main(get_parser().parse_args()))
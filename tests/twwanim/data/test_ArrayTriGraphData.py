@@ -0,0 +1,134 @@
+import unittest
+from random import Random
+
+import networkx as nx
+from twwanim.data.TriGraphData import TriGraphData
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+
+
+class TestArrayTriGraphData(unittest.TestCase):
+    """Tests ArrayTriGraphData class."""
+
+    def assertSameAction(self, expected, actual):
+        for attr in ['highlight_to_red', 'highlight_white_to_green', 'highlight_red_to_green', 'edge_shrink', 'edge_move', 'edge_fadeout']:
+            self.assertEqual(sorted(getattr(expected, attr)), sorted(getattr(actual, attr)), attr)
+
+    def test_contract(self):
+        gg = nx.Graph()
+        gg.add_edges_from([(1, 2), (1, 3), (2, 3), (2, 4), (3, 5)])
+
+        g = ArrayTriGraphData(gg)
+        self.assertEqual(len(g), 5)
+        self.assertEqual(g.max_red_degree(), 0)
+
+        act = g.contract(4, 1)
+
+        self.assertEqual(act.highlight_to_red, [1])
+        self.assertEqual(sorted(act.highlight_white_to_green), [0, 3])
+        self.assertEqual(sorted(act.edge_move), [(0, 4, 2), (1, 4, 3)])
+        self.assertEqual(act.edge_fadeout, [0])
+        self.assertEqual(g.max_red_degree(), 1)
+        self.assertEqual(g.edge_id(3, 4), 1)  # moved edges keep their IDs
+        self.assertEqual(g.black_edges_at(4), [(2, 4)])
+        self.assertEqual(sorted(g.black_edges_at(2)), [(2, 3), (2, 4)])
+
+        act = g.contract(5, 4)
+
+        self.assertEqual(act.highlight_red_to_green, [1])
+        self.assertEqual(sorted(act.edge_move), [(1, 5, 3), (3, 2, 5)])
+        self.assertEqual(g.max_red_degree(), 2)
+
+        act = g.contract(3, 5)
+
+        self.assertEqual(act.edge_shrink, [(1, 1)])
+        self.assertEqual(act.edge_move, [(3, 2, 3)])
+        self.assertEqual(g.max_red_degree(), 1)
+
+        act = g.contract(2, 3)
+
+        self.assertEqual(act.edge_shrink, [(3, 0)])
+        self.assertEqual(g.max_red_degree(), 0)
+        self.assertEqual(list(g.nodes()), [2])
+
+    def test_contract_random(self):
+        rand = Random(12345)
+        for n in [10, 50, 100]:
+            for p in [0.1, 0.3, 0.5]:
+                gg = nx.erdos_renyi_graph(n, p, seed=rand.randrange(1 << 30))
+                expected = TriGraphData(gg.copy())
+                actual = ArrayTriGraphData(gg)
+
+                nodes = list(gg.nodes())
+                while len(nodes) >= 2:
+                    u, v = rand.sample(nodes, 2)
+                    nodes.remove(v)
+
+                    self.assertSameAction(expected.contract(u, v), actual.contract(u, v))
+                    self.assertEqual(expected.max_red_degree(), actual.max_red_degree())
+                    self.assertEqual(set(expected.gb.nodes()), set(actual.nodes()))
+                    self.assertEqual(
+                        {expected.oriented(*e) for e in expected.gb.edges()},
+                        set(actual.black_edges()))
+                    self.assertEqual(
+                        {expected.oriented(*e) for e in expected.gr.edges()},
+                        set(actual.red_edges()))
+                    self.assertEqual(expected.edge_code, actual.edge_code)
+
+    def test_stats(self):
+        rand = Random(2023)
+        gg = nx.erdos_renyi_graph(60, 0.2, seed=1)
+        g = ArrayTriGraphData(gg)
+        self.assertEqual(g.stats(), {
+            'step': 0, 'max_red_degree': 0, 'max_red_degree_vertex': g.max_red_degree_vertex(),
+            'red_degree_histogram': [60], 'red_edges': 0, 'twin_width': 0,
+        })
+
+        nodes = list(gg.nodes())
+        history = []
+        while len(nodes) >= 2:
+            u, v = rand.sample(nodes, 2)
+            nodes.remove(v)
+            g.contract(u, v)
+
+            degrees = [g.red_degree(x) for x in nodes]
+            history += [max(degrees)]
+            self.assertEqual(g.red_degree(g.max_red_degree_vertex()), max(degrees))
+            self.assertEqual(g.red_degree_histogram(), [degrees.count(d) for d in range(max(degrees) + 1)])
+            self.assertEqual(g.number_of_red_edges(), len(list(g.red_edges())))
+            self.assertEqual(list(g.history), history)
+            self.assertEqual(g.twin_width(), max(history))
+            self.assertEqual(g.stats()['step'], len(history))
+
+    def test_rollback(self):
+        rand = Random(7)
+        gg = nx.erdos_renyi_graph(40, 0.3, seed=3)
+        g = ArrayTriGraphData(gg)
+
+        def state():
+            return (
+                set(g.nodes()), set(g.black_edges()), set(g.red_edges()),
+                {k: x for k, x in g.stats().items() if k != 'max_red_degree_vertex'},
+                [sorted(b) for b in g.red_degree_bucket], dict(g.edge_code),
+            )
+
+        nodes = list(gg.nodes())
+        snapshots = []
+        num_rollbacks = 0
+        while len(nodes) >= 2:
+            snapshots += [(g.snapshot(), state(), list(nodes))]
+            u, v = rand.sample(nodes, 2)
+            nodes.remove(v)
+            g.contract(u, v)
+
+            # roll back on every 4th step, up to 10 times, then contract to the end
+            if num_rollbacks < 10 and len(snapshots) % 4 == 0:
+                num_rollbacks += 1
+                token, expected, nodes = snapshots[rand.randrange(len(snapshots))]
+                g.rollback(token)
+                nodes = list(nodes)
+                self.assertEqual(state(), expected)
+                snapshots = [s for s in snapshots if s[0] <= token]
+
+        token, expected, _ = snapshots[0]
+        g.rollback(token)
+        self.assertEqual(state(), expected)
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from random import Random
+
+import networkx as nx
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+from twwanim.data.TriGraphArrays import TriGraphArrays
+
+
+class TestTriGraphArrays(unittest.TestCase):
+    """Tests TriGraphArrays class."""
+
+    def assertSameState(self, expected, actual):
+        self.assertEqual(sorted(expected.nodes()), sorted(actual.nodes()))
+        self.assertEqual(set(expected.black_edges()), set(actual.black_edges()))
+        self.assertEqual(set(expected.red_edges()), set(actual.red_edges()))
+        self.assertEqual(expected.max_red_degree(), actual.max_red_degree())
+        self.assertEqual(expected.edge_code, actual.edge_code)
+        self.assertEqual(expected.red_degree_histogram(), actual.red_degree_histogram())
+        self.assertEqual(expected.number_of_red_edges(), actual.number_of_red_edges())
+
+    def test_round_trip(self):
+        rand = Random(2024)
+        gg = nx.erdos_renyi_graph(40, 0.2, seed=7)
+        data = ArrayTriGraphData(gg)
+        cs = []
+        nodes = list(gg.nodes())
+        for _ in range(20):
+            u, v = rand.sample(nodes, 2)
+            nodes.remove(v)
+            data.contract(u, v)
+            cs += [(u, v)]
+
+        arrays = TriGraphArrays.from_data(data)
+        restored = TriGraphArrays.from_buffer(arrays.to_buffer()).to_data()
+        self.assertSameState(data, restored)
+        self.assertEqual(restored.twin_width(), data.twin_width())
+
+        # contracting the restored state gives the same result
+        while len(nodes) >= 2:
+            u, v = rand.sample(nodes, 2)
+            nodes.remove(v)
+            expected, actual = data.contract(u, v), restored.contract(u, v)
+            for attr in ['highlight_to_red', 'highlight_white_to_green', 'highlight_red_to_green', 'edge_shrink', 'edge_move', 'edge_fadeout']:
+                self.assertEqual(sorted(getattr(expected, attr)), sorted(getattr(actual, attr)), attr)
+            self.assertSameState(data, restored)
+
+    def test_shared_memory(self):
+        g = nx.relabel_nodes(nx.path_graph(5), {i: f'v{i}' for i in range(5)})
+        shm = TriGraphArrays.from_graph(g).to_shared_memory()
+        try:
+            arrays, block = TriGraphArrays.attach(shm.name)
+            self.assertEqual(arrays.labels(), ['v0', 'v1', 'v2', 'v3', 'v4'])
+            self.assertEqual(sorted(arrays.neighbors(2).tolist()), [1, 3])
+            self.assertFalse(arrays['black_indices'].flags.writeable)
+            self.assertEqual(set(arrays.to_data().black_edges()), set(g.edges()))
+            del arrays
+            block.close()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_save_load(self):
+        g = nx.petersen_graph()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'g.tri')
+            TriGraphArrays.from_graph(g).save(path)
+            arrays = TriGraphArrays.load(path)
+            self.assertEqual(arrays.labels(), list(range(10)))
+            self.assertSameState(ArrayTriGraphData(g), arrays.to_data())
+
+            arrays = TriGraphArrays.load(path, 'c')
+            arrays['removed'][0] = 1  # copy-on-write: the file is not changed
+            self.assertEqual(TriGraphArrays.load(path)['removed'][0], 0)
+            del arrays
+
+    def test_labels(self):
+        # string labels are stored as an array, not pickled
+        arrays = TriGraphArrays.from_graph(nx.Graph([('a', 'bc')]))
+        self.assertEqual(arrays['labels'].dtype.kind, 'U')
+        self.assertEqual(TriGraphArrays.from_buffer(arrays.to_buffer()).labels(), ['a', 'bc'])
+
+        with self.assertRaises(ValueError):
+            TriGraphArrays.from_graph(nx.Graph([((0, 0), (0, 1))]))
+
+        # headers declaring object arrays are rejected
+        buf = bytes(arrays.to_buffer()).replace(b'"<U2"', b'"|O8"', 1)
+        with self.assertRaises(ValueError):
+            TriGraphArrays.from_buffer(buf)
@@ -14,49 +14,43 @@ class TestTriGraphData(unittest.TestCase):
 
         g = TriGraphData(gg)
 
-        self.assertEqual(g.edge_orientation, {
-            (1, 2): (1, 2),
-            (2, 1): (1, 2),
-            (1, 3): (1, 3),
-            (3, 1): (1, 3),
-            (2, 3): (2, 3),
-            (3, 2): (2, 3),
-            (2, 4): (2, 4),
-            (4, 2): (2, 4),
-            (3, 5): (3, 5),
-            (5, 3): (3, 5),
-        })
+        # one entry per edge: ID 0, ..., 4 in the order of `gg.edges()`, keyed by vertex indices
+        self.assertEqual(g.edge_code, {(0, 1): 0, (0, 2): 2, (1, 2): 4, (1, 3): 6, (2, 4): 8})
+        self.assertEqual(g.edge_id(5, 3), 4)
+        self.assertEqual(g.oriented(5, 3), (3, 5))
 
         act = g.contract(4, 1)
 
-        self.assertEqual(act.highlight_to_red, [(1, 3)])
-        self.assertEqual(act.highlight_white_to_green, [(1, 2), (2, 4)])
+        self.assertEqual(act.highlight_to_red, [1])
+        self.assertEqual(act.highlight_white_to_green, [0, 3])
         self.assertEqual(act.highlight_red_to_green, [])
         self.assertEqual(act.edge_shrink, [])
-        self.assertEqual(act.edge_move, [(1, 3, 4, 3), (1, 2, 4, 2)])
-        self.assertEqual(act.edge_fadeout, [(1, 2)])
+        self.assertEqual(act.edge_move, [(1, 4, 3), (0, 4, 2)])
+        self.assertEqual(act.edge_fadeout, [0])
+        self.assertEqual(g.edge_id(4, 3), 1)
+        self.assertEqual(g.oriented(3, 4), (4, 3))
 
         self.assertEqual(g.max_red_degree(), 1)
 
         act = g.contract(5, 4)
 
-        self.assertEqual(act.highlight_to_red, [(2, 4)])
-        self.assertEqual(act.highlight_white_to_green, [(3, 5)])
-        self.assertEqual(act.highlight_red_to_green, [(4, 3)])
+        self.assertEqual(act.highlight_to_red, [3])
+        self.assertEqual(act.highlight_white_to_green, [4])
+        self.assertEqual(act.highlight_red_to_green, [1])
         self.assertEqual(act.edge_shrink, [])
-        self.assertEqual(act.edge_move, [(2, 4, 2, 5), (4, 3, 5, 3)])
-        self.assertEqual(act.edge_fadeout, [(3, 5)])
+        self.assertEqual(act.edge_move, [(3, 2, 5), (1, 5, 3)])
+        self.assertEqual(act.edge_fadeout, [4])
 
         self.assertEqual(g.max_red_degree(), 2)
 
         act = g.contract(3, 5)
 
         self.assertEqual(act.highlight_to_red, [])
-        self.assertEqual(act.highlight_white_to_green, [(2, 3)])
-        self.assertEqual(act.highlight_red_to_green, [(2, 5)])
-        self.assertEqual(act.edge_shrink, [(5, 3, 1)])
-        self.assertEqual(act.edge_move, [(2, 5, 2, 3)])
-        self.assertEqual(act.edge_fadeout, [(2, 3)])
+        self.assertEqual(act.highlight_white_to_green, [2])
+        self.assertEqual(act.highlight_red_to_green, [3])
+        self.assertEqual(act.edge_shrink, [(1, 1)])
+        self.assertEqual(act.edge_move, [(3, 2, 3)])
+        self.assertEqual(act.edge_fadeout, [2])
 
         self.assertEqual(g.max_red_degree(), 1)
 
@@ -65,11 +59,12 @@ class TestTriGraphData(unittest.TestCase):
         self.assertEqual(act.highlight_to_red, [])
         self.assertEqual(act.highlight_white_to_green, [])
         self.assertEqual(act.highlight_red_to_green, [])
-        self.assertEqual(act.edge_shrink, [(2, 3, 0)])
+        self.assertEqual(act.edge_shrink, [(3, 0)])
         self.assertEqual(act.edge_move, [])
         self.assertEqual(act.edge_fadeout, [])
 
         self.assertEqual(g.max_red_degree(), 0)
+        self.assertEqual(g.edge_code, {})
 
     def test_contract_random(self):
         rand = Random(12345)
@@ -83,6 +78,7 @@ class TestTriGraphData(unittest.TestCase):
 
                     while len(gg) >= 2:
                         u, v = rand.sample(list(gg.nodes()), 2)
+                        uv = (g.edge_id(u, v), g.oriented(u, v)) if g.gb.has_edge(u, v) or g.gr.has_edge(u, v) else None
 
                         act = g.contract(u, v)
                         gg.remove_node(v)
@@ -93,9 +89,16 @@ class TestTriGraphData(unittest.TestCase):
                         # black and red edges must be disjoint
                         self.assertFalse(set(g.gb.edges()) & set(g.gr.edges()))
 
+                        # one ID per edge
+                        self.assertEqual(len(g.edge_code), g.gb.number_of_edges() + g.gr.number_of_edges())
+                        self.assertEqual(len({c >> 1 for c in g.edge_code.values()}), len(g.edge_code))
+
                         if act.edge_shrink:
                             shrink_seen += 1
-                            x, y, z = act.edge_shrink[0]
-                            self.assertEqual([x, y][z], u)
-                            self.assertEqual([x, y][1 - z], v)
+                            e, z = act.edge_shrink[0]
+                            self.assertEqual(e, uv[0])
+                            self.assertEqual(uv[1][z], u)
+                            self.assertEqual(uv[1][1 - z], v)
+                        else:
+                            self.assertIsNone(uv)
         self.assertGreater(shrink_seen, 1)
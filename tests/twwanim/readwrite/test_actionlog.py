@@ -0,0 +1,49 @@
+import io
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+
+from twwanim.data.ArrayTriGraphData import ArrayTriGraphData
+from twwanim.readwrite import *
+
+RESOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'resources')
+ATTRS = ['highlight_to_red', 'highlight_white_to_green', 'highlight_red_to_green', 'edge_shrink', 'edge_move', 'edge_fadeout']
+
+
+class TestActionLog(unittest.TestCase):
+    """Tests actionlog module."""
+
+    def test_write_action_log(self):
+        path = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny', 'tiny005')
+        g = load_graph(path + '.gr')
+        cs = load_cs(path + '_cs.txt')
+        nx.set_node_attributes(g, nx.circular_layout(g), 'pos')
+
+        data = ArrayTriGraphData(g)
+        expected = []
+        for u, v in cs:
+            act = data.contract(u, v)
+            expected += [(u, v, data.max_red_degree(), [getattr(act, attr) for attr in ATTRS])]
+
+        for format in ['binary', 'ndjson']:
+            buf = io.BytesIO()
+            self.assertEqual(write_action_log(buf, g, iter(cs), format), data.twin_width())
+
+            buf.seek(0)
+            header, steps = read_action_log(buf)
+            self.assertEqual(header['nodes'], list(g.nodes()))
+            self.assertEqual(header['edges'], [[header['nodes'].index(x), header['nodes'].index(y)] for x, y in g.edges()])
+            self.assertEqual(len(header['pos']), len(g))
+            actual = [(u, v, d, [getattr(act, attr) for attr in ATTRS]) for u, v, d, act in steps]
+            self.assertEqual(actual, expected)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ['actions.ndjson', 'actions.bin']:
+                save_action_log(os.path.join(tmpdir, name), g, cs)
+                header, steps = load_action_log(os.path.join(tmpdir, name))
+                self.assertEqual(len(steps), len(cs))
+
+            with open(os.path.join(tmpdir, 'actions.ndjson'), 'rb') as f:
+                self.assertEqual(len(f.readlines()), len(cs) + 1)
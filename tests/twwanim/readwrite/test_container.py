@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from twwanim.readwrite import *
+
+RESOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'resources')
+
+
+class TestContainer(unittest.TestCase):
+    """Tests container module."""
+
+    def test_save_container(self):
+        path = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny', 'tiny005')
+        g = load_graph(path + '.gr')
+        cs = load_cs(path + '_cs.txt')
+        nx.set_node_attributes(g, nx.circular_layout(g), 'pos')
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out = os.path.join(tmp_dir, 'tiny005.npz')
+            save_container(out, g, cs)
+
+            h = load_graph(out)
+            self.assertEqual(list(h.nodes()), list(g.nodes()))
+            self.assertEqual(set(map(frozenset, h.edges())), set(map(frozenset, g.edges())))
+            for x in g:
+                np.testing.assert_allclose(h.nodes[x]['pos'], g.nodes[x]['pos'])
+
+            loaded = load_cs(out)
+            self.assertIsInstance(loaded.array, np.memmap)
+            self.assertEqual(len(loaded), len(cs))
+            self.assertEqual(list(loaded), cs)
+            self.assertEqual(loaded[3], cs[3])
+            self.assertEqual(list(loaded[2:5]), cs[2:5])
+            self.assertEqual(list(iter_cs(out)), cs)
+
+            # readable by NumPy
+            with np.load(out) as arrays:
+                self.assertEqual(sorted(arrays.files), ['cs', 'edges', 'nodes', 'pos'])
+
+    def test_labels(self):
+        g = nx.Graph([('a', 'b'), ('b', 'c'), ('c', 'd')])
+        cs = [('a', 'c'), ('b', 'd'), ('a', 'b')]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out = os.path.join(tmp_dir, 'g.npz')
+            save_container(out, g, cs)
+            self.assertEqual(set(map(frozenset, load_graph(out).edges())), set(map(frozenset, g.edges())))
+            self.assertEqual(list(load_cs(out)), cs)
+
+            # sequence only
+            save_container(out, cs=[(1, 2), (1, 3)])
+            self.assertEqual(list(load_cs(out)), [(1, 2), (1, 3)])
+            with self.assertRaises(ValueError):
+                load_graph(out)
+
+            save_container(out, cs=cs)
+            self.assertEqual(list(load_cs(out)), cs)
+            self.assertEqual(list(iter_cs(out)), cs)
+            with self.assertRaises(ValueError):
+                load_graph(out)
+            with self.assertRaisesRegex(ValueError, 'only integer or string vertex labels'):
+                save_container(out, cs=[(1, 'a')])
+
+            # compressed archives are loaded into memory
+            np.savez_compressed(out, nodes=np.array([5, 6, 7]), edges=np.array([[0, 1], [1, 2]], dtype=np.int32))
+            self.assertEqual(sorted(load_graph(out).edges()), [(5, 6), (6, 7)])
+
+            with self.assertRaises(ValueError):
+                save_container(out, nx.Graph([((0, 0), (0, 1))]))
+
+    def test_save_layout(self):
+        g = nx.cycle_graph(5)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out = os.path.join(tmp_dir, 'g.npz')
+            save_container(out, g, [(0, 1)])
+            self.assertEqual(nx.get_node_attributes(load_graph(out), 'pos'), {})
+
+            nx.set_node_attributes(g, nx.circular_layout(g), 'pos')
+            save_layout(out, g)
+            h = load_graph(out)
+            np.testing.assert_allclose(h.nodes[2]['pos'], g.nodes[2]['pos'])
+            self.assertEqual(list(load_cs(out)), [(0, 1)])
@@ -0,0 +1,42 @@
+import io
+import json
+import os
+import tempfile
+import types
+import unittest
+
+import numpy as np
+from twwanim.readwrite import *
+
+RESOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'resources')
+
+
+class TestContraction(unittest.TestCase):
+    """Tests contraction module."""
+
+    def test_read_contraction_file(self):
+        s = 'c comment\n3 2\n\n4 3\nc another comment\n4 1\n'
+
+        self.assertEqual(read_contraction_file(io.StringIO(s)), [(2, 1), (3, 2), (3, 0)])
+        self.assertEqual(read_contraction_file(io.StringIO(s), zero_indexed=False), [(3, 2), (4, 3), (4, 1)])
+
+        it = iter_contraction_file(io.StringIO(s))
+        self.assertEqual(next(it), (2, 1))
+        self.assertEqual(list(it), [(3, 2), (3, 0)])
+
+        arr = read_contraction_array(io.StringIO(s))
+        self.assertEqual(arr.dtype, np.int32)
+        self.assertEqual(arr.tolist(), [[2, 1], [3, 2], [3, 0]])
+        self.assertEqual(read_contraction_array(io.StringIO('')).shape, (0, 2))
+
+    def test_iter_cs(self):
+        path = os.path.join(RESOURCE_DIR, 'pace2023', 'public', 'exact_001_cs.txt')
+        it = iter_cs(path)
+        self.assertIsInstance(it, types.GeneratorType)
+        self.assertEqual(list(it), load_cs(path))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = os.path.join(tmpdir, 'cs.json')
+            with open(json_path, 'w') as f:
+                json.dump([[3, 2], [4, 3]], f)
+            self.assertEqual(list(iter_cs(json_path)), [(3, 2), (4, 3)])
@@ -0,0 +1,53 @@
+import io
+import os
+import unittest
+
+import networkx as nx
+import numpy as np
+from twwanim.readwrite import *
+
+RESOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'resources')
+
+
+class TestPace(unittest.TestCase):
+    """Tests pace module."""
+
+    def test_read_pace_2023(self):
+        s = 'c comment\np tww 4 3\n1 2\nc another comment\n\n2 3\n1 4\n'
+
+        G = read_pace_2023(io.StringIO(s))
+        self.assertEqual(list(G.nodes()), [0, 1, 2, 3])
+        self.assertEqual(sorted(G.edges()), [(0, 1), (0, 3), (1, 2)])
+
+        G = read_pace_2023(io.StringIO(s), zero_indexed=False)
+        self.assertEqual(list(G.nodes()), [1, 2, 3, 4])
+
+        n, edges = read_pace_2023_edges(io.StringIO(s))
+        self.assertEqual(n, 4)
+        self.assertEqual(edges.dtype, np.int32)
+        self.assertEqual(edges.tolist(), [[0, 1], [1, 2], [0, 3]])
+
+        n, edges = read_pace_2023_edges(io.StringIO('p tww 2 0\n'))
+        self.assertEqual(n, 2)
+        self.assertEqual(edges.shape, (0, 2))
+
+        with self.assertRaises(AssertionError):
+            read_pace_2023_edges(io.StringIO('p tww 3 2\n1 2\n'))
+
+    def test_write_pace_2023(self):
+        G = nx.Graph([(0, 1), (1, 2), (0, 3)])
+        out = io.StringIO()
+        write_pace_2023(out, G, ['hello'])
+        self.assertEqual(out.getvalue(), 'c hello\np tww 4 3\n1 2\n1 4\n2 3\n')
+
+        out2 = io.StringIO()
+        write_pace_2023_edges(out2, 4, np.array([[0, 1], [0, 3], [1, 2]]), ['hello'])
+        self.assertEqual(out2.getvalue(), out.getvalue())
+
+    def test_load_pace_2023(self):
+        for i in range(1, 11):
+            path = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny', f'tiny{i:03d}.gr')
+            G = load_pace_2023(path)
+            n, edges = load_pace_2023_edges(path)
+            self.assertEqual(n, len(G))
+            self.assertEqual(sorted(map(tuple, np.sort(edges, axis=1).tolist())), sorted(tuple(sorted(e)) for e in G.edges()))
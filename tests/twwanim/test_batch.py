@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+
+from twwanim.batch import find_instances, run_batch
+
+RESOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources')
+
+
+class TestBatch(unittest.TestCase):
+    """Tests batch module."""
+
+    def test_find_instances(self):
+        tiny_dir = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny')
+        instances = find_instances(tiny_dir)
+        self.assertEqual(len(instances), 10)
+        self.assertEqual(instances[0], (os.path.join(tiny_dir, 'tiny001.gr'), os.path.join(tiny_dir, 'tiny001_cs.txt')))
+
+        public_dir = os.path.join(RESOURCE_DIR, 'pace2023', 'public')
+        self.assertEqual([os.path.basename(x) for x, _ in find_instances(public_dir)], ['exact_001.json', 'exact_009.json', 'exact_039.json'])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = os.path.join(tmpdir, 'manifest.txt')
+            with open(manifest, 'w') as f:
+                f.write('# comment\n\na.gr a_cs.txt\n')
+            self.assertEqual(find_instances(manifest), [(os.path.join(tmpdir, 'a.gr'), os.path.join(tmpdir, 'a_cs.txt'))])
+
+    def test_run_batch(self):
+        tiny_dir = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny')
+        instances = find_instances(tiny_dir)[:3] + [('missing.gr', 'missing_cs.txt')]
+        results = run_batch(instances, evaluate=True, jobs=2)
+
+        self.assertEqual([r['name'] for r in results], ['tiny001', 'tiny002', 'tiny003', 'missing'])
+        self.assertEqual([r['status'] for r in results], ['ok', 'ok', 'ok', 'error'])
+        self.assertEqual(results[0]['twin_width'], 1)
+        self.assertIn('FileNotFoundError', results[3]['error'])
@@ -0,0 +1,29 @@
+import os
+import tempfile
+import unittest
+
+from twwanim.cache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+    """Tests RenderCache class."""
+
+    def test_get_put_evict(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = RenderCache(os.path.join(tmpdir, 'cache'), max_bytes=15)
+            self.assertIsNone(cache.get('a', '.mp4'))
+
+            for i, key in enumerate(['a', 'b', 'c']):
+                src = os.path.join(tmpdir, f'{key}.mp4')
+                with open(src, 'w') as f:
+                    f.write(key * 10)
+                path = cache.put(key, src, move=(key == 'c'))
+                os.utime(path, (i, i))
+                self.assertEqual(os.path.exists(src), key != 'c')
+
+            self.assertEqual(open(cache.get('b', '.mp4')).read(), 'b' * 10)  # refreshes 'b'
+
+            cache.evict()
+            self.assertIsNone(cache.get('a', '.mp4'))
+            self.assertIsNone(cache.get('c', '.mp4'))
+            self.assertIsNotNone(cache.get('b', '.mp4'))
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+from twwanim.checkpoint import Checkpoint
+from twwanim.segment import plan_segments
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Tests Checkpoint class."""
+
+    def test_resume(self):
+        g = nx.path_graph(10)
+        cs = [(0, i) for i in range(1, 10)]
+        segments = plan_segments(g, cs, 3)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            directory = os.path.join(tmpdir, 'ckpt')
+            movie = os.path.join(tmpdir, 'part0.mp4')
+            open(movie, 'w').close()
+
+            ckpt = Checkpoint(directory, 'key1')
+            self.assertIsNone(ckpt.load_segments())
+            ckpt.save_segments(segments)
+            ckpt.mark_completed(0, movie)
+            ckpt.mark_completed(2, os.path.join(tmpdir, 'missing.mp4'))
+
+            # same key: resume
+            ckpt = Checkpoint(directory, 'key1')
+            self.assertEqual(ckpt.completed, {0: movie})
+            self.assertEqual(ckpt.last_completed_step(segments), 3)
+            loaded = ckpt.load_segments()
+            self.assertEqual([(s.start, s.end, s.tww) for s in loaded], [(s.start, s.end, s.tww) for s in segments])
+            self.assertEqual(sorted(loaded[1].data.nodes()), sorted(segments[1].data.nodes()))
+
+            # different key: start over
+            ckpt = Checkpoint(directory, 'key2')
+            self.assertEqual(ckpt.completed, {})
+            self.assertIsNone(ckpt.load_segments())
+            self.assertTrue(os.path.exists(movie))
@@ -0,0 +1,42 @@
+import unittest
+
+import networkx as nx
+from twwanim.digest import graph_digest, sequence_digest, render_digest, segment_digests
+
+
+class TestDigest(unittest.TestCase):
+    """Tests digest module."""
+
+    def test_graph_digest(self):
+        g1 = nx.Graph()
+        g1.add_edges_from([(1, 2), (2, 3)])
+        g2 = nx.Graph()
+        g2.add_nodes_from([3, 2, 1])
+        g2.add_edges_from([(3, 2), (2, 1)])
+        self.assertEqual(graph_digest(g1), graph_digest(g2))
+
+        nx.set_node_attributes(g2, {1: (0, 0), 2: (1, 0), 3: (2, 0)}, 'pos')
+        self.assertNotEqual(graph_digest(g1), graph_digest(g2))
+
+        g1.add_edge(1, 3)
+        self.assertNotEqual(graph_digest(g1), graph_digest(nx.path_graph([1, 2, 3])))
+
+    def test_render_digest(self):
+        g = nx.path_graph(4)
+        self.assertEqual(sequence_digest([(0, 1), (2, 3)]), sequence_digest([[0, 1], [2, 3]]))
+        self.assertNotEqual(sequence_digest([(0, 1), (2, 3)]), sequence_digest([(2, 3), (0, 1)]))
+        self.assertEqual(render_digest(g, [(0, 1)], speed=1.0, quality='l'), render_digest(g, [(0, 1)], quality='l', speed=1.0))
+        self.assertNotEqual(render_digest(g, [(0, 1)], speed=1.0), render_digest(g, [(0, 1)], speed=2.0))
+
+    def test_segment_digests(self):
+        g = nx.path_graph(10)
+        cs1 = [(0, i) for i in range(1, 10)]
+        cs2 = cs1[:5] + [(9, i) for i in range(5, 9)]
+
+        d1 = segment_digests(g, cs1, [0, 3, 6, 9], speed=1.0)
+        d2 = segment_digests(g, cs2, [0, 3, 6, 9], speed=1.0)
+        self.assertEqual(d1[0], d2[0])
+        self.assertNotEqual(d1[1], d2[1])
+        self.assertNotEqual(d1[2], d2[2])
+        self.assertEqual(len(set(d1)), 3)
+        self.assertNotEqual(d1[0], segment_digests(g, cs1, [0, 3], speed=2.0)[0])
@@ -0,0 +1,49 @@
+import os
+import unittest
+
+import networkx as nx
+from twwanim.data.TriGraphData import TriGraphData
+from twwanim.evaluation import iter_red_degrees, evaluate_twin_width, find_key_steps, evaluate_sequences
+from twwanim.readwrite import load_pace_2023, load_contraction_file
+
+
+RESOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources')
+
+
+class TestEvaluation(unittest.TestCase):
+    """Tests evaluation module."""
+
+    def test_iter_red_degrees(self):
+        g = nx.Graph([(1, 2), (1, 3), (2, 3), (2, 4), (3, 5)])
+        cs = [(4, 1), (5, 4), (3, 5), (2, 3)]
+
+        self.assertEqual(list(iter_red_degrees(g, cs)), [(4, 1, 1), (5, 4, 2), (3, 5, 1), (2, 3, 0)])
+        self.assertEqual(list(iter_red_degrees(g.copy(), iter(cs), TriGraphData)), [(4, 1, 1), (5, 4, 2), (3, 5, 1), (2, 3, 0)])
+        self.assertEqual(evaluate_twin_width(g, cs), 2)
+
+    def test_find_key_steps(self):
+        g = nx.Graph([(1, 2), (1, 3), (2, 3), (2, 4), (3, 5)])
+        cs = [(4, 1), (5, 4), (3, 5), (2, 3)]
+
+        self.assertEqual(find_key_steps(g, cs), {0, 1})
+        self.assertEqual(find_key_steps(g, cs, threshold=1), {0, 1, 2})
+        self.assertEqual(find_key_steps(g, []), set())
+
+    def test_evaluate_twin_width(self):
+        for i in range(1, 11):
+            path = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny', f'tiny{i:03d}')
+            g = load_pace_2023(f'{path}.gr', zero_indexed=False)
+            cs = load_contraction_file(f'{path}_cs.txt', zero_indexed=False)
+            self.assertEqual(evaluate_twin_width(g, cs), evaluate_twin_width(g.copy(), cs, TriGraphData))
+
+    def test_evaluate_sequences(self):
+        path = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny', 'tiny005')
+        g = load_pace_2023(f'{path}.gr', zero_indexed=False)
+        cs = load_contraction_file(f'{path}_cs.txt', zero_indexed=False)
+
+        # neighboring sequences: swap the last vertex of a prefix
+        sequences = [cs, cs[:5], [], cs]
+        for k in range(1, len(cs) - 1, 3):
+            u, v = cs[k]
+            sequences += [cs[:k] + [(v, u)] + [(v if x == u else x, y) for x, y in cs[k + 1:]]]
+        self.assertEqual(evaluate_sequences(g, sequences), [evaluate_twin_width(g, s) for s in sequences])
@@ -0,0 +1,55 @@
+import os
+import unittest
+
+import networkx as nx
+from twwanim.evaluation import evaluate_twin_width
+from twwanim.greedy import iter_greedy_sequence, greedy_sequence
+from twwanim.readwrite import load_pace_2023, load_contraction_file
+
+
+RESOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources')
+
+
+class TestGreedy(unittest.TestCase):
+    """Tests greedy module."""
+
+    def assertValidSequence(self, g, cs):
+        remaining = set(g)
+        for u, v in cs:
+            self.assertIn(u, remaining)
+            self.assertIn(v, remaining)
+            self.assertNotEqual(u, v)
+            remaining.remove(v)
+        self.assertEqual(len(remaining), min(len(g), 1))
+
+    def test_greedy_sequence(self):
+        for i in range(1, 11):
+            path = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny', f'tiny{i:03d}')
+            g = load_pace_2023(f'{path}.gr', zero_indexed=False)
+            cs = greedy_sequence(g)
+            self.assertValidSequence(g, cs)
+
+            # close to the given sequences on the tiny instances
+            self.assertLessEqual(evaluate_twin_width(g, cs), evaluate_twin_width(g, load_contraction_file(f'{path}_cs.txt', zero_indexed=False)) + 3)
+
+    def test_special_graphs(self):
+        self.assertEqual(greedy_sequence(nx.empty_graph(0)), [])
+        self.assertEqual(greedy_sequence(nx.empty_graph(1)), [])
+
+        # cographs and paths
+        for g in [nx.complete_graph(8), nx.empty_graph(8), nx.star_graph(7), nx.complete_bipartite_graph(3, 4)]:
+            cs = greedy_sequence(g)
+            self.assertValidSequence(g, cs)
+            self.assertEqual(evaluate_twin_width(g, cs), 0)
+        g = nx.path_graph(30)
+        self.assertEqual(evaluate_twin_width(g, greedy_sequence(g)), 1)
+
+        # several components and isolated vertices
+        g = nx.disjoint_union_all([nx.cycle_graph(6), nx.path_graph(4), nx.empty_graph(3)])
+        self.assertValidSequence(g, greedy_sequence(g))
+
+    def test_time_limit(self):
+        g = nx.gnm_random_graph(200, 600, seed=1)
+        cs = list(iter_greedy_sequence(g, time_limit=0))
+        self.assertValidSequence(g, cs)
+        self.assertEqual(cs[:3], [(0, 1), (0, 2), (0, 3)])
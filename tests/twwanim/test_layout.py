@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+import numpy as np
+from twwanim.cache import RenderCache
+from twwanim.layout import compute_layout, spectral_layout, ensure_layout
+
+
+class TestLayout(unittest.TestCase):
+    """Tests layout module."""
+
+    def test_spectral_layout(self):
+        g = nx.disjoint_union_all([nx.grid_2d_graph(30, 30), nx.path_graph(5), nx.empty_graph(3), nx.path_graph(2)])
+        g.add_edge(0, 0)
+        pos = spectral_layout(g)
+        self.assertEqual(pos.shape, (len(g), 2))
+        self.assertTrue(np.all(np.isfinite(pos)))
+        self.assertEqual(len({tuple(p) for p in pos.round(6)}), len(g))  # no overlapping vertices
+        self.assertTrue(np.array_equal(pos, spectral_layout(g)))
+
+        self.assertEqual(spectral_layout(nx.Graph()).shape, (0, 2))
+
+    def test_compute_layout(self):
+        g = nx.path_graph(['a', 'b', 'c'])
+        for method in ['auto', 'spring', 'spectral']:
+            self.assertEqual(set(compute_layout(g, method)), {'a', 'b', 'c'})
+        with self.assertRaises(ValueError):
+            compute_layout(g, 'unknown')
+
+    def test_ensure_layout(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = RenderCache(tmpdir)
+            g1 = nx.cycle_graph(10)
+            ensure_layout(g1, 'spectral', cache)
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+
+            # same graph with a different insertion order is served from the cache
+            g2 = nx.Graph()
+            g2.add_edges_from(reversed(list(g1.edges())))
+            path = os.path.join(tmpdir, os.listdir(tmpdir)[0])
+            np.save(path, np.zeros((10, 2)))
+            ensure_layout(g2, 'spectral', cache)
+            self.assertEqual(nx.get_node_attributes(g2, 'pos')[3].tolist(), [0.0, 0.0])
+
+            # existing positions are kept
+            ensure_layout(g1, 'spectral', cache)
+            self.assertNotEqual(nx.get_node_attributes(g1, 'pos')[3].tolist(), [0.0, 0.0])
@@ -0,0 +1,163 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import types
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import numpy as np
+from twwanim.pipeline import EncoderPipeline, private_partial_movie_dir
+
+
+class FakeRenderer:
+    num_plays = 0
+
+
+class FakeFileWriter:
+    """Records the calls of the file writer interface of manim 0.18."""
+
+    def __init__(self, fail_at=None):
+        self.renderer = FakeRenderer()
+        self.partial_movie_files = ['part0.mp4', 'part1.mp4']
+        self.calls = []
+        self.threads = set()
+        self.fail_at = fail_at
+
+    def _record(self, *call):
+        self.threads.add(threading.current_thread())
+        if len(self.calls) == self.fail_at:
+            raise RuntimeError('encoder failed')
+        self.calls += [call]
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        self._record('begin', file_path)
+
+    def write_frame(self, frame):
+        self._record('frame', int(frame[0]))
+
+    def end_animation(self, allow_write=False):
+        self._record('end')
+
+    def finish(self):
+        self._record('finish')
+
+
+class MovieFileWriter(FakeFileWriter):
+    """Writes the frames of each play to its partial movie and reads the movies to combine at `finish()`."""
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        self.partial_movie_files = []
+        self.file = None
+        self.combined = None
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        self.file = open(file_path, 'w')
+
+    def write_frame(self, frame):
+        self.file.write(f'{int(frame[0])} ')
+
+    def end_animation(self, allow_write=False):
+        self.file.close()
+
+    def finish(self):
+        self.calls += [('finish', len(self.partial_movie_files))]
+        self.combined = ''
+        for path in self.partial_movie_files:
+            with open(path) as f:
+                self.combined += f.read()
+
+
+def fake_concat_movies(paths, output_path):
+    with open(output_path, 'w') as out:
+        for path in paths:
+            with open(path) as f:
+                out.write(f.read())
+
+
+def render_in_worker(barrier) -> tuple[str, list[str]]:
+    """Writes the file list of a render to its partial movie directory once all workers are in it."""
+
+    config = types.SimpleNamespace(partial_movie_dir='{media_dir}/videos/{module_name}/{quality}/partial_movie_files')
+    with private_partial_movie_dir(config) as path:
+        with open(os.path.join(config.partial_movie_dir, 'partial_movie_file_list.txt'), 'w') as f:
+            f.write(f"file '{os.getpid()}.mp4'\n")
+        barrier.wait()
+        return path, os.listdir(path)
+
+
+class TestEncoderPipeline(unittest.TestCase):
+    """Tests pipeline module."""
+
+    def play(self, fw, num_frames):
+        fw.begin_animation(True)
+        for i in range(num_frames):
+            fw.write_frame(np.full(4, i))
+        fw.end_animation(True)
+        fw.renderer.num_plays += 1
+
+    def test_pipeline(self):
+        fw = FakeFileWriter()
+        pipeline = EncoderPipeline(fw, 2)
+        pipeline.install()
+        self.play(fw, 5)
+        self.play(fw, 3)
+        fw.finish()
+
+        self.assertEqual(fw.calls, [
+            ('begin', 'part0.mp4'), *(('frame', i) for i in range(5)), ('end',),
+            ('begin', 'part1.mp4'), *(('frame', i) for i in range(3)), ('end',),
+            ('finish',),
+        ])
+        self.assertIn(threading.main_thread(), fw.threads)
+        self.assertEqual(len(fw.threads), 2)
+        self.assertIsNone(pipeline.thread)
+
+    def test_error(self):
+        fw = FakeFileWriter(fail_at=2)
+        pipeline = EncoderPipeline(fw, 2)
+        pipeline.install()
+        with self.assertRaises(RuntimeError):
+            self.play(fw, 5)
+            fw.finish()
+        with self.assertRaises(RuntimeError):
+            pipeline.close()
+        self.assertIsNone(pipeline.thread)
+        self.assertEqual(len(fw.calls), 2)
+
+    def test_supported(self):
+        self.assertTrue(EncoderPipeline.supported(FakeFileWriter()))
+        fw = FakeFileWriter()
+        fw.join_all_encode_jobs = lambda: None
+        self.assertFalse(EncoderPipeline.supported(fw))
+
+    def test_private_partial_movie_dir(self):
+        num_workers = 3
+        with multiprocessing.Manager() as manager, ProcessPoolExecutor(num_workers) as executor:
+            barrier = manager.Barrier(num_workers)
+            results = list(executor.map(render_in_worker, [barrier] * num_workers))
+
+        # one directory per worker, each holding only its own file list, removed afterwards
+        paths = [path for path, _ in results]
+        self.assertEqual(len(set(paths)), num_workers)
+        for path, files in results:
+            self.assertEqual(files, ['partial_movie_file_list.txt'])
+            self.assertFalse(os.path.exists(path))
+
+    def test_combine(self):
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch('twwanim.pipeline.concat_movies', fake_concat_movies):
+            fw = MovieFileWriter(tmpdir)
+            pipeline = EncoderPipeline(fw, 2, combine_every=2)
+            pipeline.install()
+            for t in range(11):
+                fw.partial_movie_files += [os.path.join(tmpdir, f'uncached_{t:05d}.mp4')]
+                self.play(fw, t % 3 + 1)
+            fw.finish()
+
+            # 8 + 2 plays combined while rendering, the last one at the end
+            self.assertEqual(fw.calls, [('finish', 3)])
+            self.assertEqual(fw.combined, ''.join(''.join(f'{i} ' for i in range(t % 3 + 1)) for t in range(11)))
+            self.assertEqual(sorted(os.listdir(tmpdir)), [f'uncached_{t:05d}.mp4' for t in range(11)])
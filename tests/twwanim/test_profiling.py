@@ -0,0 +1,48 @@
+import unittest
+
+import networkx as nx
+from twwanim.evaluation import iter_red_degrees
+from twwanim.profiling import Profiler, NullProfiler, get_profiler, enable_profiler, disable_profiler
+
+
+class TestProfiling(unittest.TestCase):
+    """Tests profiling module."""
+
+    def tearDown(self):
+        disable_profiler()
+
+    def test_profiler(self):
+        prof = Profiler()
+        with prof.phase('load'):
+            pass
+        for t in range(1, 3):
+            prof.step = t
+            with prof.phase('contract', n=10):
+                pass
+            with prof.phase('move'):
+                pass
+            prof.count('mobjects', 10 * t)
+
+        summary = prof.summary()
+        self.assertEqual({k: v['count'] for k, v in summary['phases'].items()}, {'load': 1, 'contract': 2, 'move': 2})
+        self.assertEqual([s['step'] for s in summary['steps']], [1, 2])
+        self.assertEqual(sorted(summary['steps'][0]['phases']), ['contract', 'move'])
+        self.assertEqual(summary['steps'][1]['counters'], {'mobjects': 20})
+
+        trace = prof.chrome_trace()
+        self.assertEqual(len(trace['traceEvents']), 7)
+        self.assertEqual(trace['traceEvents'][1]['ph'], 'X')
+        self.assertEqual(trace['traceEvents'][1]['args'], {'n': 10, 'step': 1})
+        self.assertEqual(trace['traceEvents'][-1]['ph'], 'C')
+
+    def test_enable_profiler(self):
+        self.assertIsInstance(get_profiler(), NullProfiler)
+        self.assertFalse(get_profiler().enabled)
+
+        prof = enable_profiler()
+        self.assertIs(get_profiler(), prof)
+        list(iter_red_degrees(nx.path_graph(5), [(0, 1), (0, 2), (0, 3)]))
+        self.assertEqual([p['step'] for p in prof.phases if p['name'] == 'contract'], [1, 2, 3])
+
+        disable_profiler()
+        self.assertFalse(get_profiler().enabled)
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from random import Random
+
+import networkx as nx
+from twwanim.data.TriGraphArrays import TriGraphArrays
+from twwanim.evaluation import evaluate_twin_width
+from twwanim.ranking import find_sequences, evaluate_candidate, rank_sequences
+
+
+class TestRanking(unittest.TestCase):
+    """Tests ranking module."""
+
+    def random_sequences(self, g, k, seed):
+        rand = Random(seed)
+        ret = []
+        for _ in range(k):
+            nodes = list(g.nodes())
+            cs = []
+            while len(nodes) >= 2:
+                u, v = rand.sample(nodes, 2)
+                nodes.remove(v)
+                cs += [(u, v)]
+            ret += [cs]
+        return ret
+
+    def test_evaluate_candidate(self):
+        g = nx.Graph([(1, 2), (1, 3), (2, 3), (2, 4), (3, 5)])
+        arrays = TriGraphArrays.from_graph(g)
+        cs = [(4, 1), (5, 4), (3, 5), (2, 3)]
+
+        r = evaluate_candidate(arrays, cs)
+        self.assertEqual((r['status'], r['twin_width'], r['steps']), ('ok', 2, 4))
+        self.assertEqual(evaluate_candidate(arrays, [(1, 9)])['status'], 'error')
+
+    def test_rank_sequences(self):
+        g = nx.gnp_random_graph(30, 0.3, seed=1)
+        sequences = self.random_sequences(g, 8, 2)
+        expected = sorted(evaluate_twin_width(g, cs) for cs in sequences)
+
+        results = rank_sequences(g, sequences, jobs=2, early_stop=False)
+        self.assertEqual([r['twin_width'] for r in results], expected)
+        self.assertEqual([r['rank'] for r in results], list(range(1, 9)))
+        self.assertTrue(all(r['status'] == 'ok' for r in results))
+
+        results = rank_sequences(g, sequences + [[(0, 100)]], jobs=2)
+        self.assertEqual(results[0]['twin_width'], expected[0])
+        self.assertEqual(results[-1]['status'], 'error')
+        for r in results:
+            if r['status'] == 'pruned':
+                self.assertGreater(r['twin_width'], expected[0])
+
+    def test_find_sequences(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ['b.txt', 'a.json', 'c.gr']:
+                open(os.path.join(tmpdir, name), 'w').close()
+            self.assertEqual(find_sequences(tmpdir), [os.path.join(tmpdir, 'a.json'), os.path.join(tmpdir, 'b.txt')])
+
+            manifest = os.path.join(tmpdir, 'manifest')
+            with open(manifest, 'w') as f:
+                f.write('# comment\nb.txt\n\n')
+            self.assertEqual(find_sequences(manifest), [os.path.join(tmpdir, 'b.txt')])
@@ -0,0 +1,64 @@
+import unittest
+
+import networkx as nx
+from twwanim.segment import plan_segments, segment_bounds
+from twwanim.evaluation import iter_red_degrees, find_key_steps
+
+
+class TestSegment(unittest.TestCase):
+    """Tests segment module."""
+
+    def test_plan_segments(self):
+        g = nx.path_graph(50)
+        g.add_edges_from([(0, 10), (5, 30), (20, 40)])
+        cs = [(i, i + 1) for i in range(0, 48, 2)] + [(i, i + 2) for i in range(0, 46, 4)]
+        history = list(iter_red_degrees(g, cs))
+
+        segments = plan_segments(g, cs, 4)
+        self.assertEqual([(s.start, s.end) for s in segments], [(0, 9), (9, 18), (18, 27), (27, 36)])
+        self.assertIsNone(segments[0].data)
+        self.assertEqual(len(g), 50)  # input graph must be unchanged
+
+        for s in segments[1:]:
+            self.assertEqual(s.tww, max(d for _, _, d in history[:s.start]))
+            self.assertEqual(len(s.rows), min(s.start, 20))
+            self.assertEqual(s.rows[-1], (s.start, *history[s.start - 1]))
+            self.assertEqual(len(s.data), 50 - s.start)
+            self.assertEqual(s.data.max_red_degree(), history[s.start - 1][2])
+
+        self.assertEqual(len(plan_segments(g, cs[:2], 4)), 2)
+
+    def test_plan_segments_fast_forward(self):
+        g = nx.path_graph(50)
+        g.add_edges_from([(0, 10), (5, 30), (20, 40)])
+        cs = [(i, i + 1) for i in range(0, 48, 2)] + [(i, i + 2) for i in range(0, 46, 4)]
+        history = list(iter_red_degrees(g, cs))
+        key_steps = find_key_steps(g, cs)
+
+        for s in plan_segments(g, cs, length=10, key_steps=key_steps)[1:]:
+            self.assertEqual(s.tww, max(d for _, _, d in history[:s.start]))
+            self.assertLessEqual(len(s.rows), 20)
+
+            # rows cover the steps of the segments so far, summarizing the skipped ones
+            covered = []
+            for t, u, v, reddeg in s.rows:
+                if isinstance(t, tuple):
+                    self.assertEqual((u, v), (None, None))
+                    steps = range(t[0] - 1, t[1])
+                    self.assertFalse(key_steps & set(steps))
+                    self.assertEqual(reddeg, max(history[x][2] for x in steps))
+                else:
+                    self.assertIn(t - 1, key_steps)
+                    self.assertEqual((u, v, reddeg), history[t - 1])
+                    steps = [t - 1]
+                covered += steps
+            self.assertEqual(covered, list(range(covered[0], s.start)))
+            if s.start % 10 == 0 and s.start - 1 not in key_steps:
+                self.assertEqual(s.rows[-1][0][1], s.start)  # a skipped run ends at the boundary
+
+    def test_segment_bounds(self):
+        self.assertEqual(segment_bounds(10, 3), [0, 3, 6, 10])
+        self.assertEqual(segment_bounds(2, 4), [0, 1, 2])
+        self.assertEqual(segment_bounds(10, length=4), [0, 4, 8, 10])
+        self.assertEqual(segment_bounds(8, length=4), [0, 4, 8])
+        self.assertEqual(segment_bounds(0, length=4), [0, 0])
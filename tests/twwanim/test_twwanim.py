@@ -0,0 +1,90 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+RESOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources')
+
+
+class TestTwwanim(unittest.TestCase):
+    """Tests the command-line entry point."""
+
+    def run_python(self, code: str) -> str:
+        proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        return proc.stdout
+
+    def test_lazy_imports(self):
+        code = '\n'.join([
+            'import sys',
+            'import twwanim.twwanim as m',
+            'm.get_parser()',
+            'print(sorted(x for x in ("manim", "networkx") if x in sys.modules))',
+        ])
+        self.assertEqual(self.run_python(code).strip(), '[]')
+
+        code = '\n'.join([
+            'import sys',
+            'import twwanim.readwrite, twwanim.evaluation',
+            'print("manim" in sys.modules)',
+        ])
+        self.assertEqual(self.run_python(code).strip(), 'False')
+
+    def test_evaluate(self):
+        path = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny', 'tiny003')
+        code = '\n'.join([
+            'import sys',
+            'from twwanim.twwanim import get_parser, main',
+            f'main(get_parser().parse_args(["-e", {path + ".gr"!r}, {path + "_cs.txt"!r}]))',
+            'print("manim" in sys.modules)',
+        ])
+        lines = self.run_python(code).splitlines()
+        self.assertEqual(lines[0], '1 3 2 0')
+        self.assertEqual(lines[-3], 'twin-width: 0')
+        self.assertTrue(lines[-2].startswith('elapsed: '))
+        self.assertEqual(lines[-1], 'False')
+
+    def test_scene_options(self):
+        from twwanim.twwanim import get_parser, scene_options
+
+        opts = scene_options(get_parser().parse_args(['g.gr', 'cs.txt']))
+        self.assertEqual(opts, {
+            'lod_threshold': 120, 'lod_labels': False, 'steps_per_play': 0, 'fast_forward': False, 'fast_forward_threshold': None,
+        })
+
+        opts = scene_options(get_parser().parse_args(['--lod-threshold', '-1', '--compact', 'g.gr', 'cs.txt']))
+        self.assertEqual((opts['lod_threshold'], opts['steps_per_play']), (None, 1))
+        self.assertEqual(scene_options(get_parser().parse_args(['--merge-steps', '5', 'g.gr', 'cs.txt']))['steps_per_play'], 5)
+
+    def test_checkpoint_format(self):
+        from twwanim.twwanim import get_parser, main
+
+        path = os.path.join(RESOURCE_DIR, 'pace2023', 'tiny', 'tiny003')
+        for format in ['png', 'gif']:
+            stderr = io.StringIO()
+            with redirect_stderr(stderr), self.assertRaises(SystemExit):
+                main(get_parser().parse_args(['--checkpoint', 'ckpt', '--format', format, path + '.gr', path + '_cs.txt']))
+            self.assertIn('--checkpoint', stderr.getvalue())
+
+    def test_store_layout(self):
+        import networkx as nx
+        from twwanim.readwrite import load_graph, save_container
+        from twwanim.twwanim import store_layout
+
+        g = nx.path_graph(3)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'g.npz')
+            save_container(path, g)
+            nx.set_node_attributes(g, nx.circular_layout(g), 'pos')
+            store_layout(path, g)
+            self.assertEqual(len(nx.get_node_attributes(load_graph(path), 'pos')), 3)
+
+            # failures are warnings: a missing file and a different graph
+            save_container(os.path.join(tmp_dir, 'h.npz'), nx.path_graph(5))
+            for name in ['missing.npz', 'h.npz']:
+                stderr = io.StringIO()
+                with redirect_stderr(stderr):
+                    store_layout(os.path.join(tmp_dir, name), g)
+                self.assertIn('Warning: could not store the layout', stderr.getvalue())